@@ -1,24 +1,45 @@
+from typing import Any, Dict, Optional
+
 from flask import Flask
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask_talisman import Talisman
 from flask_cors import CORS
-from .config.database import db, initialize_database
+from .config.database import (
+    db,
+    migrate,
+    build_engine_options,
+    init_replicas,
+    initialize_database,
+    register_pool_metrics,
+)
+from .utils.json_provider import register_json_provider
 from .utils.logger import configure_logging
+from .cli import register_cli
 from .middlewares.auth_middleware import register_auth_middleware
+from .middlewares.compression_middleware import register_compression
 from .middlewares.error_middleware import register_error_handlers
 
 
-def create_app() -> Flask:
+def create_app(config: Optional[Dict[str, Any]] = None) -> Flask:
     """
     Initialise et configure l'application Flask.
 
+    Args:
+        config (Optional[Dict[str, Any]]): Valeurs de configuration qui remplacent
+            celles de Config (utilisé par les tests).
+
     Returns:
         Flask: L'instance de l'application Flask configurée.
     """
     app = Flask(__name__)
-    app.config.from_object('app.config.config.Config')
+    register_json_provider(app)
+    app.config.from_object('api.config.config.Config')
+    if config:
+        app.config.update(config)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = build_engine_options(app.config)
 
+    register_compression(app)
     CORS(app, origins=["http://localhost:5173"], supports_credentials=True)
 
     configure_logging(app)
@@ -28,7 +49,8 @@ def create_app() -> Flask:
         from flask import request
         print('Method: %s', request.method)
         print('Headers: %s', request.headers)
-        print('Body: %s', request.get_data())
+        # Only the size: reading the body here would buffer uploads meant to be streamed.
+        print('Body length: %s', request.content_length)
 
     @app.after_request
     def options(response):
@@ -45,13 +67,17 @@ def create_app() -> Flask:
     limiter.init_app(app)
 
     db.init_app(app)
+    migrate.init_app(app, db)
+    init_replicas(app)
 
     Talisman(app, force_https=False)
 
     register_auth_middleware(app)
     register_error_handlers(app)
+    register_cli(app)
 
     with app.app_context():
+        register_pool_metrics()
         if initialize_database():
             app.logger.info("MySQL is connected!")
         else:
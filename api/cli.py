@@ -0,0 +1,98 @@
+import time
+from itertools import islice
+from typing import Dict, Optional
+
+import click
+from flask import Flask, current_app
+from flask.cli import AppGroup
+
+from .utils.importers import MalformedImportError, iter_csv_records, iter_json_array
+from .utils.password_hashing import calibrate, time_hash
+from .services.auth_service import AuthService
+from .services.token_denylist import TokenDenylist
+from .services.user_service import UserService
+
+users_cli = AppGroup('users', help='Manage user accounts.')
+passwords_cli = AppGroup('passwords', help='Tune password hashing.')
+tokens_cli = AppGroup('tokens', help='Manage revoked access tokens and refresh tokens.')
+
+
+@users_cli.command('import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--workers', type=int, default=None,
+              help='Password hashing processes (defaults to PASSWORD_HASH_WORKERS).')
+@click.option('--batch-size', type=int, default=5000, show_default=True,
+              help='Users created per transaction.')
+def import_users(path: str, workers: Optional[int], batch_size: int) -> None:
+    """
+    Create the users listed in a CSV file (with a name,email,password,role header)
+    or a JSON array of objects with the same keys.
+
+        flask --app api.app users import cohort.csv --workers 8
+    """
+    parser = iter_json_array if path.lower().endswith('.json') else iter_csv_records
+    summary: Dict[str, int] = {}
+    start = time.perf_counter()
+    row_offset = 0
+
+    with open(path, 'rb') as stream:
+        records = (record for _, record in parser(stream))
+        try:
+            while True:
+                batch = list(islice(records, batch_size))
+                if not batch:
+                    break
+                for number, result in enumerate(UserService.bulk_create_users(batch, workers), start=row_offset + 1):
+                    summary[result['status']] = summary.get(result['status'], 0) + 1
+                    if result['status'] != 'created':
+                        click.echo(f"Row {number}: {result['status']} {result.get('email') or ''} {result.get('msg') or ''}".rstrip())
+                row_offset += len(batch)
+        except MalformedImportError as e:
+            raise click.ClickException(f"Row {e.row}: {e}. Earlier batches were kept.")
+
+    elapsed = time.perf_counter() - start
+    created = summary.get('created', 0)
+    click.echo(f"{row_offset} rows in {elapsed:.1f}s ({created / elapsed if elapsed else 0:.0f} users/s): {summary}")
+
+
+@passwords_cli.command('calibrate')
+@click.option('--target-ms', type=float, default=250, show_default=True,
+              help='Hash time to aim for, in milliseconds.')
+@click.option('--algorithm', type=click.Choice(['scrypt', 'pbkdf2']), default='scrypt', show_default=True)
+@click.option('--samples', type=int, default=3, show_default=True, help='Hashes timed per measurement.')
+def calibrate_passwords(target_ms: float, algorithm: str, samples: int) -> None:
+    """
+    Measure password hashing on this host and suggest a PASSWORD_HASH_METHOD that
+    hashes within the target time.
+
+        flask --app api.app passwords calibrate --target-ms 200
+    """
+    current = current_app.config['PASSWORD_HASH_METHOD']
+    click.echo(f"Current: PASSWORD_HASH_METHOD={current} ({time_hash(current, samples):.0f} ms)")
+    method, elapsed = calibrate(algorithm, target_ms, samples)
+    click.echo(f"Suggested: PASSWORD_HASH_METHOD={method} ({elapsed:.0f} ms)")
+    if elapsed > target_ms:
+        click.echo(f"Even the cheapest {algorithm} setting tried exceeds {target_ms:.0f} ms on this host.")
+
+
+@tokens_cli.command('purge')
+def purge_revoked_tokens() -> None:
+    """
+    Delete the revoked and refresh tokens that have expired anyway; run it periodically.
+
+        flask --app api.app tokens purge
+    """
+    click.echo(f"Purged {TokenDenylist.purge_expired()} expired revoked token(s).")
+    click.echo(f"Purged {AuthService.purge_expired_refresh_tokens()} expired refresh token(s).")
+
+
+def register_cli(app: Flask) -> None:
+    """
+    Registers the application's command line commands (flask --app api.app ...).
+
+    Args:
+        app (Flask): The Flask application instance.
+    """
+    app.cli.add_command(users_cli)
+    app.cli.add_command(passwords_cli)
+    app.cli.add_command(tokens_cli)
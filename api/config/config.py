@@ -1,6 +1,8 @@
 import os
 from cryptography.fernet import Fernet
 
+from api.utils.blind_index import derive_blind_index_key
+
 
 class Config:
     ENV = os.getenv('FLASK_ENV', 'production')
@@ -9,6 +11,19 @@ class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'super-secret-key')
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'jwt-super-secret-key')
     JWT_ACCESS_TOKEN_EXPIRES = int(os.getenv('JWT_ACCESS_TOKEN_EXPIRES', 900))
+    # Lifetime in seconds of the refresh tokens exchanged at /auth/refresh for new
+    # access tokens, so that clients do not log in again every JWT_ACCESS_TOKEN_EXPIRES.
+    JWT_REFRESH_TOKEN_EXPIRES = int(os.getenv('JWT_REFRESH_TOKEN_EXPIRES', 30 * 24 * 3600))
+    # Seconds a user's token version may be served from cache when checking access
+    # tokens. Tokens revoked by another instance stay usable for at most this long.
+    TOKEN_VERSION_CACHE_TTL = int(os.getenv('TOKEN_VERSION_CACHE_TTL', 30))
+    TOKEN_VERSION_CACHE_SIZE = int(os.getenv('TOKEN_VERSION_CACHE_SIZE', 100000))
+    # Bloom filter in front of the revoked_tokens table: number of revoked, unexpired
+    # tokens it is sized for, its false positive rate, and the seconds between two
+    # loads of tokens revoked by other instances.
+    TOKEN_DENYLIST_CAPACITY = int(os.getenv('TOKEN_DENYLIST_CAPACITY', 100000))
+    TOKEN_DENYLIST_ERROR_RATE = float(os.getenv('TOKEN_DENYLIST_ERROR_RATE', 0.001))
+    TOKEN_DENYLIST_REFRESH_INTERVAL = float(os.getenv('TOKEN_DENYLIST_REFRESH_INTERVAL', 5))
 
     DB_USER = os.getenv('DATABASE_USER', 'root')
     DB_PASSWORD = os.getenv('DATABASE_PASSWORD', 'toor')
@@ -16,7 +31,77 @@ class Config:
     DB_PORT = os.getenv('DATABASE_PORT', '3306')
     DB_NAME = os.getenv('DATABASE_NAME', 'educationDB')
 
-    SQLALCHEMY_DATABASE_URI = f"mysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+    SQLALCHEMY_DATABASE_URI = os.getenv(
+        'DATABASE_URL',
+        f"mysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+    )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Comma-separated read replica URLs. Read-only service methods are routed to them.
+    SQLALCHEMY_REPLICA_URIS = [uri.strip() for uri in os.getenv('DATABASE_REPLICA_URLS', '').split(',') if uri.strip()]
+
+    # Connection pool, sized so that every waitress worker thread can hold a
+    # connection without waiting. Applied to queue pools only (see build_engine_options).
+    WAITRESS_THREADS = int(os.getenv('WAITRESS_THREADS', 4))
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', WAITRESS_THREADS))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', max(WAITRESS_THREADS // 2, 2)))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 10))
+
+    # Seconds the total course count returned by cursor pagination may be served from cache.
+    COURSE_COUNT_CACHE_TTL = int(os.getenv('COURSE_COUNT_CACHE_TTL', 60))
+    # Response compression negotiated with Accept-Encoding: content codings in order of
+    # preference ('br' is skipped unless the brotli package is installed; empty
+    # disables compression), minimum size of the bodies compressed (streamed responses
+    # always are), gzip level (1-9) and brotli quality (0-11).
+    COMPRESSION_ENCODINGS = [e.strip() for e in os.getenv('COMPRESSION_ENCODINGS', 'br,gzip').split(',') if e.strip()]
+    COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+    COMPRESSION_LEVEL = int(os.getenv('COMPRESSION_LEVEL', 6))
+    COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', 4))
+    COMPRESSION_MIMETYPES = ('application/json', 'application/x-ndjson', 'text/csv', 'text/plain')
+    # Log records are handed to a single writer thread through a queue of this many
+    # records. Once it is half full only one DEBUG record in LOG_DEBUG_SAMPLE_RATE is
+    # kept; other records wait up to LOG_QUEUE_TIMEOUT seconds for room, then are dropped.
+    LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))
+    LOG_DEBUG_SAMPLE_RATE = int(os.getenv('LOG_DEBUG_SAMPLE_RATE', 10))
+    LOG_QUEUE_TIMEOUT = float(os.getenv('LOG_QUEUE_TIMEOUT', 0.05))
+
+    # Users and courses looked up by id (UserService.get_user_by_id,
+    # CourseService.get_course_by_id), and the version stamps behind ETags, are cached
+    # per process for this many seconds. Writes of this process invalidate them at
+    # once, those of other instances do not. Updates and deletions read the row
+    # from the database (for_update=True) rather than from the cache.
+    ENTITY_CACHE_TTL = int(os.getenv('ENTITY_CACHE_TTL', 30))
+    ENTITY_CACHE_SIZE = int(os.getenv('ENTITY_CACHE_SIZE', 10000))
+    # Course name search: 'fulltext' (MySQL FULLTEXT index), 'trigram' (in-process
+    # index) or 'auto' to pick fulltext on MySQL. The trigram index is rebuilt from
+    # the database every COURSE_SEARCH_INDEX_TTL seconds.
+    COURSE_SEARCH_BACKEND = os.getenv('COURSE_SEARCH_BACKEND', 'auto')
+    COURSE_SEARCH_INDEX_TTL = int(os.getenv('COURSE_SEARCH_INDEX_TTL', 300))
+    # Rows per multi-row INSERT statement of bulk endpoints.
+    BULK_INSERT_CHUNK_SIZE = int(os.getenv('BULK_INSERT_CHUNK_SIZE', 1000))
+    # werkzeug password hash method and cost, e.g. 'scrypt:32768:8:1' or
+    # 'pbkdf2:sha256:600000' (see `flask passwords calibrate`). Hashes made with
+    # other parameters are upgraded at the user's next login.
+    PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    # Processes hashing passwords for bulk user creation; 1 hashes on the request thread.
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', os.cpu_count() or 1))
+    # Threads verifying and hashing passwords for login and password changes, kept
+    # apart from the waitress threads. Once PASSWORD_VERIFY_QUEUE_SIZE more requests
+    # are waiting for one, logins are answered 503 with PASSWORD_BUSY_RETRY_AFTER.
+    PASSWORD_VERIFY_WORKERS = int(os.getenv('PASSWORD_VERIFY_WORKERS', max(WAITRESS_THREADS // 2, 1)))
+    PASSWORD_VERIFY_QUEUE_SIZE = int(os.getenv('PASSWORD_VERIFY_QUEUE_SIZE', WAITRESS_THREADS))
+    PASSWORD_BUSY_RETRY_AFTER = int(os.getenv('PASSWORD_BUSY_RETRY_AFTER', 1))
 
     ENCRYPTION_KEY = os.getenv('ENCRYPTION_KEY', Fernet.generate_key().decode('utf-8'))
+    # HMAC key of the blind n-gram index used to search encrypted user fields, by
+    # default derived from ENCRYPTION_KEY with HKDF rather than that key itself.
+    # Changing it requires rebuilding the user_search_tokens table.
+    BLIND_INDEX_KEY = os.getenv('BLIND_INDEX_KEY') or derive_blind_index_key(ENCRYPTION_KEY)
+    # Memory budget (bytes) of the in-process cache of decrypted user names and emails; 0 disables it.
+    DECRYPTION_CACHE_MAX_BYTES = int(os.getenv('DECRYPTION_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+    # Thread pool decrypting large user listings, used once a listing has at least
+    # DECRYPTION_PARALLEL_MIN_ROWS values that are not cached. 1 (the default)
+    # decrypts inline: Fernet mostly holds the GIL, so threads gain little.
+    DECRYPTION_WORKERS = int(os.getenv('DECRYPTION_WORKERS', 1))
+    DECRYPTION_PARALLEL_MIN_ROWS = int(os.getenv('DECRYPTION_PARALLEL_MIN_ROWS', 500))
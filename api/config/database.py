@@ -1,12 +1,347 @@
+import functools
 import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, TypeVar
+
+from flask import Flask, current_app
+from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import text
+from flask_sqlalchemy.session import Session
+from sqlalchemy import Table, create_engine, event, text
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.util import queue as sqla_queue
+from sqlalchemy.sql.dml import Insert, UpdateBase
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+REPLICA_BIND_PREFIX = 'replica_'
+REPLICA_EXTENSION_KEY = 'sqlalchemy_replicas'
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads issued inside a read_replica() call to a replica engine
+    and everything else to the primary.
+
+    Once the session has flushed a change it stays on the primary until it is
+    removed at the end of the request, so a request always reads its own writes.
+    """
+
+    def __init__(self, db: SQLAlchemy, **kwargs: Any) -> None:
+        super().__init__(db, **kwargs)
+        self.use_replica: bool = False
+        self.has_written: bool = False
+        self._replica: Optional[Engine] = None
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and self.use_replica
+            and not self.has_written
+            and not self._flushing
+            and not isinstance(clause, UpdateBase)
+        ):
+            replica = self._choose_replica()
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _choose_replica(self) -> Optional[Engine]:
+        # Pin one replica per session so a request sees a single, consistent snapshot.
+        if self._replica is None:
+            replicas = get_replica_engines()
+            if replicas:
+                self._replica = random.choice(list(replicas.values()))
+        return self._replica
+
 
-db = SQLAlchemy()
+@event.listens_for(RoutingSession, 'after_flush')
+def _mark_session_written(session: RoutingSession, flush_context: Any) -> None:
+    session.has_written = True
+
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+migrate = Migrate(directory=MIGRATIONS_DIR)
 logger = logging.getLogger(__name__)
 
 
+@contextmanager
+def replica_reads() -> Iterator[None]:
+    """
+    Context manager form of read_replica(), for code that cannot be decorated such
+    as generators that stream query results.
+    """
+    session = db.session()
+    previous = session.use_replica
+    session.use_replica = True
+    try:
+        yield
+    finally:
+        session.use_replica = previous
+
+
+def read_replica(func: F) -> F:
+    """
+    Decorator for read-only service methods: queries issued while the method runs
+    go to a read replica when one is configured and the session has not written yet.
+    """
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with replica_reads():
+            return func(*args, **kwargs)
+    return wrapper  # type: ignore[return-value]
+
+
+def init_replicas(app: Flask) -> None:
+    """
+    Creates one engine per SQLALCHEMY_REPLICA_URIS entry, named replica_<n>.
+
+    Replicas are kept out of SQLALCHEMY_BINDS: they mirror the primary's tables
+    instead of owning models of their own.
+
+    Args:
+        app (Flask): The Flask application instance.
+    """
+    engines: Dict[str, Engine] = {}
+    for index, uri in enumerate(app.config.get('SQLALCHEMY_REPLICA_URIS') or []):
+        engines[f"{REPLICA_BIND_PREFIX}{index}"] = create_engine(uri, **build_engine_options(app.config, uri))
+    app.extensions[REPLICA_EXTENSION_KEY] = engines
+    logger.debug("Configured %d read replica(s).", len(engines))
+
+
+def get_replica_engines() -> Dict[str, Engine]:
+    """
+    Returns the read replica engines of the current application, keyed by name.
+    """
+    return current_app.extensions.get(REPLICA_EXTENSION_KEY, {})
+
+
+def insert_ignore(table: Table, dialect: Optional[str] = None) -> Insert:
+    """
+    Builds an INSERT that silently skips rows violating a unique constraint, in the
+    dialect of the primary database: ON CONFLICT DO NOTHING on SQLite and PostgreSQL,
+    and on MySQL ON DUPLICATE KEY UPDATE setting the primary key to itself. Unlike
+    INSERT IGNORE, the latter still fails on foreign key violations and invalid
+    values instead of turning them into warnings.
+
+    Args:
+        table (Table): The table to insert into.
+        dialect (Optional[str]): Dialect name; defaults to the primary database's.
+
+    Returns:
+        Insert: The statement, to be given rows with .values().
+    """
+    dialect = dialect or db.engine.dialect.name
+    if dialect == 'sqlite':
+        return sqlite.insert(table).on_conflict_do_nothing()
+    if dialect == 'postgresql':
+        return postgresql.insert(table).on_conflict_do_nothing()
+    return mysql.insert(table).on_duplicate_key_update({column.name: column for column in table.primary_key.columns})
+
+
+class PoolMetrics:
+    """
+    Thread-safe counters describing how a connection pool is being used.
+
+    Attributes:
+        checkouts (int): Connections handed out by the pool.
+        checkins (int): Connections returned to the pool.
+        connects (int): New DBAPI connections opened by the pool.
+        timeouts (int): Checkouts that gave up after DB_POOL_TIMEOUT seconds.
+        wait_count (int): Checkouts that waited for a connection to be returned, the
+            pool being at its size and overflow limit.
+        wait_time_total (float): Sum of those waits, in seconds. Opening connections
+            and pre-ping round trips are not counted.
+        wait_time_max (float): Longest wait, in seconds.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.timeouts = 0
+        self.wait_count = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.wait_count += 1
+            self.wait_time_total += seconds
+            self.wait_time_max = max(self.wait_time_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'checkouts': self.checkouts,
+                'checkins': self.checkins,
+                'connects': self.connects,
+                'timeouts': self.timeouts,
+                'wait_count': self.wait_count,
+                'wait_time_total': self.wait_time_total,
+                'wait_time_avg': self.wait_time_total / self.wait_count if self.wait_count else 0.0,
+                'wait_time_max': self.wait_time_max,
+            }
+
+
+class _TimedQueue(sqla_queue.Queue):
+    """
+    Connection queue of InstrumentedQueuePool, timing the gets that block: those
+    made when the pool cannot open another connection and must wait for one to be
+    returned.
+    """
+
+    metrics: Optional[PoolMetrics] = None
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        if not block or self.metrics is None:
+            return super().get(block, timeout)
+        start = time.perf_counter()
+        try:
+            connection = super().get(block, timeout)
+        except sqla_queue.Empty:
+            # QueuePool turns this into a TimeoutError.
+            self.metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that records how long checkouts waited for a connection to be
+    returned to it.
+    """
+
+    _queue_class = _TimedQueue
+
+    @property
+    def metrics(self) -> Optional[PoolMetrics]:
+        return self._pool.metrics
+
+    @metrics.setter
+    def metrics(self, metrics: Optional[PoolMetrics]) -> None:
+        self._pool.metrics = metrics
+
+    def recreate(self) -> QueuePool:
+        # Engine.dispose() swaps in a fresh pool; keep counting into the same metrics.
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+_pool_metrics: Dict[str, PoolMetrics] = {}
+
+
+def build_engine_options(config: Mapping[str, Any], uri: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Builds SQLALCHEMY_ENGINE_OPTIONS from the DB_POOL_* configuration values.
+
+    Explicit SQLALCHEMY_ENGINE_OPTIONS entries take precedence. SQLite engines are
+    left untouched since Flask-SQLAlchemy gives them a pool that does not accept
+    sizing arguments.
+
+    Args:
+        config (Mapping[str, Any]): The Flask application configuration.
+        uri (Optional[str]): The database URI the options are for. Defaults to
+            SQLALCHEMY_DATABASE_URI.
+
+    Returns:
+        Dict[str, Any]: Keyword arguments for create_engine().
+    """
+    options: Dict[str, Any] = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    url = make_url(uri or config['SQLALCHEMY_DATABASE_URI'])
+    if url.get_backend_name() == 'sqlite':
+        return options
+
+    options.setdefault('poolclass', InstrumentedQueuePool)
+    options.setdefault('pool_size', config['DB_POOL_SIZE'])
+    options.setdefault('max_overflow', config['DB_MAX_OVERFLOW'])
+    options.setdefault('pool_recycle', config['DB_POOL_RECYCLE'])
+    options.setdefault('pool_pre_ping', config['DB_POOL_PRE_PING'])
+    options.setdefault('pool_timeout', config['DB_POOL_TIMEOUT'])
+    return options
+
+
+def instrument_engine(name: str, engine: Engine) -> PoolMetrics:
+    """
+    Attaches checkout/checkin/connect counters to an engine's connection pool.
+
+    Args:
+        name (str): Name under which the metrics are reported by get_pool_stats().
+        engine (Engine): The engine to instrument.
+
+    Returns:
+        PoolMetrics: The metrics object collecting the pool's counters.
+    """
+    metrics = PoolMetrics()
+    _pool_metrics[name] = metrics
+    if isinstance(engine.pool, InstrumentedQueuePool):
+        engine.pool.metrics = metrics
+
+    event.listen(engine, 'checkout', lambda *args: metrics.increment('checkouts'))
+    event.listen(engine, 'checkin', lambda *args: metrics.increment('checkins'))
+    event.listen(engine, 'connect', lambda *args: metrics.increment('connects'))
+    logger.debug("Pool metrics attached to engine '%s'.", name)
+    return metrics
+
+
+def register_pool_metrics() -> None:
+    """
+    Instruments every engine of the current application. Must be called within an
+    application context, after db.init_app().
+    """
+    _pool_metrics.clear()
+    for name, engine in _named_engines().items():
+        instrument_engine(name, engine)
+
+
+def _named_engines() -> Dict[str, Engine]:
+    engines = {bind_key or 'primary': engine for bind_key, engine in db.engines.items()}
+    engines.update(get_replica_engines())
+    return engines
+
+
+def get_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Reports usage counters and the live state of every instrumented pool.
+    Must be called within an application context.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Pool statistics keyed by engine name. Queue pools
+        also report their size, checked-out and overflow connection counts.
+    """
+    stats: Dict[str, Dict[str, Any]] = {}
+    engines = _named_engines()
+    for name, metrics in _pool_metrics.items():
+        snapshot = metrics.snapshot()
+        pool = engines[name].pool if name in engines else None
+        if isinstance(pool, QueuePool):
+            snapshot.update({
+                'size': pool.size(),
+                'checked_out': pool.checkedout(),
+                'overflow': pool.overflow(),
+                'checked_in': pool.checkedin(),
+            })
+        stats[name] = snapshot
+    return stats
+
+
 def initialize_database() -> bool:
     """
     Initializes the database by checking if MySQL is running and can be connected to.
@@ -1,15 +1,28 @@
 import uuid
 import hashlib
 from datetime import datetime, timezone
-from sqlalchemy import Enum
-from werkzeug.security import generate_password_hash, check_password_hash
-from sqlalchemy_utils import StringEncryptedType
+from sqlalchemy import Enum, event, inspect
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import Session, object_session, validates
 from sqlalchemy_utils.types.encrypted.encrypted_type import FernetEngine
 
 from api.config import config
+from api.utils.blind_index import blind_tokens
+from api.utils.cache import TTLCache
+from api.utils.encryption import CachedStringEncryptedType, DecryptionCache
+from api.utils.password_hashing import hash_password, verify_password
 from .database import db
 
 SECRET_KEY = config.Config.ENCRYPTION_KEY
+BLIND_INDEX_KEY = config.Config.BLIND_INDEX_KEY
+
+# Shared by the encrypted User columns; decryption_cache.stats() reports its hit ratio.
+decryption_cache = DecryptionCache(config.Config.DECRYPTION_CACHE_MAX_BYTES)
+# Current token version of recently seen users, by user id (see AuthService.get_token_version).
+token_versions = TTLCache(maxsize=config.Config.TOKEN_VERSION_CACHE_SIZE, ttl=config.Config.TOKEN_VERSION_CACHE_TTL)
+# updated_at feeds ETags, which must change with every update: kept to the
+# microsecond on MySQL too, whose DATETIME otherwise rounds to whole seconds.
+UpdatedAt = db.DateTime(timezone=True).with_variant(mysql.DATETIME(fsp=6), 'mysql')
 
 
 def compute_email_hash(email: str) -> str:
@@ -33,8 +46,12 @@ class User(db.Model):
         _name (str): Encrypted name of the user, cannot be null.
         _email (str): Encrypted email of the user, cannot be null.
         email_hash (str): SHA-256 hash of the email (used for lookups and uniqueness).
+        search_tokens (List[UserSearchToken]): Blind n-gram index of the name and email,
+            kept up to date by their setters (used for substring search).
         password_hash (str): Hashed password for security, cannot be null.
         role (Enum): Role of the user, can be 'Student', 'Professor', or 'Administrator'.
+        token_version (int): Embedded in issued access tokens; incremented when the
+            role or password changes so that older tokens are rejected.
         created_at (datetime): Timestamp when the user was created.
         updated_at (datetime): Timestamp when the user was last updated.
     """
@@ -44,31 +61,34 @@ class User(db.Model):
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     _name = db.Column(
         "name",
-        StringEncryptedType(db.String, SECRET_KEY, engine=FernetEngine, length=512),
+        CachedStringEncryptedType(db.String, SECRET_KEY, engine=FernetEngine, length=512, cache=decryption_cache),
         nullable=False
     )
     _email = db.Column(
         "email",
-        StringEncryptedType(db.String, SECRET_KEY, engine=FernetEngine, length=512),
+        CachedStringEncryptedType(db.String, SECRET_KEY, engine=FernetEngine, length=512, cache=decryption_cache),
         nullable=False
     )
     email_hash = db.Column(db.String(64), unique=True, nullable=False)
 
     password_hash = db.Column(db.String(255), nullable=False)
     role = db.Column(Enum('Student', 'Professor', 'Administrator', name="user_roles"), nullable=False)
+    token_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     created_at = db.Column(
         db.DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc)
     )
     updated_at = db.Column(
-        db.DateTime(timezone=True),
+        UpdatedAt,
         default=lambda: datetime.now(timezone.utc),
         onupdate=lambda: datetime.now(timezone.utc)
     )
 
-    courses_created = db.relationship('Course', backref='professor', lazy='joined')
-    enrollments = db.relationship('Enrollment', backref='student', lazy='joined')
-    grades = db.relationship('Grade', backref='student', lazy='joined')
+    # Loaded on access only; use UserService.get_user_with_relationships() to fetch them up front.
+    courses_created = db.relationship('Course', backref='professor', lazy='select')
+    enrollments = db.relationship('Enrollment', backref='student', lazy='select')
+    grades = db.relationship('Grade', backref='student', lazy='select')
+    search_tokens = db.relationship('UserSearchToken', cascade='all, delete-orphan', lazy='select')
 
     @property
     def name(self):
@@ -77,6 +97,7 @@ class User(db.Model):
     @name.setter
     def name(self, value):
         self._name = value
+        self._index_search_tokens('name', value)
 
     @property
     def email(self):
@@ -86,19 +107,173 @@ class User(db.Model):
     def email(self, value):
         self._email = value
         self.email_hash = compute_email_hash(value)
+        self._index_search_tokens('email', value)
+
+    def _index_search_tokens(self, field: str, value: str) -> None:
+        """Replaces the blind index tokens of a field, keeping the rows that did not change."""
+        wanted = blind_tokens(value, BLIND_INDEX_KEY) if value else set()
+        kept = [t for t in self.search_tokens if t.field != field or t.token in wanted]
+        existing = {t.token for t in kept if t.field == field}
+        self.search_tokens = kept + [
+            UserSearchToken(field=field, token=token) for token in wanted - existing
+        ]
+
+    @validates('role')
+    def _validate_role(self, key, role):
+        if self.role is not None and role != self.role:
+            self.revoke_tokens()
+        return role
 
     def set_password(self, password: str) -> None:
-        """Hashes the provided password and stores it in the password_hash field."""
-        self.password_hash = generate_password_hash(password)
+        """
+        Hashes the provided password and stores it in the password_hash field.
+        Replacing an existing password revokes the user's tokens.
+        """
+        if self.password_hash is not None:
+            self.revoke_tokens()
+        self.password_hash = hash_password(password)
+
+    def revoke_tokens(self) -> None:
+        """
+        Invalidates every access token issued to the user so far.
+
+        The increment is done by the database (token_version = token_version + 1),
+        not on the possibly stale value loaded in this session, so concurrent
+        revocations cannot overwrite each other. The attribute is reloaded on next access.
+        """
+        if inspect(self).has_identity:
+            self.token_version = User.token_version + 1
+        else:
+            self.token_version = (self.token_version or 0) + 1
 
     def check_password(self, password: str) -> bool:
         """Checks if the provided password matches the stored password hash."""
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
 
     def __repr__(self):
         return f"<User {self.email}>"
 
 
+# Session.info key of the users whose token version changed in the current transaction.
+_CHANGED_TOKEN_VERSIONS = 'changed_token_versions'
+
+
+@event.listens_for(User, 'before_update')
+def _forget_token_version(mapper, connection, target: User) -> None:
+    # Before the flush: an increment done by the database expires the attribute,
+    # and its history with it. Forgotten again after commit, so that a lookup made
+    # in between cannot cache the previous version.
+    if inspect(target).attrs.token_version.history.has_changes():
+        token_versions.invalidate(target.id)
+        session = object_session(target)
+        if session is not None:
+            session.info.setdefault(_CHANGED_TOKEN_VERSIONS, set()).add(target.id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _forget_committed_token_versions(session: Session) -> None:
+    for user_id in session.info.pop(_CHANGED_TOKEN_VERSIONS, ()):
+        token_versions.invalidate(user_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_changed_token_versions(session: Session) -> None:
+    session.info.pop(_CHANGED_TOKEN_VERSIONS, None)
+
+
+class UserSearchToken(db.Model):
+    """
+    UserSearchToken Model
+
+    One row per distinct n-gram of a user's name or email, stored as a keyed HMAC so
+    that substring searches can be answered by an indexed lookup without storing or
+    decrypting plaintext. Maintained by the User.name and User.email setters.
+
+    Attributes:
+        user_id (str): Unique identifier of the user the token belongs to.
+        field (str): The field the n-gram comes from, 'name' or 'email'.
+        token (str): Truncated HMAC-SHA256 of the n-gram (see api.utils.blind_index).
+    """
+    __tablename__ = 'user_search_tokens'
+
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    field = db.Column(Enum('name', 'email', name="user_search_fields"), primary_key=True)
+    token = db.Column(db.String(32), primary_key=True)
+
+    # Serves UserService.search_users(): token IN (...) then grouped by user and field.
+    __table_args__ = (db.Index('ix_user_search_tokens_token_user_id', 'token', 'user_id'),)
+
+    def __repr__(self):
+        return f"<UserSearchToken User ID: {self.user_id}, Field: {self.field}>"
+
+
+class RevokedToken(db.Model):
+    """
+    RevokedToken Model
+
+    One row per access token revoked before it expired, e.g. at logout. Checked
+    through the Bloom filter of api.services.token_denylist.TokenDenylist, so that
+    tokens that were not revoked need no lookup.
+
+    Attributes:
+        jti (str): Unique identifier of the token (its jti claim).
+        user_id (str): Unique identifier of the user the token was issued to.
+        revoked_at (datetime): When the token was revoked.
+        expires_at (datetime): When the token expires; the row can be purged afterwards.
+    """
+    __tablename__ = 'revoked_tokens'
+
+    jti = db.Column(db.String(36), primary_key=True)
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    # Incremental filter refreshes read the rows revoked since the previous one.
+    revoked_at = db.Column(
+        db.DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+        index=True
+    )
+    expires_at = db.Column(db.DateTime(timezone=True), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<RevokedToken {self.jti}>"
+
+
+class RefreshToken(db.Model):
+    """
+    RefreshToken Model
+
+    One row per refresh token issued. Every refresh token is single use: renewing
+    an access token marks the presented one as used and issues its successor in
+    the same family, which starts at login. Presenting a used token again means it
+    was copied, so the whole family is revoked.
+
+    Attributes:
+        jti (str): Unique identifier of the token (its jti claim).
+        family_id (str): Identifier shared by the tokens rotated from one login.
+        user_id (str): Unique identifier of the user the token was issued to.
+        issued_at (datetime): When the token was issued.
+        expires_at (datetime): When the token expires; the row can be purged afterwards.
+        used_at (datetime): When the token was exchanged, or None while it is unused.
+        revoked_at (datetime): When the family was revoked, or None.
+    """
+    __tablename__ = 'refresh_tokens'
+
+    jti = db.Column(db.String(36), primary_key=True)
+    family_id = db.Column(db.String(36), nullable=False, index=True)
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    issued_at = db.Column(
+        db.DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc)
+    )
+    expires_at = db.Column(db.DateTime(timezone=True), nullable=False, index=True)
+    used_at = db.Column(db.DateTime(timezone=True), nullable=True)
+    revoked_at = db.Column(db.DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return f"<RefreshToken {self.jti}>"
+
+
 class Course(db.Model):
     """
     Course Model
@@ -116,13 +291,13 @@ class Course(db.Model):
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     name = db.Column(db.String(255), nullable=False)
-    professor_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    professor_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False, index=True)
     created_at = db.Column(
         db.DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc)
     )
     updated_at = db.Column(
-        db.DateTime(timezone=True),
+        UpdatedAt,
         default=lambda: datetime.now(timezone.utc),
         onupdate=lambda: datetime.now(timezone.utc)
     )
@@ -130,6 +305,14 @@ class Course(db.Model):
     enrollments = db.relationship('Enrollment', backref='course', lazy=True)
     grades = db.relationship('Grade', backref='course', lazy=True)
 
+    # Sort key of cursor pagination (CourseService.get_courses_after), and the
+    # FULLTEXT index used by CourseService.search_courses_by_name on MySQL (a plain
+    # index elsewhere).
+    __table_args__ = (
+        db.Index('ix_courses_created_at_id', 'created_at', 'id'),
+        db.Index('ix_courses_name_fulltext', 'name', mysql_prefix='FULLTEXT'),
+    )
+
     def __repr__(self):
         return f"<Course {self.name}>"
 
@@ -150,7 +333,7 @@ class Enrollment(db.Model):
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     student_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
-    course_id = db.Column(db.String(36), db.ForeignKey('courses.id'), nullable=False)
+    course_id = db.Column(db.String(36), db.ForeignKey('courses.id'), nullable=False, index=True)
     enrolled_at = db.Column(
         db.DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc)
@@ -182,17 +365,24 @@ class Grade(db.Model):
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     name = db.Column(db.String(255), nullable=False)
     course_id = db.Column(db.String(36), db.ForeignKey('courses.id'), nullable=False)
-    student_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    student_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False, index=True)
     grade = db.Column(db.Float, nullable=False)
     created_at = db.Column(
         db.DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc)
     )
     updated_at = db.Column(
-        db.DateTime(timezone=True),
+        UpdatedAt,
         default=lambda: datetime.now(timezone.utc),
         onupdate=lambda: datetime.now(timezone.utc)
     )
 
+    # Serves get_student_grades() and, through its leading column, per-course lookups.
+    # (created_at, id) is the sort key of cursor pagination in GradeService.list_grades().
+    __table_args__ = (
+        db.Index('ix_grades_course_id_student_id', 'course_id', 'student_id'),
+        db.Index('ix_grades_created_at_id', 'created_at', 'id'),
+    )
+
     def __repr__(self):
         return f"<Grade Student ID: {self.student_id}, Course ID: {self.course_id}, Grade: {self.grade}>"
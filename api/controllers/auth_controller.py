@@ -3,14 +3,15 @@ from typing import Any, Dict, Tuple, Optional, List
 
 from flask import request
 from flask_jwt_extended import (
-    create_access_token,
     jwt_required,
-    get_jwt_identity,
+    current_user,
+    get_jwt,
 )
 from api.utils.serializer import serialize_user
 from api.utils.validators import validate_email, validate_password
-from api.services.auth_service import AuthService
+from api.services.auth_service import FAMILY_CLAIM, AuthService
 from api.services.user_service import UserService
+from api.utils.password_hashing import HashingBusyError, busy_response
 
 logger = logging.getLogger(__name__)
 
@@ -59,17 +60,8 @@ class AuthController:
                 logger.warning("Password requirements not met during registration.")
                 return {"error": "Password requirements not met"}, 400
 
-            current_user_id: Optional[str] = get_jwt_identity()
-            current_user: Optional[Any] = (
-                self.user_service.get_user_by_id(current_user_id) if current_user_id else None
-            )
-
-            if not current_user:
-                logger.warning("Registration attempted by anonymous user.")
-                return {"error": "Unauthorized access"}, 403
-
             if current_user.role != "Administrator":
-                logger.warning(f"Unauthorized registration attempt by user ID: {current_user_id}")
+                logger.warning(f"Unauthorized registration attempt by user ID: {current_user.id}")
                 return {"error": "Unauthorized access"}, 403
 
             if self.user_service.get_user_by_email(data["email"]):
@@ -85,6 +77,9 @@ class AuthController:
             logger.info(f"User registered successfully with ID: {user.id}")
             return {"message": "User created", "id": str(user.id)}, 200
 
+        except HashingBusyError:
+            logger.warning("Registration rejected: password hashing queue is full.")
+            return busy_response()
         except ValueError as ve:
             logger.error(f"ValueError during registration: {str(ve)}", exc_info=True)
             return {"error": str(ve)}, 409
@@ -110,13 +105,17 @@ class AuthController:
                 logger.warning("Invalid credentials during login.")
                 return {"error": "Invalid credentials"}, 401
 
-            access_token: str = create_access_token(identity=str(user.id))
+            access_token, refresh_token = self.auth_service.issue_tokens(user)
             logger.info(f"User logged in successfully with ID: {user.id}")
             return {
                 "access_token": access_token,
+                "refresh_token": refresh_token,
                 "user": serialize_user(user)
             }, 200
 
+        except HashingBusyError:
+            logger.warning("Login rejected: password hashing queue is full.")
+            return busy_response()
         except Exception as e:
             logger.error(f"Login error: {str(e)}", exc_info=True)
             return {"error": "Authentication failed"}, 500
@@ -158,6 +157,52 @@ class AuthController:
             logger.info(f"Password updated successfully for user ID: {user.id}")
             return {"message": "Password updated successfully"}, 200
 
+        except HashingBusyError:
+            logger.warning("Password change rejected: password hashing queue is full.")
+            return busy_response()
         except Exception as e:
             logger.error(f"Change password error: {str(e)}", exc_info=True)
             return {"error": "Unable to change password"}, 500
+
+    @jwt_required(refresh=True)
+    def refresh(self) -> Tuple[Dict[str, Any], int]:
+        """
+        Exchange a refresh token, sent as the bearer token, for a new access token and
+        a new refresh token. The presented refresh token cannot be used again.
+
+        Returns:
+            Tuple[Dict[str, Any], int]: The new tokens or error message.
+        """
+        try:
+            tokens = self.auth_service.rotate_refresh_token(get_jwt())
+            if tokens is None:
+                logger.warning(f"Invalid refresh token presented by user ID: {current_user.id}")
+                return {"error": "Invalid refresh token"}, 401
+
+            access_token, refresh_token = tokens
+            return {"access_token": access_token, "refresh_token": refresh_token}, 200
+
+        except Exception as e:
+            logger.error(f"Token refresh error: {str(e)}", exc_info=True)
+            return {"error": "Unable to refresh token"}, 500
+
+    @jwt_required()
+    def logout(self) -> Tuple[Dict[str, Any], int]:
+        """
+        Revoke the access token the request was made with, and the refresh tokens of
+        the same login.
+
+        Returns:
+            Tuple[Dict[str, Any], int]: Success or error message.
+        """
+        try:
+            jwt_payload = get_jwt()
+            self.auth_service.revoke_token(jwt_payload)
+            if FAMILY_CLAIM in jwt_payload:
+                self.auth_service.revoke_refresh_family(jwt_payload[FAMILY_CLAIM])
+            logger.info(f"User logged out with ID: {current_user.id}")
+            return {"message": "Logged out"}, 200
+
+        except Exception as e:
+            logger.error(f"Logout error: {str(e)}", exc_info=True)
+            return {"error": "Unable to log out"}, 500
@@ -1,14 +1,23 @@
 import logging
 from flask import request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, current_user
 from typing import Any, Tuple, Optional, Dict
 
-from api.utils.serializer import serialize_course, serialize_user
+from api.utils.conditional import compute_etag, not_modified, with_etag
+from api.utils.pagination import decode_cursor, encode_cursor
+from api.utils.serializer import (
+    COURSE_FIELDS, serialize_course, serialize_course_rows, serialize_courses, serialize_users
+)
+from ..middlewares.auth_middleware import require_role
 from ..services.course_service import CourseService
 from ..services.user_service import UserService
 
 logger = logging.getLogger(__name__)
 
+MAX_PAGE_SIZE = 100
+DEFAULT_SEARCH_LIMIT = 20
+MAX_BULK_ENROLLMENTS = 50000
+
 
 class CourseController:
     """
@@ -31,17 +40,32 @@ class CourseController:
         Query parameters:
           - page (int): Current page number (default is 1)
           - per_page (int): Number of courses per page (default is 10)
+          - after (str): Cursor returned as `next_after` by the previous page. Passing it
+            (empty for the first page) switches to cursor pagination, which does not
+            count or skip rows.
+          - include_total (bool): In cursor mode, also return the (cached) total count.
+
+        Responses carry an ETag derived from the course list's version stamp; a request
+        whose If-None-Match matches it gets an empty 304 without any course being loaded.
 
         Returns:
             Tuple[Dict[str, Any], int]: A tuple with a JSON response containing course data and pagination info.
         """
+        if 'after' in request.args:
+            return self._list_courses_after()
+
         page: int = request.args.get('page', 1, type=int)
         per_page: int = request.args.get('per_page', 10, type=int)
         logger.info(f"Listing courses - Page: {page}, Per Page: {per_page}")
 
         try:
+            etag = compute_etag('courses', self.course_service.get_courses_version())
+            unchanged = not_modified(etag)
+            if unchanged is not None:
+                return unchanged
+
             courses, pagination = self.course_service.get_all_courses_paginated(page, per_page)
-            courses_data = [serialize_course(course) for course in courses]
+            courses_data = serialize_courses(courses)
             response: Dict[str, Any] = {
                 'courses': courses_data,
                 'pagination': {
@@ -51,7 +75,49 @@ class CourseController:
                     'total_items': pagination.total
                 }
             }
-            return jsonify(response), 200
+            return with_etag(jsonify(response), etag), 200
+
+        except Exception as e:
+            logger.error(f"Error listing courses: {str(e)}", exc_info=True)
+            return jsonify({'msg': 'An error occurred while listing courses.'}), 500
+
+    def _list_courses_after(self) -> Tuple[Any, int]:
+        """
+        Cursor-paginated variant of list_courses, ordered by (created_at, id).
+
+        Returns:
+            Tuple[Dict[str, Any], int]: The page of courses with the cursor of the next page.
+        """
+        token: str = request.args.get('after', '').strip()
+        per_page: int = min(max(request.args.get('per_page', 10, type=int), 1), MAX_PAGE_SIZE)
+        include_total: bool = request.args.get('include_total', 'false').lower() == 'true'
+        logger.info(f"Listing courses - After: '{token}', Per Page: {per_page}")
+
+        try:
+            after = decode_cursor(token) if token else None
+        except ValueError:
+            logger.warning(f"Invalid course cursor: '{token}'")
+            return jsonify({'msg': 'Invalid pagination cursor.'}), 400
+
+        try:
+            etag = compute_etag('courses', self.course_service.get_courses_version())
+            unchanged = not_modified(etag)
+            if unchanged is not None:
+                return unchanged
+
+            courses, has_more = self.course_service.get_courses_after(after, per_page, COURSE_FIELDS.columns)
+            pagination: Dict[str, Any] = {
+                'per_page': per_page,
+                'has_more': has_more,
+                'next_after': encode_cursor(courses[-1].created_at, courses[-1].id) if has_more else None,
+            }
+            if include_total:
+                pagination['total_items'] = self.course_service.count_courses()
+
+            return with_etag(jsonify({
+                'courses': serialize_course_rows(courses),
+                'pagination': pagination
+            }), etag), 200
 
         except Exception as e:
             logger.error(f"Error listing courses: {str(e)}", exc_info=True)
@@ -60,7 +126,8 @@ class CourseController:
     @jwt_required()
     def get_course(self, course_id: str) -> Tuple[Any, int]:
         """
-        Retrieve details of a specific course by its ID.
+        Retrieve details of a specific course by its ID, or an empty 304 when the
+        request's If-None-Match matches the course's ETag.
 
         Args:
             course_id (str): The unique identifier of the course.
@@ -75,7 +142,12 @@ class CourseController:
                 logger.warning(f"Course not found: ID {course_id}")
                 return jsonify({'msg': 'Course not found.'}), 404
 
-            return jsonify({'course': serialize_course(course)}), 200
+            etag = compute_etag('course', course.id, course.updated_at)
+            unchanged = not_modified(etag)
+            if unchanged is not None:
+                return unchanged
+
+            return with_etag(jsonify({'course': serialize_course(course)}), etag), 200
 
         except Exception as e:
             logger.error(f"Error retrieving course: {str(e)}", exc_info=True)
@@ -84,20 +156,22 @@ class CourseController:
     @jwt_required()
     def search_courses(self) -> Tuple[Any, int]:
         """
-        Search for courses based on a partial name query.
+        Search for courses based on a partial name query, most relevant first.
 
         Query parameters:
           - name (str): The search string to match course names.
+          - limit (int): Maximum number of courses returned (default is 20, at most 100)
 
         Returns:
             Tuple[Dict[str, Any], int]: A list of matching courses.
         """
         name_query: str = request.args.get('name', '').strip()
-        logger.info(f"Searching courses with query: '{name_query}'")
+        limit: int = min(max(request.args.get('limit', DEFAULT_SEARCH_LIMIT, type=int), 1), MAX_PAGE_SIZE)
+        logger.info(f"Searching courses with query: '{name_query}', Limit: {limit}")
 
         try:
-            courses = self.course_service.search_courses_by_name(name_query)
-            courses_data = [serialize_course(course) for course in courses]
+            courses = self.course_service.search_courses_by_name(name_query, limit)
+            courses_data = serialize_courses(courses)
             return jsonify({'courses': courses_data}), 200
 
         except Exception as e:
@@ -105,6 +179,7 @@ class CourseController:
             return jsonify({'msg': 'An error occurred while searching courses.'}), 500
 
     @jwt_required()
+    @require_role('Administrator', 'Professor')
     def list_students_in_course(self, course_id: str) -> Tuple[Any, int]:
         """
         List all students enrolled in a specific course.
@@ -117,28 +192,14 @@ class CourseController:
         Returns:
             Tuple[Dict[str, Any], int]: A list of students or an error message.
         """
-        current_user_id: Optional[str] = get_jwt_identity()
-        if not current_user_id:
-            logger.warning("JWT identity not found.")
-            return jsonify({'msg': 'Unauthorized, token missing or invalid.'}), 401
-
-        current_user = self.user_service.get_user_by_id(current_user_id)
-        if not current_user:
-            logger.warning(f"User not found for ID: {current_user_id}")
-            return jsonify({'msg': 'User not found.'}), 404
-
-        if current_user.role not in ['Administrator', 'Professor']:
-            logger.warning(f"Unauthorized access attempt by user ID: {current_user_id}")
-            return jsonify({'msg': 'Unauthorized access.'}), 403
-
         try:
             course = self.course_service.get_course_by_id(course_id)
             if not course:
                 logger.warning(f"Course not found: ID {course_id}")
                 return jsonify({'msg': 'Course not found.'}), 404
 
-            students = self.course_service.get_students_in_course(course_id)
-            students_data = [serialize_user(enrollment.student) for enrollment in students]
+            students = self.user_service.get_enrolled_students(course_id)
+            students_data = serialize_users(students)
             return jsonify({'students': students_data}), 200
 
         except Exception as e:
@@ -146,6 +207,7 @@ class CourseController:
             return jsonify({'msg': 'An error occurred while listing students.'}), 500
 
     @jwt_required()
+    @require_role('Administrator', 'Professor')
     def create_course(self) -> Tuple[Any, int]:
         """
         Create a new course.
@@ -158,20 +220,6 @@ class CourseController:
         Returns:
             Tuple[Dict[str, Any], int]: The created course information or an error message.
         """
-        current_user_id: Optional[str] = get_jwt_identity()
-        if not current_user_id:
-            logger.warning("JWT identity not found.")
-            return jsonify({'msg': 'Unauthorized, token missing or invalid.'}), 401
-
-        current_user = self.user_service.get_user_by_id(current_user_id)
-        if not current_user:
-            logger.warning(f"User not found for ID: {current_user_id}")
-            return jsonify({'msg': 'User not found.'}), 404
-
-        if current_user.role not in ['Administrator', 'Professor']:
-            logger.warning(f"Unauthorized course creation attempt by user ID: {current_user_id}")
-            return jsonify({'msg': 'Unauthorized access.'}), 403
-
         data: Optional[Dict[str, Any]] = request.get_json()
         name: str = data.get('name', '').strip() if data else ''
         if not name:
@@ -206,25 +254,15 @@ class CourseController:
         Returns:
             Tuple[Dict[str, Any], int]: The updated course data or an error message.
         """
-        current_user_id: Optional[str] = get_jwt_identity()
-        if not current_user_id:
-            logger.warning("JWT identity not found.")
-            return jsonify({'msg': 'Unauthorized, token missing or invalid.'}), 401
-
-        current_user = self.user_service.get_user_by_id(current_user_id)
-        if not current_user:
-            logger.warning(f"User not found for ID: {current_user_id}")
-            return jsonify({'msg': 'User not found.'}), 404
-
         try:
-            course = self.course_service.get_course_by_id(course_id)
+            course = self.course_service.get_course_by_id(course_id, for_update=True)
             if not course:
                 logger.warning(f"Course not found: ID {course_id}")
                 return jsonify({'msg': 'Course not found.'}), 404
 
             # Only Administrators or the assigned Professor can update the course.
             if current_user.role not in ['Administrator', 'Professor'] and course.professor_id != current_user.id:
-                logger.warning(f"Unauthorized course update attempt by user ID: {current_user_id}")
+                logger.warning(f"Unauthorized course update attempt by user ID: {current_user.id}")
                 return jsonify({'msg': 'Unauthorized access.'}), 403
 
             data: Optional[Dict[str, Any]] = request.get_json()
@@ -245,6 +283,7 @@ class CourseController:
             return jsonify({'msg': 'An error occurred while updating the course.'}), 500
 
     @jwt_required()
+    @require_role('Administrator')
     def delete_course(self, course_id: str) -> Tuple[Any, int]:
         """
         Delete an existing course.
@@ -257,22 +296,8 @@ class CourseController:
         Returns:
             Tuple[Dict[str, Any], int]: A success message or an error message.
         """
-        current_user_id: Optional[str] = get_jwt_identity()
-        if not current_user_id:
-            logger.warning("JWT identity not found.")
-            return jsonify({'msg': 'Unauthorized, token missing or invalid.'}), 401
-
-        current_user = self.user_service.get_user_by_id(current_user_id)
-        if not current_user:
-            logger.warning(f"User not found for ID: {current_user_id}")
-            return jsonify({'msg': 'User not found.'}), 404
-
-        if current_user.role != 'Administrator':
-            logger.warning(f"Unauthorized course deletion attempt by user ID: {current_user_id}")
-            return jsonify({'msg': 'Unauthorized access.'}), 403
-
         try:
-            course = self.course_service.get_course_by_id(course_id)
+            course = self.course_service.get_course_by_id(course_id, for_update=True)
             if not course:
                 logger.warning(f"Course not found: ID {course_id}")
                 return jsonify({'msg': 'Course not found.'}), 404
@@ -286,6 +311,7 @@ class CourseController:
             return jsonify({'msg': 'An error occurred while deleting the course.'}), 500
 
     @jwt_required()
+    @require_role('Student', msg='Only students can join courses.')
     def join_course(self) -> Tuple[Any, int]:
         """
         Enroll a student into a course.
@@ -298,20 +324,6 @@ class CourseController:
         Returns:
             Tuple[Dict[str, Any], int]: A success message or an error message.
         """
-        current_user_id: Optional[str] = get_jwt_identity()
-        if not current_user_id:
-            logger.warning("JWT identity not found.")
-            return jsonify({'msg': 'Unauthorized, token missing or invalid.'}), 401
-
-        current_user = self.user_service.get_user_by_id(current_user_id)
-        if not current_user:
-            logger.warning(f"User not found for ID: {current_user_id}")
-            return jsonify({'msg': 'User not found.'}), 404
-
-        if current_user.role != 'Student':
-            logger.warning(f"Non-student user ID: {current_user_id} attempted to join a course.")
-            return jsonify({'msg': 'Only students can join courses.'}), 403
-
         data: Optional[Dict[str, Any]] = request.get_json()
         course_id: str = data.get('course_id', '').strip() if data else ''
         if not course_id:
@@ -326,17 +338,70 @@ class CourseController:
 
             enrollment = self.course_service.join_course(current_user.id, course_id)
             if not enrollment:
-                logger.warning(f"User ID: {current_user_id} already enrolled in course ID: {course_id}")
+                logger.warning(f"User ID: {current_user.id} already enrolled in course ID: {course_id}")
                 return jsonify({'msg': 'Already enrolled in this course.'}), 409
 
-            logger.info(f"User ID: {current_user_id} enrolled in course ID: {course_id}")
+            logger.info(f"User ID: {current_user.id} enrolled in course ID: {course_id}")
             return jsonify({'msg': 'Joined course successfully.'}), 200
 
         except Exception as e:
-            logger.error(f"Error joining course {course_id} by user {current_user_id}: {str(e)}", exc_info=True)
+            logger.error(f"Error joining course {course_id} by user {current_user.id}: {str(e)}", exc_info=True)
             return jsonify({'msg': 'An error occurred while joining the course.'}), 500
 
     @jwt_required()
+    def bulk_enroll(self, course_id: str) -> Tuple[Any, int]:
+        """
+        Enroll many students into a course at once.
+
+        Only Administrators or the course's Professor can enroll students. Students
+        who are already enrolled are skipped.
+
+        Expected JSON payload:
+          { "student_ids": ["<student_id>", ...] }
+
+        Args:
+            course_id (str): The unique identifier of the course.
+
+        Returns:
+            Tuple[Dict[str, Any], int]: The outcome for each student id and a summary, or an error message.
+        """
+        data: Optional[Dict[str, Any]] = request.get_json(silent=True)
+        student_ids = data.get('student_ids') if isinstance(data, dict) else None
+        if not isinstance(student_ids, list) or not student_ids or \
+                not all(isinstance(student_id, str) and student_id for student_id in student_ids):
+            logger.warning("Bulk enrollment failed: Invalid student IDs.")
+            return jsonify({'msg': 'student_ids must be a non-empty list of student IDs.'}), 400
+        if len(student_ids) > MAX_BULK_ENROLLMENTS:
+            logger.warning(f"Bulk enrollment failed: {len(student_ids)} student IDs sent.")
+            return jsonify({'msg': f'At most {MAX_BULK_ENROLLMENTS} students can be enrolled per request.'}), 413
+
+        try:
+            course = self.course_service.get_course_by_id(course_id)
+            if not course:
+                logger.warning(f"Bulk enrollment failed: Course not found with ID {course_id}")
+                return jsonify({'msg': 'Course not found.'}), 404
+
+            if current_user.role != 'Administrator' and course.professor_id != current_user.id:
+                logger.warning(f"Unauthorized bulk enrollment attempt by user ID: {current_user.id}")
+                return jsonify({'msg': 'Unauthorized access.'}), 403
+
+            results = self.course_service.bulk_enroll(course_id, student_ids)
+            summary: Dict[str, int] = {}
+            for status in results.values():
+                summary[status] = summary.get(status, 0) + 1
+
+            logger.info(f"Bulk enrollment in course ID: {course_id} by user ID: {current_user.id}: {summary}")
+            return jsonify({
+                'results': [{'student_id': student_id, 'status': status} for student_id, status in results.items()],
+                'summary': summary,
+            }), 200
+
+        except Exception as e:
+            logger.error(f"Error bulk enrolling students in course {course_id}: {str(e)}", exc_info=True)
+            return jsonify({'msg': 'An error occurred while enrolling students.'}), 500
+
+    @jwt_required()
+    @require_role('Student', msg='Only students can leave courses.')
     def leave_course(self) -> Tuple[Any, int]:
         """
         Unenroll a student from a course.
@@ -349,20 +414,6 @@ class CourseController:
         Returns:
             Tuple[Dict[str, Any], int]: A success message or an error message.
         """
-        current_user_id: Optional[str] = get_jwt_identity()
-        if not current_user_id:
-            logger.warning("JWT identity not found.")
-            return jsonify({'msg': 'Unauthorized, token missing or invalid.'}), 401
-
-        current_user = self.user_service.get_user_by_id(current_user_id)
-        if not current_user:
-            logger.warning(f"User not found for ID: {current_user_id}")
-            return jsonify({'msg': 'User not found.'}), 404
-
-        if current_user.role != 'Student':
-            logger.warning(f"Non-student user ID: {current_user_id} attempted to leave a course.")
-            return jsonify({'msg': 'Only students can leave courses.'}), 403
-
         data: Optional[Dict[str, Any]] = request.get_json()
         course_id: str = data.get('course_id', '').strip() if data else ''
         if not course_id:
@@ -372,12 +423,12 @@ class CourseController:
         try:
             enrollment = self.course_service.leave_course(current_user.id, course_id)
             if not enrollment:
-                logger.warning(f"User ID: {current_user_id} is not enrolled in course ID: {course_id}")
+                logger.warning(f"User ID: {current_user.id} is not enrolled in course ID: {course_id}")
                 return jsonify({'msg': 'Not enrolled in this course.'}), 404
 
-            logger.info(f"User ID: {current_user_id} left course ID: {course_id}")
+            logger.info(f"User ID: {current_user.id} left course ID: {course_id}")
             return jsonify({'msg': 'Left course successfully.'}), 200
 
         except Exception as e:
-            logger.error(f"Error leaving course {course_id} by user {current_user_id}: {str(e)}", exc_info=True)
+            logger.error(f"Error leaving course {course_id} by user {current_user.id}: {str(e)}", exc_info=True)
             return jsonify({'msg': 'An error occurred while leaving the course.'}), 500
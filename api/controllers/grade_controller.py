@@ -1,14 +1,27 @@
 import logging
-from flask import request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
-
-from api.utils.serializer import serialize_grade
+from flask import Response, current_app, request, jsonify, stream_with_context
+from flask_jwt_extended import jwt_required, current_user
+
+from api.utils.conditional import compute_etag, not_modified, with_etag
+from api.utils.importers import MalformedImportError, iter_csv_records, iter_json_array
+from api.utils.pagination import decode_cursor, encode_cursor
+from api.utils.serializer import GRADE_FIELDS, serialize_grade, serialize_grade_rows, serialize_grades
+from ..middlewares.auth_middleware import require_role
 from ..services.grade_service import GradeService
 from ..services.user_service import UserService
 from ..services.course_service import CourseService
 
 logger = logging.getLogger(__name__)
 
+NDJSON_MIMETYPE = "application/x-ndjson"
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_CHUNK_SIZE = 1000
+IMPORT_PARSERS = {
+    "text/csv": iter_csv_records,
+    "application/json": iter_json_array,
+}
+
 
 class GradeController:
     """
@@ -25,54 +38,87 @@ class GradeController:
         self.course_service = CourseService()
 
     @jwt_required()
+    @require_role("Professor", "Administrator")
     def list_grades(self):
-        """List all grades (only professors/admins)."""
-        current_user_id = get_jwt_identity()
-        current_user = self.user_service.get_user_by_id(current_user_id)
-
-        # Only allow professors or admins to list grades
-        if current_user.role not in ["Professor", "Administrator"]:
-            logger.warning(f"Unauthorized access attempt by user ID: {current_user_id}")
-            return jsonify({"msg": "Unauthorized access."}), 403
+        """
+        List grades (only professors/admins).
+
+        Query parameters:
+          - course_id, student_id, name (str): Optional filters.
+          - after (str): Cursor returned as `next_after` by the previous page.
+          - limit (int): Number of grades per page (default 100, at most 1000).
+          - format (str): `ndjson` streams every matching grade as newline-delimited
+            JSON instead of returning one page. Also selected by `Accept: application/x-ndjson`.
+        """
+        filters = {key: request.args.get(key, "").strip() or None for key in ("course_id", "student_id", "name")}
+        if self._wants_ndjson():
+            return self._stream_grades(filters)
+
+        token = request.args.get("after", "").strip()
+        limit = min(max(request.args.get("limit", DEFAULT_PAGE_SIZE, type=int), 1), MAX_PAGE_SIZE)
+        try:
+            after = decode_cursor(token) if token else None
+        except ValueError:
+            logger.warning(f"Invalid grade cursor: '{token}'")
+            return jsonify({"msg": "Invalid pagination cursor."}), 400
 
         try:
-            all_grades = self.grade_service.list_grades()
-            serialized = [serialize_grade(g) for g in all_grades]
-            return jsonify({"grades": serialized}), 200
+            grades, has_more = self.grade_service.list_grades(
+                **filters, after=after, limit=limit, columns=GRADE_FIELDS.columns
+            )
+            serialized = serialize_grade_rows(grades)
+            return jsonify({
+                "grades": serialized,
+                "pagination": {
+                    "limit": limit,
+                    "has_more": has_more,
+                    "next_after": encode_cursor(grades[-1].created_at, grades[-1].id) if has_more else None,
+                }
+            }), 200
         except Exception as e:
             logger.error(f"Error listing grades: {str(e)}", exc_info=True)
             return jsonify({"msg": "An error occurred while listing grades."}), 500
 
+    @staticmethod
+    def _wants_ndjson():
+        """Whether the client asked for a newline-delimited JSON stream."""
+        if request.args.get("format") == "ndjson":
+            return True
+        return request.accept_mimetypes.best_match(["application/json", NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+    def _stream_grades(self, filters):
+        """Stream every grade matching the filters, one JSON document per line."""
+        def generate():
+            dumps, fields = current_app.json.dumps, GRADE_FIELDS.fields
+            rows = self.grade_service.stream_grades(
+                **filters, chunk_size=STREAM_CHUNK_SIZE, columns=GRADE_FIELDS.columns
+            )
+            try:
+                for row in rows:
+                    yield dumps(dict(zip(fields, row))) + "\n"
+            except Exception as e:
+                # Headers are already sent; the truncated stream is all the client will see.
+                logger.error(f"Error streaming grades: {str(e)}", exc_info=True)
+                raise
+
+        return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE), 200
+
     @jwt_required()
+    @require_role("Professor", "Administrator")
     def get_grade(self, grade_id):
-        """Retrieve a specific grade by ID."""
-        current_user_id = get_jwt_identity()
-        current_user = self.user_service.get_user_by_id(current_user_id)
-
+        """Retrieve a specific grade by ID (students cannot fetch grades)."""
         grade = self.grade_service.get_grade_by_id(grade_id)
         if not grade:
             logger.warning(f"Grade not found: ID {grade_id}")
             return jsonify({"msg": "Grade not found."}), 404
 
-        # Students cannot fetch grades
-        if current_user.role == "Student":
-            logger.warning(f"Unauthorized grade access attempt by user ID: {current_user_id}")
-            return jsonify({"msg": "Unauthorized access."}), 403
-
         grade_data = serialize_grade(grade)
         return jsonify({"grade": grade_data}), 200
 
     @jwt_required()
+    @require_role("Professor", "Administrator")
     def assign_grade(self):
         """Assign a grade to a student for a particular course."""
-        current_user_id = get_jwt_identity()
-        current_user = self.user_service.get_user_by_id(current_user_id)
-
-        # Only professors or admins can assign a grade
-        if current_user.role not in ["Professor", "Administrator"]:
-            logger.warning(f"Unauthorized grade assignment attempt by user ID: {current_user_id}")
-            return jsonify({"msg": "Unauthorized access."}), 403
-
         data = request.get_json() or {}
         if not all(k in data for k in ("course_id", "student_id", "grade", "grade_name")):
             logger.warning(f"Missing required fields in grade assignment: {data}")
@@ -85,7 +131,7 @@ class GradeController:
 
         try:
             course = self.course_service.get_course_by_id(course_id)
-            student = self.user_service.get_user_by_id(student_id)
+            student = self.user_service.get_user_identity(student_id)
             if not course or not student:
                 logger.warning(f"Course or student not found for grade assignment: course_id={course_id}, student_id={student_id}")
                 return jsonify({"msg": "Course or student not found."}), 404
@@ -98,16 +144,38 @@ class GradeController:
             return jsonify({"msg": "An error occurred while assigning the grade."}), 500
 
     @jwt_required()
+    @require_role("Professor", "Administrator")
+    def import_grades(self):
+        """
+        Import many grades from an uploaded file (only professors/admins).
+
+        The request body is read as a stream, either a CSV file with a header line
+        (Content-Type: text/csv) or a JSON array of objects (Content-Type:
+        application/json). Each row has course_id, student_id, grade and grade_name;
+        course_id and grade_name may instead be given once as query parameters.
+        Invalid rows are reported and skipped, the others are imported together.
+        """
+        parser = IMPORT_PARSERS.get(request.mimetype)
+        if parser is None:
+            logger.warning(f"Unsupported grade import content type: {request.mimetype}")
+            return jsonify({"msg": "Upload a CSV file (text/csv) or a JSON array (application/json)."}), 415
+
+        defaults = {key: request.args[key] for key in ("course_id", "grade_name") if request.args.get(key)}
+        try:
+            result = self.grade_service.import_grades(parser(request.stream), defaults)
+            logger.info(f"Grade import by user ID: {current_user.id}: {result['imported']} imported, {result['failed']} rejected")
+            return jsonify({"msg": "Grades imported.", **result}), 200
+        except MalformedImportError as e:
+            logger.warning(f"Malformed grade import at row {e.row}: {str(e)}")
+            return jsonify({"msg": f"Row {e.row}: {str(e)} No grades were imported."}), 400
+        except Exception as e:
+            logger.error(f"Error importing grades: {str(e)}", exc_info=True)
+            return jsonify({"msg": "An error occurred while importing grades."}), 500
+
+    @jwt_required()
+    @require_role("Professor", "Administrator")
     def update_grade(self, grade_id):
         """Update an existing grade."""
-        current_user_id = get_jwt_identity()
-        current_user = self.user_service.get_user_by_id(current_user_id)
-
-        # Only professors or admins can update a grade
-        if current_user.role not in ["Professor", "Administrator"]:
-            logger.warning(f"Unauthorized grade update attempt by user ID: {current_user_id}")
-            return jsonify({"msg": "Unauthorized access."}), 403
-
         grade_obj = self.grade_service.get_grade_by_id(grade_id)
         if not grade_obj:
             logger.warning(f"Grade not found: ID {grade_id}")
@@ -129,15 +197,9 @@ class GradeController:
             return jsonify({"msg": "An error occurred while updating the grade."}), 500
 
     @jwt_required()
+    @require_role("Administrator")
     def delete_grade(self, grade_id):
         """Delete a grade (only admins)."""
-        current_user_id = get_jwt_identity()
-        current_user = self.user_service.get_user_by_id(current_user_id)
-
-        if current_user.role != "Administrator":
-            logger.warning(f"Unauthorized grade deletion attempt by user ID: {current_user_id}")
-            return jsonify({"msg": "Unauthorized access."}), 403
-
         grade_obj = self.grade_service.get_grade_by_id(grade_id)
         if not grade_obj:
             logger.warning(f"Grade not found: ID {grade_id}")
@@ -151,25 +213,25 @@ class GradeController:
             return jsonify({"msg": "An error occurred while deleting the grade."}), 500
 
     @jwt_required()
+    @require_role("Professor", "Administrator")
     def get_student_grades(self, course_id, student_id):
         """Retrieve all grades for a student in a specific course."""
-        current_user_id = get_jwt_identity()
-        current_user = self.user_service.get_user_by_id(current_user_id)
-
-        if current_user.role not in ["Professor", "Administrator"]:
-            logger.warning(f"Unauthorized access attempt by user ID: {current_user_id}")
-            return jsonify({"msg": "Unauthorized access."}), 403
-
         try:
             course = self.course_service.get_course_by_id(course_id)
-            student = self.user_service.get_user_by_id(student_id)
+            student = self.user_service.get_user_identity(student_id)
             if not course or not student:
                 logger.warning(f"Course or student not found: course_id={course_id}, student_id={student_id}")
                 return jsonify({"msg": "Course or student not found."}), 404
 
+            etag = compute_etag("grades", course_id, student_id,
+                                self.grade_service.get_student_grades_version(course_id, student_id))
+            unchanged = not_modified(etag)
+            if unchanged is not None:
+                return unchanged
+
             grades = self.grade_service.get_student_grades(course_id, student_id)
-            serialized = [serialize_grade(g) for g in grades]
-            return jsonify({"grades": serialized}), 200
+            serialized = serialize_grades(grades)
+            return with_etag(jsonify({"grades": serialized}), etag), 200
         except Exception as e:
             logger.error(f"Error retrieving student grades: {str(e)}", exc_info=True)
             return jsonify({"msg": "An error occurred while retrieving grades."}), 500
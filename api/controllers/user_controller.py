@@ -1,13 +1,18 @@
 import logging
 from flask import request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, current_user
 from typing import Any, Tuple
 
-from api.utils.serializer import serialize_user
+from api.utils.conditional import compute_etag, not_modified, with_etag
+from api.utils.password_hashing import HashingBusyError, busy_response
+from api.utils.serializer import serialize_user, serialize_users
+from ..middlewares.auth_middleware import require_role
 from ..services.user_service import UserService
 
 logger = logging.getLogger(__name__)
 
+MAX_BULK_USERS = 10000
+
 
 class UserController:
     """
@@ -22,19 +27,12 @@ class UserController:
         self.user_service = UserService()
 
     @jwt_required()
+    @require_role('Administrator')
     def list_users(self) -> Tuple[Any, int]:
         """Retrieve a list of all users."""
-        current_user_id = get_jwt_identity()
-        current_user = self.user_service.get_user_by_id(current_user_id)
-
-        # Only allow admins to list users
-        if current_user is None or current_user.role != 'Administrator':
-            logger.warning(f"Unauthorized access attempt by user ID: {current_user_id}")
-            return jsonify({'msg': 'Unauthorized access.'}), 403
-
         try:
             users = self.user_service.get_all_users()
-            users_data = [serialize_user(user) for user in users]
+            users_data = serialize_users(users)
             return jsonify({'users': users_data}), 200
         except Exception as e:
             logger.error(f"Error listing users: {str(e)}", exc_info=True)
@@ -43,52 +41,40 @@ class UserController:
     @jwt_required()
     def get_user(self, user_id: str) -> Tuple[Any, int]:
         """Retrieve details of a specific user by their ID."""
-        current_user_id = get_jwt_identity()
-        current_user = self.user_service.get_user_by_id(current_user_id)
-
         user = self.user_service.get_user_by_id(user_id)
         if not user:
             logger.warning(f"User not found: ID {user_id}")
             return jsonify({'msg': 'User not found.'}), 404
 
         if current_user.role not in ['Administrator', 'Professor'] and current_user.id != user_id:
-            logger.warning(f"Unauthorized access attempt by user ID: {current_user_id}")
+            logger.warning(f"Unauthorized access attempt by user ID: {current_user.id}")
             return jsonify({'msg': 'Unauthorized access.'}), 403
 
+        etag = compute_etag('user', user.id, user.updated_at)
+        unchanged = not_modified(etag)
+        if unchanged is not None:
+            return unchanged
+
         user_data = serialize_user(user)
-        return jsonify({'user': user_data}), 200
+        return with_etag(jsonify({'user': user_data}), etag), 200
 
     @jwt_required()
+    @require_role('Administrator')
     def search_users(self) -> Tuple[Any, int]:
         """Search for users based on a query string."""
-        current_user_id = get_jwt_identity()
-        current_user = self.user_service.get_user_by_id(current_user_id)
-
-        # Only allow admins to search for users
-        if current_user is None or current_user.role != 'Administrator':
-            logger.warning(f"Unauthorized access attempt by user ID: {current_user_id}")
-            return jsonify({'msg': 'Unauthorized access.'}), 403
-
         query = request.args.get('query', '').strip()
         try:
             users = self.user_service.search_users(query)
-            users_data = [serialize_user(user) for user in users]
+            users_data = serialize_users(users)
             return jsonify({'users': users_data}), 200
         except Exception as e:
             logger.error(f"Error searching users: {str(e)}", exc_info=True)
             return jsonify({'msg': 'An error occurred while searching users.'}), 500
 
     @jwt_required()
+    @require_role('Administrator')
     def create_user(self) -> Tuple[Any, int]:
         """Create a new user."""
-        current_user_id = get_jwt_identity()
-        current_user = self.user_service.get_user_by_id(current_user_id)
-
-        # Only allow admins to create users
-        if current_user is None or current_user.role != 'Administrator':
-            logger.warning(f"Unauthorized access attempt by user ID: {current_user_id}")
-            return jsonify({'msg': 'Unauthorized access.'}), 403
-
         data = request.get_json()
         name = data.get('name', '').strip()
         email = data.get('email', '').strip().lower()
@@ -112,22 +98,51 @@ class UserController:
             user = self.user_service.create_user(name, email, password, role)
             user_data = serialize_user(user)
             return jsonify({'msg': 'User created successfully.', 'user': user_data}), 200
+        except HashingBusyError:
+            logger.warning("User creation rejected: password hashing queue is full.")
+            return busy_response('msg')
         except Exception as e:
             logger.error(f"Error creating user: {str(e)}", exc_info=True)
             return jsonify({'msg': 'An error occurred while creating the user.'}), 500
 
+    @jwt_required()
+    @require_role('Administrator')
+    def bulk_create_users(self) -> Tuple[Any, int]:
+        """
+        Create many users at once (only admins).
+
+        Expected JSON payload:
+          { "users": [{ "name": ..., "email": ..., "password": ..., "role": ... }, ...] }
+        """
+        data = request.get_json(silent=True)
+        rows = data.get('users') if isinstance(data, dict) else None
+        if not isinstance(rows, list) or not rows:
+            logger.warning("Bulk user creation failed: Missing users.")
+            return jsonify({'msg': 'users must be a non-empty list.'}), 400
+        if len(rows) > MAX_BULK_USERS:
+            logger.warning(f"Bulk user creation failed: {len(rows)} users sent.")
+            return jsonify({'msg': f'At most {MAX_BULK_USERS} users can be created per request.'}), 413
+
+        try:
+            results = self.user_service.bulk_create_users(rows)
+            summary = {}
+            for result in results:
+                summary[result['status']] = summary.get(result['status'], 0) + 1
+            logger.info(f"Bulk user creation by user ID: {current_user.id}: {summary}")
+            return jsonify({'results': results, 'summary': summary}), 200
+        except Exception as e:
+            logger.error(f"Error bulk creating users: {str(e)}", exc_info=True)
+            return jsonify({'msg': 'An error occurred while creating the users.'}), 500
+
     @jwt_required()
     def update_user(self, user_id: str) -> Tuple[Any, int]:
         """Update details of an existing user."""
-        current_user_id = get_jwt_identity()
-        current_user = self.user_service.get_user_by_id(current_user_id)
-
         # Only allow the user themselves or an admin to update
-        if current_user is None or (current_user.id != user_id and current_user.role != 'Administrator'):
-            logger.warning(f"Unauthorized access attempt by user ID: {current_user_id}")
+        if current_user.id != user_id and current_user.role != 'Administrator':
+            logger.warning(f"Unauthorized access attempt by user ID: {current_user.id}")
             return jsonify({'msg': 'Unauthorized access.'}), 403
 
-        user = self.user_service.get_user_by_id(user_id)
+        user = self.user_service.get_user_by_id(user_id, for_update=True)
         if not user:
             logger.warning(f"User not found: ID {user_id}")
             return jsonify({'msg': 'User not found.'}), 404
@@ -139,26 +154,37 @@ class UserController:
 
         try:
             updated_user = self.user_service.update_user(user, name, email, password)
-
-            updated_user = self.user_service.get_user_by_id(updated_user.id)
             user_data = serialize_user(updated_user)
             return jsonify({'msg': 'User updated successfully.', 'user': user_data}), 200
+        except HashingBusyError:
+            logger.warning(f"Update of user ID: {user_id} rejected: password hashing queue is full.")
+            return busy_response('msg')
         except Exception as e:
             logger.error(f"Error updating user ID: {user_id} - {str(e)}", exc_info=True)
             return jsonify({'msg': 'An error occurred while updating the user.'}), 500
 
     @jwt_required()
-    def delete_user(self, user_id: str) -> Tuple[Any, int]:
-        """Delete an existing user."""
-        current_user_id = get_jwt_identity()
-        current_user = self.user_service.get_user_by_id(current_user_id)
+    @require_role('Administrator')
+    def sign_out_user(self, user_id: str) -> Tuple[Any, int]:
+        """Revoke every access token issued to a user so far (only admins)."""
+        user = self.user_service.get_user_by_id(user_id, for_update=True)
+        if not user:
+            logger.warning(f"User not found: ID {user_id}")
+            return jsonify({'msg': 'User not found.'}), 404
 
-        # Only admins can delete users
-        if current_user is None or current_user.role != 'Administrator':
-            logger.warning(f"Unauthorized access attempt by user ID: {current_user_id}")
-            return jsonify({'msg': 'Unauthorized access.'}), 403
+        try:
+            self.user_service.revoke_tokens(user)
+            logger.info(f"Tokens of user ID: {user_id} revoked by user ID: {current_user.id}")
+            return jsonify({'msg': 'User signed out.'}), 200
+        except Exception as e:
+            logger.error(f"Error signing out user ID: {user_id} - {str(e)}", exc_info=True)
+            return jsonify({'msg': 'An error occurred while signing out the user.'}), 500
 
-        user = self.user_service.get_user_by_id(user_id)
+    @jwt_required()
+    @require_role('Administrator')
+    def delete_user(self, user_id: str) -> Tuple[Any, int]:
+        """Delete an existing user."""
+        user = self.user_service.get_user_by_id(user_id, for_update=True)
         if not user:
             logger.warning(f"User not found: ID {user_id}")
             return jsonify({'msg': 'User not found.'}), 404
@@ -1,13 +1,53 @@
 import logging
-from flask_jwt_extended import JWTManager
-from flask import Flask, jsonify
-from typing import Any, Dict
+from functools import wraps
+from flask_jwt_extended import JWTManager, current_user
+from flask import Flask, jsonify, request
+from typing import Any, Callable, Dict, NamedTuple, Optional, Union
+
+from ..config.models import User
+from ..services.auth_service import ROLE_CLAIM, TOKEN_VERSION_CLAIM, AuthService
+from ..services.user_service import UserService
 
 logger = logging.getLogger(__name__)
 
 jwt = JWTManager()
 
 
+class TokenUser(NamedTuple):
+    """
+    The caller of a request as described by the claims of their access token.
+
+    Attributes:
+        id (str): Unique identifier of the user.
+        role (str): Role of the user when the token was issued.
+    """
+    id: str
+    role: str
+
+
+def require_role(*roles: str, msg: str = 'Unauthorized access.') -> Callable:
+    """
+    Restricts a view to callers with one of the given roles. Must be applied below
+    @jwt_required(), which resolves the caller into current_user.
+
+    Args:
+        *roles (str): The roles allowed to call the view.
+        msg (str): Message of the 403 response sent to other callers.
+
+    Returns:
+        Callable: The decorator.
+    """
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if current_user.role not in roles:
+                logger.warning(f"Unauthorized access attempt to {request.endpoint} by user ID: {current_user.id}")
+                return jsonify({'msg': msg}), 403
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
 def register_auth_middleware(app: Flask) -> None:
     """
     Registers the JWT authentication middleware with the Flask app.
@@ -20,6 +60,68 @@ def register_auth_middleware(app: Flask) -> None:
     jwt.init_app(app)
     logger.debug("JWT Manager initialized and attached to the Flask app.")
 
+    @jwt.user_lookup_loader
+    def load_current_user(jwt_header: Dict[str, Any], jwt_payload: Dict[str, Any]) -> Optional[Union[TokenUser, User]]:
+        """
+        Resolves the caller of a protected view into current_user. flask_jwt_extended
+        calls it once per request and keeps the result for the rest of the request.
+
+        Tokens carrying a role claim are trusted as is, without a query; their
+        version is checked by check_token_revoked. Tokens issued before role claims
+        existed fall back to loading the id and role columns.
+
+        Args:
+            jwt_header (Dict[str, Any]): The JWT header.
+            jwt_payload (Dict[str, Any]): The JWT payload.
+
+        Returns:
+            Optional[Union[TokenUser, User]]: The caller, or None if they no longer exist.
+        """
+        identity = jwt_payload[app.config['JWT_IDENTITY_CLAIM']]
+        role = jwt_payload.get(ROLE_CLAIM)
+        if role is not None:
+            return TokenUser(identity, role)
+        return UserService.get_user_identity(identity)
+
+    @jwt.token_in_blocklist_loader
+    def check_token_revoked(jwt_header: Dict[str, Any], jwt_payload: Dict[str, Any]) -> bool:
+        """
+        Rejects tokens revoked one by one (see TokenDenylist), then tokens issued
+        before the user's last role or password change, or to a user that no longer
+        exists, by comparing their version claim with the user's cached token version.
+
+        Args:
+            jwt_header (Dict[str, Any]): The JWT header.
+            jwt_payload (Dict[str, Any]): The JWT payload.
+
+        Returns:
+            bool: True if the token must be rejected.
+        """
+        if AuthService.is_token_revoked(jwt_payload['jti']):
+            return True
+        version = jwt_payload.get(TOKEN_VERSION_CLAIM)
+        if version is None:
+            return False
+        return AuthService.get_token_version(jwt_payload[app.config['JWT_IDENTITY_CLAIM']]) != version
+
+    @jwt.user_lookup_error_loader
+    def user_lookup_error_callback(jwt_header: Dict[str, Any], jwt_payload: Dict[str, Any]) -> tuple:
+        """
+        Handler for valid tokens whose user no longer exists.
+
+        Args:
+            jwt_header (Dict[str, Any]): The JWT header.
+            jwt_payload (Dict[str, Any]): The JWT payload.
+
+        Returns:
+            tuple: A tuple containing the JSON response and HTTP status code.
+        """
+        logger.warning("JWT token received for a user that no longer exists.")
+        response = {
+            'msg': 'User not found.'
+        }
+        return jsonify(response), 401
+
     @jwt.unauthorized_loader
     def unauthorized_response(callback: Any) -> tuple:
         """
@@ -0,0 +1,137 @@
+import logging
+import zlib
+from typing import Any, Iterable, Iterator, List, Mapping, Optional, Union
+
+from flask import Flask, Response, current_app, request
+
+try:
+    import brotli
+except ImportError:  # Optional: without it only gzip is offered.
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Streamed responses are flushed to the client whenever this much input has been
+# compressed since the previous flush, rather than after every (often one-line) chunk.
+STREAM_FLUSH_BYTES = 16 * 1024
+
+
+class _GzipCompressor:
+    def __init__(self, level: int) -> None:
+        # wbits 31: deflate with a gzip header and trailer.
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliCompressor:
+    def __init__(self, quality: int) -> None:
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+def available_encodings(config: Mapping[str, Any]) -> List[str]:
+    """The configured COMPRESSION_ENCODINGS this process can produce, in order of preference."""
+    return [encoding for encoding in config['COMPRESSION_ENCODINGS']
+            if encoding == 'gzip' or (encoding == 'br' and brotli is not None)]
+
+
+def new_compressor(encoding: str, config: Mapping[str, Any]):
+    """
+    Creates an incremental compressor for a content coding ('gzip' or 'br') at the
+    configured COMPRESSION_LEVEL or COMPRESSION_BROTLI_QUALITY.
+    """
+    if encoding == 'br':
+        return _BrotliCompressor(config['COMPRESSION_BROTLI_QUALITY'])
+    return _GzipCompressor(config['COMPRESSION_LEVEL'])
+
+
+def compress(data: bytes, encoding: str, config: Mapping[str, Any]) -> bytes:
+    """Compresses a whole body with the given content coding."""
+    compressor = new_compressor(encoding, config)
+    return compressor.compress(data) + compressor.finish()
+
+
+def _compress_stream(source: Iterable[Union[str, bytes]], compressor) -> Iterator[bytes]:
+    pending = 0
+    try:
+        for chunk in source:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            output = compressor.compress(chunk)
+            pending += len(chunk)
+            if pending >= STREAM_FLUSH_BYTES:
+                output += compressor.flush()
+                pending = 0
+            if output:
+                yield output
+        yield compressor.finish()
+    finally:
+        if hasattr(source, 'close'):
+            source.close()
+
+
+def _negotiate(response: Response) -> Optional[str]:
+    """
+    Returns the content coding to apply to a response, or None to send it as is.
+    Compressible responses vary on Accept-Encoding whatever the outcome.
+    """
+    if (request.method == 'HEAD' or response.status_code < 200 or response.status_code in (204, 304)
+            or response.direct_passthrough or 'Content-Encoding' in response.headers
+            or response.mimetype not in current_app.config['COMPRESSION_MIMETYPES']):
+        return None
+    response.vary.add('Accept-Encoding')
+    encodings = available_encodings(current_app.config)
+    if not encodings:
+        return None
+    encoding = request.accept_encodings.best_match(encodings)
+    if encoding is None:
+        return None
+    if not response.is_streamed and response.content_length is not None \
+            and response.content_length < current_app.config['COMPRESSION_MIN_SIZE']:
+        return None
+    return encoding
+
+
+def register_compression(app: Flask) -> None:
+    """
+    Compresses responses with gzip or brotli, as negotiated with Accept-Encoding.
+
+    Bodies are compressed whole when at least COMPRESSION_MIN_SIZE bytes long;
+    streamed responses are compressed as they are produced, whatever their size.
+    Must be registered before the other after_request handlers: Flask runs them
+    in reverse order, so compression then applies to the final body.
+
+    Args:
+        app (Flask): The Flask application instance.
+    """
+    @app.after_request
+    def compress_response(response: Response) -> Response:
+        encoding = _negotiate(response)
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = _compress_stream(response.response, new_compressor(encoding, current_app.config))
+            response.headers.pop('Content-Length', None)
+        else:
+            response.set_data(compress(response.get_data(), encoding, current_app.config))
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    logger.debug("Response compression registered with encodings: %s", available_encodings(app.config))
@@ -0,0 +1,38 @@
+"""microsecond updated_at on mysql
+
+updated_at feeds ETags: with MySQL's default DATETIME, which keeps whole
+seconds, two updates within a second left the ETag unchanged. Other databases
+already keep microseconds.
+
+Revision ID: 3e9a7c1d5b84
+Revises: c5e81f4a2d70
+Create Date: 2026-10-17 07:41:26.508193
+
+"""
+from alembic import op
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision = '3e9a7c1d5b84'
+down_revision = 'c5e81f4a2d70'
+branch_labels = None
+depends_on = None
+
+TABLES = ('users', 'courses', 'grades')
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    for table in TABLES:
+        op.alter_column(table, 'updated_at', existing_type=mysql.DATETIME(), type_=mysql.DATETIME(fsp=6),
+                        existing_nullable=True)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    for table in TABLES:
+        op.alter_column(table, 'updated_at', existing_type=mysql.DATETIME(fsp=6), type_=mysql.DATETIME(),
+                        existing_nullable=True)
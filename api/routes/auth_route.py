@@ -11,5 +11,7 @@ auth_controller = AuthController()
 auth_bp.route('/register', methods=['POST'])(auth_controller.register)
 auth_bp.route('/login', methods=['POST'])(auth_controller.login)
 auth_bp.route('/change-password', methods=['POST'])(auth_controller.change_password)
+auth_bp.route('/refresh', methods=['POST'])(auth_controller.refresh)
+auth_bp.route('/logout', methods=['POST'])(auth_controller.logout)
 
 logger.debug("Authentication routes have been registered.")
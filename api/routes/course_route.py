@@ -16,6 +16,7 @@ course_bp.route('/', methods=['POST'])(course_controller.create_course)
 course_bp.route('/<string:course_id>', methods=['PUT'])(course_controller.update_course)
 course_bp.route('/<string:course_id>', methods=['DELETE'])(course_controller.delete_course)
 course_bp.route('/join', methods=['POST'])(course_controller.join_course)
+course_bp.route('/<string:course_id>/enrollments:bulk', methods=['POST'])(course_controller.bulk_enroll)
 course_bp.route('/leave', methods=['POST'])(course_controller.leave_course)
 
 logger.debug("Course routes have been registered.")
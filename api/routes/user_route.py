@@ -12,7 +12,9 @@ user_bp.route('/', methods=['GET'])(user_controller.list_users)
 user_bp.route('/<string:user_id>', methods=['GET'])(user_controller.get_user)
 user_bp.route('/search', methods=['GET'])(user_controller.search_users)
 user_bp.route('/', methods=['POST'])(user_controller.create_user)
+user_bp.route('/bulk', methods=['POST'])(user_controller.bulk_create_users)
 user_bp.route('/<string:user_id>', methods=['PUT'])(user_controller.update_user)
 user_bp.route('/<string:user_id>', methods=['DELETE'])(user_controller.delete_user)
+user_bp.route('/<string:user_id>/sign-out', methods=['POST'])(user_controller.sign_out_user)
 
 logger.debug("User routes have been registered.")
@@ -8,7 +8,7 @@ def main() -> None:
 
     logging.basicConfig(level=logging.INFO)
     app.logger.info("Starting Flask application.")
-    serve(app, host="0.0.0.0", port=8080)
+    serve(app, host="0.0.0.0", port=8080, threads=app.config["WAITRESS_THREADS"])
 
 
 if __name__ == "__main__":
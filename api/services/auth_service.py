@@ -1,14 +1,27 @@
 import logging
-from typing import Optional
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
 
-from werkzeug.security import generate_password_hash, check_password_hash
+from flask import current_app
+from flask_jwt_extended import create_access_token, create_refresh_token
+from sqlalchemy import delete, select, update
 
+from .token_denylist import TokenDenylist
 from .user_service import UserService
-from ..config.models import User
+from ..config.models import RefreshToken, User, token_versions
 from ..config.database import db
+from ..utils.password_hashing import HashingBusyError, hash_password, needs_rehash, verify_password
 
 logger = logging.getLogger(__name__)
 
+# Access token claims describing the caller, so that authorization needs no query.
+ROLE_CLAIM = 'role'
+TOKEN_VERSION_CLAIM = 'ver'
+# Refresh token family (one per login) of access and refresh tokens, so that logout
+# can end the whole session.
+FAMILY_CLAIM = 'fam'
+
 
 class AuthService:
     """
@@ -35,6 +48,7 @@ class AuthService:
         if user:
             if user.check_password(password):
                 logger.info("User (ID: %s) authenticated successfully.", user.id)
+                AuthService.upgrade_password_hash(user, password)
                 return user
             else:
                 logger.warning("Password mismatch for user with email: %s", email)
@@ -43,6 +57,218 @@ class AuthService:
 
         return None
 
+    @staticmethod
+    def issue_access_token(user: User) -> str:
+        """
+        Creates an access token for a user, carrying their role and current token
+        version as claims.
+
+        Args:
+            user (User): The user to issue the token to.
+
+        Returns:
+            str: The encoded JWT.
+        """
+        return create_access_token(
+            identity=str(user.id),
+            additional_claims={ROLE_CLAIM: user.role, TOKEN_VERSION_CLAIM: user.token_version or 0},
+        )
+
+    @staticmethod
+    def issue_tokens(user: User) -> Tuple[str, str]:
+        """
+        Creates an access token and a refresh token starting a new family, at login.
+
+        Args:
+            user (User): The authenticated user.
+
+        Returns:
+            Tuple[str, str]: The encoded access and refresh tokens.
+        """
+        claims = {ROLE_CLAIM: user.role, TOKEN_VERSION_CLAIM: user.token_version or 0}
+        tokens = AuthService._issue_token_pair(str(user.id), claims, str(uuid.uuid4()))
+        db.session.commit()
+        return tokens
+
+    @staticmethod
+    def rotate_refresh_token(jwt_payload: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        """
+        Exchanges a refresh token for a new access token and its successor refresh
+        token. No password is verified: the token's signature, version and revocation
+        were checked by flask_jwt_extended, and as any role change bumps the token
+        version, the role claim is still current.
+
+        Each refresh token is single use. Presenting one that was already exchanged
+        means it leaked, so every token of its family is revoked, including the one
+        the legitimate client holds.
+
+        Args:
+            jwt_payload (Dict[str, Any]): The decoded refresh token.
+
+        Returns:
+            Optional[Tuple[str, str]]: The new access and refresh tokens, or None if the
+            refresh token was used, revoked or never issued.
+        """
+        jti = jwt_payload['jti']
+        user_id = jwt_payload[current_app.config['JWT_IDENTITY_CLAIM']]
+        # A conditional update, so that two concurrent exchanges of one token cannot both win.
+        claimed = db.session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.jti == jti, RefreshToken.used_at.is_(None), RefreshToken.revoked_at.is_(None))
+            .values(used_at=datetime.now(timezone.utc)),
+            execution_options={'synchronize_session': False},
+        ).rowcount == 1
+        if not claimed:
+            db.session.rollback()
+            token = db.session.get(RefreshToken, jti)
+            if token is not None and token.revoked_at is None:
+                logger.warning("Refresh token %s of user ID %s reused; revoking its family.", jti, user_id)
+                AuthService.revoke_refresh_family(token.family_id)
+            return None
+
+        claims = {ROLE_CLAIM: jwt_payload[ROLE_CLAIM], TOKEN_VERSION_CLAIM: jwt_payload[TOKEN_VERSION_CLAIM]}
+        tokens = AuthService._issue_token_pair(user_id, claims, jwt_payload[FAMILY_CLAIM])
+        db.session.commit()
+        logger.debug("Refresh token %s of user ID %s rotated.", jti, user_id)
+        return tokens
+
+    @staticmethod
+    def revoke_refresh_family(family_id: str) -> int:
+        """
+        Revokes every refresh token rotated from one login.
+
+        Args:
+            family_id (str): The family to revoke.
+
+        Returns:
+            int: Number of refresh tokens revoked.
+        """
+        result = db.session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=datetime.now(timezone.utc)),
+            execution_options={'synchronize_session': False},
+        )
+        db.session.commit()
+        return result.rowcount
+
+    @staticmethod
+    def purge_expired_refresh_tokens() -> int:
+        """
+        Deletes the refresh tokens that have expired.
+
+        Returns:
+            int: Number of rows deleted.
+        """
+        result = db.session.execute(delete(RefreshToken).where(RefreshToken.expires_at <= datetime.now(timezone.utc)))
+        db.session.commit()
+        return result.rowcount
+
+    @staticmethod
+    def _issue_token_pair(user_id: str, claims: Dict[str, Any], family_id: str) -> Tuple[str, str]:
+        """
+        Creates an access token and a refresh token of the given family, and adds the
+        refresh token's row to the session; the caller commits.
+        """
+        claims = {**claims, FAMILY_CLAIM: family_id}
+        expires_delta = timedelta(seconds=current_app.config['JWT_REFRESH_TOKEN_EXPIRES'])
+        jti = str(uuid.uuid4())
+        db.session.add(RefreshToken(
+            jti=jti,
+            family_id=family_id,
+            user_id=user_id,
+            expires_at=datetime.now(timezone.utc) + expires_delta,
+        ))
+        access_token = create_access_token(identity=user_id, additional_claims=claims)
+        refresh_token = create_refresh_token(
+            identity=user_id,
+            additional_claims={**claims, 'jti': jti},
+            expires_delta=expires_delta,
+        )
+        return access_token, refresh_token
+
+    @staticmethod
+    def get_token_version(user_id: str) -> Optional[int]:
+        """
+        Returns the current token version of a user, cached for TOKEN_VERSION_CACHE_TTL
+        seconds.
+
+        Args:
+            user_id (str): The unique identifier of the user.
+
+        Returns:
+            Optional[int]: The token version, or None if the user does not exist.
+        """
+        version = token_versions.get(user_id)
+        if version is None:
+            version = db.session.scalar(select(User.token_version).where(User.id == user_id))
+            if version is not None:
+                token_versions.set(user_id, version)
+        return version
+
+    @staticmethod
+    def get_denylist() -> TokenDenylist:
+        """
+        Returns the current application's token denylist, creating it on first use.
+        """
+        denylist = current_app.extensions.get('token_denylist')
+        if denylist is None:
+            denylist = current_app.extensions.setdefault('token_denylist', TokenDenylist(
+                current_app.config['TOKEN_DENYLIST_CAPACITY'],
+                current_app.config['TOKEN_DENYLIST_ERROR_RATE'],
+                current_app.config['TOKEN_DENYLIST_REFRESH_INTERVAL'],
+            ))
+        return denylist
+
+    @staticmethod
+    def revoke_token(jwt_payload: dict) -> None:
+        """
+        Revokes a single access token, e.g. at logout.
+
+        Args:
+            jwt_payload (dict): The decoded token.
+        """
+        user_id = jwt_payload[current_app.config['JWT_IDENTITY_CLAIM']]
+        expires_at = datetime.fromtimestamp(jwt_payload['exp'], timezone.utc)
+        AuthService.get_denylist().revoke(jwt_payload['jti'], user_id, expires_at)
+        logger.info("Token %s of user ID %s revoked.", jwt_payload['jti'], user_id)
+
+    @staticmethod
+    def is_token_revoked(jti: str) -> bool:
+        """Tells whether an access token was revoked; see TokenDenylist.is_revoked."""
+        return AuthService.get_denylist().is_revoked(jti)
+
+    @staticmethod
+    def upgrade_password_hash(user: User, password: str) -> bool:
+        """
+        Rehashes a just verified password when its stored hash was made with other
+        parameters than PASSWORD_HASH_METHOD. Failures are logged and leave the old
+        hash in place, so they never fail the login.
+
+        Args:
+            user (User): The authenticated user.
+            password (str): The password the user authenticated with (plain text).
+
+        Returns:
+            bool: True if the stored hash was replaced.
+        """
+        method = current_app.config['PASSWORD_HASH_METHOD']
+        if not needs_rehash(user.password_hash, method):
+            return False
+        try:
+            user.password_hash = hash_password(password)
+            db.session.commit()
+        except HashingBusyError:
+            db.session.rollback()
+            logger.info("Password hash of user ID %s left for a later login: hashing queue is full.", user.id)
+            return False
+        except Exception as e:
+            db.session.rollback()
+            logger.error("Error upgrading password hash for user ID: %s, Error: %s", user.id, e)
+            return False
+        logger.info("Password hash of user ID %s upgraded to %s.", user.id, method.split(':', 1)[0])
+        return True
+
     @staticmethod
     def update_user_password(user: Optional[User], current_pw: str, new_pw: str) -> bool:
         """
@@ -62,9 +288,13 @@ class AuthService:
 
         logger.debug("Attempting to update password for user ID: %s", user.id)
 
-        if check_password_hash(user.password_hash, current_pw):
+        if verify_password(user.password_hash, current_pw):
+            # Hashed outside the try block so that a busy hashing executor is reported
+            # to the caller instead of being taken for a failed update.
+            new_hash = hash_password(new_pw)
             try:
-                user.password_hash = generate_password_hash(new_pw)
+                user.password_hash = new_hash
+                user.revoke_tokens()
                 db.session.commit()
                 logger.info("Password updated successfully for user ID: %s", user.id)
                 return True
@@ -1,11 +1,52 @@
 import logging
-from typing import Tuple, Optional, List
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Tuple, Optional, List, Sequence
+from flask import current_app
 from flask_paginate import Pagination
-from ..config.models import Course, Enrollment, Grade
-from ..config.database import db
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.dialects.mysql import match
+from ..config.config import Config
+from ..config.models import Course, Enrollment, Grade, User
+from ..config.database import db, insert_ignore, read_replica, replica_reads
+from ..utils.cache import TTLCache
+from ..utils.entity_cache import EntityCache, VersionStampCache
+from ..utils.search import TrigramIndex, terms
+from .grade_service import grade_stamps
 
 logger = logging.getLogger(__name__)
 
+_course_count_cache = TTLCache(maxsize=1, ttl=Config.COURSE_COUNT_CACHE_TTL)
+# Courses by id; course_cache.stats() reports its size and hit ratio.
+course_cache = EntityCache(Course, maxsize=Config.ENTITY_CACHE_SIZE, ttl=Config.ENTITY_CACHE_TTL)
+# Version stamp of the whole course list, behind the ETag of list_courses.
+course_stamps = VersionStampCache(Course, (), maxsize=1, ttl=Config.ENTITY_CACHE_TTL)
+# Held by whichever thread builds a course search index, so only one build runs at a time.
+_search_index_lock = threading.Lock()
+# Guards swapping in a rebuilt index against the updates made while it was built.
+_search_index_swap_lock = threading.Lock()
+SEARCH_INDEX_EXTENSION_KEY = 'course_search_index'
+
+
+def _apply_search_index_update(index: TrigramIndex, course_id: str, name: Optional[str]) -> None:
+    if name is None:
+        index.remove(course_id)
+    else:
+        index.add(course_id, name)
+
+
+def _rebuild_search_index_in_background(app: Any, state: Dict[str, Any]) -> None:
+    """Target of the thread rebuilding an expired index; releases _search_index_lock when done."""
+    try:
+        with app.app_context():
+            CourseService._rebuild_search_index(state)
+    except Exception as e:
+        logger.error(f"Error rebuilding the course search index: {str(e)}", exc_info=True)
+    finally:
+        _search_index_lock.release()
+
 
 class CourseService:
     """
@@ -17,6 +58,7 @@ class CourseService:
     """
 
     @staticmethod
+    @read_replica
     def get_all_courses_paginated(page: int, per_page: int) -> Tuple[List[Course], Pagination]:
         """
         Retrieves a paginated list of all courses.
@@ -35,18 +77,87 @@ class CourseService:
         return pagination.items, pagination
 
     @staticmethod
-    def get_course_by_id(course_id: str) -> Optional[Course]:
+    @read_replica
+    def get_courses_after(
+        after: Optional[Tuple[datetime, str]],
+        limit: int,
+        columns: Optional[Sequence[Any]] = None,
+    ) -> Tuple[List[Any], bool]:
+        """
+        Retrieves a page of courses using keyset pagination on (created_at, id).
+
+        Unlike OFFSET pagination, the cost of a page does not grow with its depth:
+        the (created_at, id) index seeks straight to the first row after the cursor.
+
+        Args:
+            after (Optional[Tuple[datetime, str]]): Sort key of the last course of the
+                previous page, or None for the first page.
+            limit (int): The maximum number of courses to return.
+            columns (Optional[Sequence[Any]]): Load only these Course columns, returning
+                rows (with created_at and id among them) rather than Course objects.
+
+        Returns:
+            Tuple[List[Any], bool]: The courses of the page and whether more follow.
+        """
+        logger.debug("Fetching courses after %s, limit %d", after, limit)
+        query = (db.session.query(*columns) if columns else db.session.query(Course)).order_by(Course.created_at, Course.id)
+        if after is not None:
+            created_at, course_id = after
+            query = query.filter(or_(
+                Course.created_at > created_at,
+                and_(Course.created_at == created_at, Course.id > course_id),
+            ))
+        courses: List[Any] = query.limit(limit + 1).all()
+        has_more = len(courses) > limit
+        return courses[:limit], has_more
+
+    @staticmethod
+    @read_replica
+    def count_courses() -> int:
+        """
+        Counts all courses. The result is cached for COURSE_COUNT_CACHE_TTL seconds
+        and dropped whenever this process creates or deletes a course.
+
+        Returns:
+            int: The number of courses.
+        """
+        total: Optional[int] = _course_count_cache.get('total')
+        if total is None:
+            total = db.session.query(func.count(Course.id)).scalar()
+            _course_count_cache.set('total', total)
+        return total
+
+    @staticmethod
+    @read_replica
+    def get_courses_version() -> Tuple[int, Optional[datetime]]:
+        """
+        Returns the number of courses and their latest update time, which change
+        whenever a course is created, updated or deleted. Cached like course lookups.
+
+        Returns:
+            Tuple[int, Optional[datetime]]: The version stamp of the course list.
         """
-        Retrieves a course by its unique ID.
+        return course_stamps.get(db.session)
+
+    @staticmethod
+    def get_course_by_id(course_id: str, for_update: bool = False) -> Optional[Course]:
+        """
+        Retrieves a course by its unique ID, through the process-wide course cache.
 
         Args:
             course_id (str): The unique identifier of the course.
+            for_update (bool): Read the row from the database instead, for callers
+                about to modify it: the cached row may be a few seconds old.
 
         Returns:
             Optional[Course]: The Course object if found, otherwise None.
         """
         logger.debug("Fetching course by ID: %s", course_id)
-        course: Optional[Course] = db.session.get(Course, course_id)
+        course: Optional[Course]
+        if for_update:
+            course = db.session.get(Course, course_id, populate_existing=True)
+        else:
+            course = course_cache.get(db.session, course_id)
         if course:
             logger.debug("Course found: %s (ID: %s)", course.name, course.id)
         else:
@@ -54,26 +165,127 @@ class CourseService:
         return course
 
     @staticmethod
-    def search_courses_by_name(name_query: str) -> List[Course]:
+    @read_replica
+    def search_courses_by_name(name_query: str, limit: int = 20) -> List[Course]:
         """
-        Searches for courses by name.
+        Searches for courses by name, best matches first.
+
+        Every word of the query must match a word of the course name, either as a
+        prefix or, in the trigram index, anywhere inside it. On MySQL the FULLTEXT
+        index of courses.name answers the query in boolean mode ranked by MATCH
+        relevance; other databases use the in-process trigram index (see
+        _get_search_index). COURSE_SEARCH_BACKEND forces either one.
+
+        A blank query matches every course, as the former substring search did, and
+        returns the first `limit` by name. A query with no word characters (only
+        punctuation) matches nothing.
 
         Args:
             name_query (str): The query string to search for in course names.
+            limit (int): Maximum number of courses returned.
 
         Returns:
-            List[Course]: A list of Course objects matching the query.
+            List[Course]: A list of Course objects matching the query, most relevant first.
         """
-        logger.debug("Searching courses with name containing: %s", name_query)
-        courses: List[Course] = (
-            db.session.query(Course)
-            .filter(Course.name.ilike(f"%{name_query}%"))
-            .all()
-        )
+        logger.debug("Searching courses with name matching: %s", name_query)
+        if not name_query.strip():
+            return db.session.query(Course).order_by(Course.name, Course.id).limit(limit).all()
+        query_terms = terms(name_query)
+        if not query_terms:
+            return []
+
+        if CourseService._search_backend() == 'fulltext':
+            relevance = match(Course.name, against=' '.join(f"+{term}*" for term in query_terms)).in_boolean_mode()
+            courses: List[Course] = (
+                db.session.query(Course)
+                .filter(relevance)
+                .order_by(relevance.desc(), func.length(Course.name))
+                .limit(limit)
+                .all()
+            )
+        else:
+            ranked_ids = [course_id for course_id, _ in CourseService._get_search_index().search(name_query, limit)]
+            by_id = {course.id: course for course in db.session.query(Course).filter(Course.id.in_(ranked_ids))}
+            courses = [by_id[course_id] for course_id in ranked_ids if course_id in by_id]
+
         logger.info("Found %d courses matching query '%s'.", len(courses), name_query)
         return courses
 
     @staticmethod
+    def _search_backend() -> str:
+        backend = current_app.config['COURSE_SEARCH_BACKEND']
+        if backend == 'auto':
+            return 'fulltext' if db.engine.dialect.name == 'mysql' else 'trigram'
+        return backend
+
+    @staticmethod
+    def _get_search_index() -> TrigramIndex:
+        """
+        Returns the application's trigram index of course names, building it from the
+        database on first use. Changes made through this service are applied to the
+        index right away; to pick up those of other processes, an index older than
+        COURSE_SEARCH_INDEX_TTL seconds is rebuilt in a background thread while
+        searches keep using it, and replaced once the new one is complete.
+        """
+        state = current_app.extensions.setdefault(
+            SEARCH_INDEX_EXTENSION_KEY, {'index': None, 'built_at': 0.0, 'pending': None, 'thread': None}
+        )
+        index = state['index']
+        if index is None:
+            with _search_index_lock:
+                if state['index'] is None:
+                    CourseService._rebuild_search_index(state)
+            index = state['index']
+        elif time.monotonic() - state['built_at'] > current_app.config['COURSE_SEARCH_INDEX_TTL'] \
+                and _search_index_lock.acquire(blocking=False):
+            state['thread'] = threading.Thread(
+                target=_rebuild_search_index_in_background,
+                args=(current_app._get_current_object(), state),
+                name='course-search-index',
+                daemon=True,
+            )
+            state['thread'].start()
+        return index
+
+    @staticmethod
+    def _rebuild_search_index(state: Dict[str, Any]) -> None:
+        """
+        Builds a new index from the database and swaps it in. Courses changed through
+        this service while it is built are recorded in state['pending'] and replayed
+        on the new index before the swap. The caller holds _search_index_lock.
+        """
+        started = time.monotonic()
+        with _search_index_swap_lock:
+            state['pending'] = []
+        try:
+            with replica_reads():
+                rows = db.session.query(Course.id, Course.name).yield_per(10000)
+                index = TrigramIndex().build((row.id, row.name) for row in rows)
+            with _search_index_swap_lock:
+                for course_id, name in state['pending']:
+                    _apply_search_index_update(index, course_id, name)
+                state['index'] = index
+                state['built_at'] = time.monotonic()
+        finally:
+            with _search_index_swap_lock:
+                state['pending'] = None
+        logger.info("Built course search index of %d courses in %.2fs.", len(index), time.monotonic() - started)
+
+    @staticmethod
+    def _update_search_index(course_id: str, name: Optional[str]) -> None:
+        # Keeps a built index in step with this process' writes; None removes the course.
+        state = current_app.extensions.get(SEARCH_INDEX_EXTENSION_KEY)
+        if state is None:
+            return
+        with _search_index_swap_lock:
+            index = state['index']
+            if state['pending'] is not None:
+                state['pending'].append((course_id, name))
+        if index is not None:
+            _apply_search_index_update(index, course_id, name)
+
+    @staticmethod
+    @read_replica
     def get_students_in_course(course_id: str) -> List[Enrollment]:
         """
         Retrieves all students enrolled in a specific course.
@@ -109,6 +321,8 @@ class CourseService:
         course = Course(name=name, professor_id=professor_id)
         db.session.add(course)
         db.session.commit()
+        _course_count_cache.invalidate('total')
+        CourseService._update_search_index(course.id, name)
         logger.info("Course created with ID: %s", course.id)
         return course
 
@@ -127,6 +341,7 @@ class CourseService:
         logger.debug("Updating course ID: %s with new name: %s", course.id, name)
         course.name = name
         db.session.commit()
+        CourseService._update_search_index(course.id, name)
         logger.info("Course ID: %s updated successfully.", course.id)
         return course
 
@@ -139,12 +354,23 @@ class CourseService:
             course (Course): The Course object to be deleted.
         """
         logger.debug("Deleting course ID: %s", course.id)
+        course_id = course.id
+        graded_students = [
+            student_id for (student_id,) in
+            db.session.query(Grade.student_id).filter_by(course_id=course_id).distinct()
+        ]
 
         db.session.query(Enrollment).filter_by(course_id=course.id).delete()
         db.session.query(Grade).filter_by(course_id=course.id).delete()
 
         db.session.delete(course)
         db.session.commit()
+        _course_count_cache.invalidate('total')
+        # Bulk deletes bypass the ORM events that keep the stamps current.
+        for student_id in graded_students:
+            grade_stamps.invalidate((course_id, student_id))
+        course_stamps.invalidate(())
+        CourseService._update_search_index(course_id, None)
         logger.info("Course ID: %s deleted successfully.", course.id)
 
     @staticmethod
@@ -175,6 +401,69 @@ class CourseService:
         logger.info("User ID: %s joined course ID: %s successfully.", user_id, course_id)
         return enrollment
 
+    @staticmethod
+    def bulk_enroll(course_id: str, student_ids: Sequence[str], chunk_size: Optional[int] = None) -> Dict[str, str]:
+        """
+        Enrolls many students in a course in a single transaction.
+
+        Student ids are processed chunk_size at a time: one SELECT checks which ids
+        are students, one multi-row INSERT that skips rows violating the
+        unique_enrollment constraint adds the enrollments, and one SELECT of the
+        generated enrollment ids tells new enrollments from existing ones.
+
+        Args:
+            course_id (str): The unique identifier of the course.
+            student_ids (Sequence[str]): The students to enroll; repeated ids are reported once.
+            chunk_size (Optional[int]): Number of students per statement. Defaults to
+                BULK_INSERT_CHUNK_SIZE.
+
+        Returns:
+            Dict[str, str]: The outcome for each distinct student id, in request order:
+            'enrolled', 'already_enrolled', 'not_found' or 'not_a_student'.
+        """
+        logger.debug("Bulk enrolling %d students in course ID: %s", len(student_ids), course_id)
+        chunk_size = chunk_size or current_app.config['BULK_INSERT_CHUNK_SIZE']
+        results: Dict[str, str] = dict.fromkeys(student_ids, 'not_found')
+        ids = list(results)
+        try:
+            for start in range(0, len(ids), chunk_size):
+                chunk = ids[start:start + chunk_size]
+                roles = dict(db.session.execute(select(User.id, User.role).where(User.id.in_(chunk))).all())
+
+                rows = []
+                now = datetime.now(timezone.utc)
+                for student_id in chunk:
+                    role = roles.get(student_id)
+                    if role is None:
+                        continue
+                    if role != 'Student':
+                        results[student_id] = 'not_a_student'
+                        continue
+                    results[student_id] = 'already_enrolled'
+                    rows.append({'id': str(uuid.uuid4()), 'student_id': student_id,
+                                 'course_id': course_id, 'enrolled_at': now})
+                if not rows:
+                    continue
+
+                db.session.execute(insert_ignore(Enrollment.__table__).values(rows))
+                inserted = db.session.execute(
+                    select(Enrollment.student_id).where(Enrollment.id.in_([row['id'] for row in rows]))
+                ).scalars()
+                for student_id in inserted:
+                    results[student_id] = 'enrolled'
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        logger.info(
+            "Bulk enrollment in course ID: %s: %d of %d students enrolled.",
+            course_id,
+            sum(status == 'enrolled' for status in results.values()),
+            len(results),
+        )
+        return results
+
     @staticmethod
     def leave_course(user_id: str, course_id: str) -> Optional[Enrollment]:
         """
@@ -203,6 +492,7 @@ class CourseService:
         return enrollment
 
     @staticmethod
+    @read_replica
     def get_courses_by_professor(professor_id: str) -> List[Course]:
         """
         Retrieves all courses taught by a specific professor.
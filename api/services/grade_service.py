@@ -1,10 +1,27 @@
 import logging
-from typing import List, Optional
+import math
+import uuid
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from flask import current_app
+from sqlalchemy import and_, insert, or_, select
+from sqlalchemy.orm import Query
 from api import db
-from api.config.models import Grade
+from api.config.config import Config
+from api.config.models import Course, Grade, User
+from api.config.database import read_replica, replica_reads
+from api.utils.entity_cache import VersionStampCache
 
 logger = logging.getLogger(__name__)
 
+# Version stamps of the grades of a student in a course, by (course_id, student_id).
+grade_stamps = VersionStampCache(
+    Grade, ('course_id', 'student_id'), maxsize=Config.ENTITY_CACHE_SIZE, ttl=Config.ENTITY_CACHE_TTL
+)
+
+MAX_REPORTED_IMPORT_ERRORS = 1000
+
 
 class GradeService:
     """
@@ -13,17 +30,96 @@ class GradeService:
     as well as querying grades for specific students and courses.
     """
 
-    def list_grades(self) -> List[Grade]:
+    @staticmethod
+    def _filtered_query(
+        course_id: Optional[str] = None,
+        student_id: Optional[str] = None,
+        name: Optional[str] = None,
+        columns: Optional[Sequence[Any]] = None,
+    ) -> Query:
+        """
+        Builds a query over grades matching the given filters, ordered by (created_at, id).
+        With `columns`, the query returns rows of those columns instead of Grade objects.
+        """
+        query = db.session.query(*columns) if columns else db.session.query(Grade)
+        if course_id:
+            query = query.filter(Grade.course_id == course_id)
+        if student_id:
+            query = query.filter(Grade.student_id == student_id)
+        if name:
+            query = query.filter(Grade.name == name)
+        return query.order_by(Grade.created_at, Grade.id)
+
+    @read_replica
+    def list_grades(
+        self,
+        course_id: Optional[str] = None,
+        student_id: Optional[str] = None,
+        name: Optional[str] = None,
+        after: Optional[Tuple[datetime, str]] = None,
+        limit: int = 100,
+        columns: Optional[Sequence[Any]] = None,
+    ) -> Tuple[List[Any], bool]:
         """
-        Retrieves all grades from the database.
+        Retrieves one page of grades using keyset pagination on (created_at, id).
+
+        Args:
+            course_id (Optional[str]): Only return grades of this course.
+            student_id (Optional[str]): Only return grades of this student.
+            name (Optional[str]): Only return grades with this name (e.g. "Midterm").
+            after (Optional[Tuple[datetime, str]]): Sort key of the last grade of the
+                previous page, or None for the first page.
+            limit (int): The maximum number of grades to return.
+            columns (Optional[Sequence[Any]]): Load only these Grade columns, returning
+                rows (with created_at and id among them) rather than Grade objects.
 
         Returns:
-            List[Grade]: A list of all Grade objects in the database.
+            Tuple[List[Any], bool]: The grades of the page and whether more follow.
         """
-        logger.debug("Retrieving all grades from the database.")
-        grades = db.session.query(Grade).all()
-        logger.info(f"Retrieved {len(grades)} grades.")
-        return grades
+        logger.debug(
+            "Retrieving grades (course_id=%s, student_id=%s, name=%s) after %s, limit %d.",
+            course_id, student_id, name, after, limit
+        )
+        query = self._filtered_query(course_id, student_id, name, columns)
+        if after is not None:
+            created_at, grade_id = after
+            query = query.filter(or_(
+                Grade.created_at > created_at,
+                and_(Grade.created_at == created_at, Grade.id > grade_id),
+            ))
+        grades = query.limit(limit + 1).all()
+        logger.info("Retrieved %d grades.", min(len(grades), limit))
+        return grades[:limit], len(grades) > limit
+
+    def stream_grades(
+        self,
+        course_id: Optional[str] = None,
+        student_id: Optional[str] = None,
+        name: Optional[str] = None,
+        chunk_size: int = 1000,
+        columns: Optional[Sequence[Any]] = None,
+    ) -> Iterator[Any]:
+        """
+        Yields every grade matching the filters, fetching them from the database
+        `chunk_size` rows at a time so memory use does not depend on the table size.
+
+        Args:
+            course_id (Optional[str]): Only return grades of this course.
+            student_id (Optional[str]): Only return grades of this student.
+            name (Optional[str]): Only return grades with this name.
+            chunk_size (int): Number of rows fetched and materialized per round trip.
+            columns (Optional[Sequence[Any]]): Load only these Grade columns, yielding
+                rows rather than Grade objects.
+
+        Yields:
+            Any: The matching grades, ordered by (created_at, id).
+        """
+        logger.debug(
+            "Streaming grades (course_id=%s, student_id=%s, name=%s) in chunks of %d.",
+            course_id, student_id, name, chunk_size
+        )
+        with replica_reads():
+            yield from self._filtered_query(course_id, student_id, name, columns).yield_per(chunk_size)
 
     def get_grade_by_id(self, grade_id: str) -> Optional[Grade]:
         """
@@ -68,6 +164,126 @@ class GradeService:
         logger.info(f"Grade assigned: {new_grade.id}, Value: {new_grade.grade}")
         return new_grade
 
+    @staticmethod
+    def _parse_import_record(record: Any, defaults: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validates one imported record, falling back to defaults for missing or empty
+        fields. Raises ValueError describing the first problem found.
+        """
+        if not isinstance(record, dict):
+            raise ValueError("Row must be an object.")
+        fields = {key: record.get(key) or defaults.get(key) for key in ("course_id", "student_id", "grade_name")}
+        missing = [key for key, value in fields.items() if not value]
+        if record.get("grade") in (None, ""):
+            missing.append("grade")
+        if missing:
+            raise ValueError(f"Missing fields: {', '.join(missing)}.")
+        if not all(isinstance(value, str) for value in fields.values()):
+            raise ValueError("course_id, student_id and grade_name must be strings.")
+        if len(fields["grade_name"]) > 255:
+            raise ValueError("grade_name must be at most 255 characters.")
+        try:
+            grade_value = float(record["grade"])
+        except (TypeError, ValueError):
+            raise ValueError("grade must be a number.")
+        if not math.isfinite(grade_value) or isinstance(record["grade"], bool):
+            raise ValueError("grade must be a number.")
+        return {**fields, "grade": grade_value}
+
+    def import_grades(
+        self,
+        records: Iterable[Tuple[int, Any]],
+        defaults: Optional[Dict[str, Any]] = None,
+        chunk_size: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Imports grades from a stream of records in a single transaction.
+
+        Records are consumed chunk_size at a time. Each chunk is validated, its
+        course and student ids are checked with one SELECT ... IN per table (ids
+        already seen are not checked again) and its valid rows are inserted with a
+        single executemany. Invalid rows are skipped and reported; a
+        MalformedImportError raised by the record iterator rolls everything back.
+
+        Args:
+            records (Iterable[Tuple[int, Any]]): (row number, record) pairs, each record
+                having course_id, student_id, grade and grade_name.
+            defaults (Optional[Dict[str, Any]]): Values for course_id or grade_name when
+                a record leaves them out.
+            chunk_size (Optional[int]): Rows per INSERT. Defaults to BULK_INSERT_CHUNK_SIZE.
+
+        Returns:
+            Dict[str, Any]: The number of grades imported, the number of rows that
+            failed and the first MAX_REPORTED_IMPORT_ERRORS row errors.
+        """
+        defaults = defaults or {}
+        chunk_size = chunk_size or current_app.config['BULK_INSERT_CHUNK_SIZE']
+        known_courses: Set[str] = set()
+        known_students: Set[str] = set()
+        imported, failed = 0, 0
+        errors: List[Dict[str, Any]] = []
+        touched: Set[Tuple[str, str]] = set()
+
+        def reject(number: int, msg: str) -> None:
+            nonlocal failed
+            failed += 1
+            if len(errors) < MAX_REPORTED_IMPORT_ERRORS:
+                errors.append({"row": number, "msg": msg})
+
+        records = iter(records)
+        try:
+            while True:
+                chunk = list(islice(records, chunk_size))
+                if not chunk:
+                    break
+
+                rows = []
+                for number, record in chunk:
+                    try:
+                        rows.append((number, self._parse_import_record(record, defaults)))
+                    except ValueError as e:
+                        reject(number, str(e))
+
+                course_ids = {row["course_id"] for _, row in rows} - known_courses
+                if course_ids:
+                    known_courses.update(db.session.scalars(select(Course.id).where(Course.id.in_(course_ids))))
+                student_ids = {row["student_id"] for _, row in rows} - known_students
+                if student_ids:
+                    known_students.update(db.session.scalars(select(User.id).where(User.id.in_(student_ids))))
+
+                now = datetime.now(timezone.utc)
+                values = []
+                for number, row in rows:
+                    if row["course_id"] not in known_courses:
+                        reject(number, "Course not found.")
+                    elif row["student_id"] not in known_students:
+                        reject(number, "Student not found.")
+                    else:
+                        values.append({
+                            "id": str(uuid.uuid4()),
+                            "name": row["grade_name"],
+                            "course_id": row["course_id"],
+                            "student_id": row["student_id"],
+                            "grade": row["grade"],
+                            "created_at": now,
+                            "updated_at": now,
+                        })
+                if values:
+                    db.session.execute(insert(Grade.__table__), values)
+                    imported += len(values)
+                    touched.update((value["course_id"], value["student_id"]) for value in values)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        # Core inserts bypass the ORM events that keep the stamps current.
+        for key in touched:
+            grade_stamps.invalidate(key)
+
+        logger.info("Imported %d grades, %d rows rejected.", imported, failed)
+        return {"imported": imported, "failed": failed, "errors": errors}
+
     def update_grade(self, grade_obj: Grade, new_grade_value: float) -> Grade:
         """
         Updates an existing grade's value.
@@ -97,6 +313,22 @@ class GradeService:
         db.session.commit()
         logger.info(f"Grade ID: {grade_obj.id} deleted successfully.")
 
+    @read_replica
+    def get_student_grades_version(self, course_id: str, student_id: str) -> Tuple[int, Optional[datetime]]:
+        """
+        Returns the number of grades of a student in a course and their latest update
+        time, which change whenever one of these grades is added, updated or deleted.
+
+        Args:
+            course_id (str): The unique identifier of the course.
+            student_id (str): The unique identifier of the student.
+
+        Returns:
+            Tuple[int, Optional[datetime]]: The version stamp of the student's grades.
+        """
+        return grade_stamps.get(db.session, course_id, student_id)
+
+    @read_replica
     def get_student_grades(self, course_id: str, student_id: str) -> List[Grade]:
         """
         Retrieves all grades for a specific student within a given course.
@@ -0,0 +1,176 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import delete, select
+
+from ..config.database import db
+from ..config.models import RevokedToken
+from ..utils.bloom import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+# Revocations committed by other instances may carry a revoked_at slightly older than
+# the newest one already loaded; each refresh looks this far back again.
+REFRESH_OVERLAP = timedelta(seconds=60)
+
+
+class TokenDenylist:
+    """
+    Per-process view of the revoked_tokens table, fronted by a Bloom filter.
+
+    A token whose jti is not in the filter is not revoked, which answers the common
+    case without any I/O. Only filter hits are confirmed against the table. The
+    filter is refreshed every refresh_interval seconds with the rows revoked since
+    the previous refresh, and rebuilt with twice the capacity once it holds more
+    tokens than it was sized for. Revocations made by this process are added to the
+    filter right away; those of other processes are seen after the next refresh.
+
+    Args:
+        capacity (int): Number of revoked, unexpired tokens the filter is sized for.
+        error_rate (float): Target false positive rate of the filter.
+        refresh_interval (float): Seconds between two incremental refreshes.
+    """
+
+    def __init__(self, capacity: int, error_rate: float, refresh_interval: float) -> None:
+        self.error_rate = error_rate
+        self.refresh_interval = refresh_interval
+        self._filter = BloomFilter(capacity, error_rate)
+        self._watermark: Optional[datetime] = None
+        self._refreshed_at = float('-inf')
+        self._refresh_lock = threading.Lock()
+        # Guards swapping in a rebuilt filter against the revocations made meanwhile.
+        self._swap_lock = threading.Lock()
+        self._revoked_during_rebuild: Optional[List[str]] = None
+        self._metrics_lock = threading.Lock()
+        self.lookups = 0
+        self.filter_hits = 0
+        self.false_positives = 0
+        self.refreshes = 0
+        self.rebuilds = 0
+
+    def is_revoked(self, jti: str) -> bool:
+        """
+        Tells whether a token was revoked. Must be called within an application context.
+        """
+        self._refresh_if_due()
+        if jti not in self._filter:
+            with self._metrics_lock:
+                self.lookups += 1
+            return False
+        revoked = db.session.get(RevokedToken, jti) is not None
+        with self._metrics_lock:
+            self.lookups += 1
+            self.filter_hits += 1
+            if not revoked:
+                self.false_positives += 1
+        return revoked
+
+    def revoke(self, jti: str, user_id: str, expires_at: datetime) -> None:
+        """
+        Records a revoked token and adds it to this process' filter.
+
+        Args:
+            jti (str): The unique identifier of the token.
+            user_id (str): The user the token was issued to.
+            expires_at (datetime): When the token expires; the row is useless afterwards.
+        """
+        db.session.add(RevokedToken(jti=jti, user_id=user_id, expires_at=expires_at))
+        db.session.commit()
+        with self._swap_lock:
+            self._filter.add(jti)
+            if self._revoked_during_rebuild is not None:
+                self._revoked_during_rebuild.append(jti)
+
+    def refresh(self, rebuild: bool = False) -> int:
+        """
+        Adds the tokens revoked since the previous refresh to the filter, or reloads
+        every unexpired revoked token into a new filter when rebuild is set. Tokens
+        revoked by this process while the new filter is loaded are added to it
+        before it replaces the current one.
+
+        Returns:
+            int: Number of tokens added to the filter.
+        """
+        now = datetime.now(timezone.utc)
+        query = select(RevokedToken.jti, RevokedToken.revoked_at).where(RevokedToken.expires_at > now)
+        if rebuild:
+            bloom = BloomFilter(max(self._filter.capacity, 2 * len(self._filter)), self.error_rate)
+            with self._swap_lock:
+                self._revoked_during_rebuild = []
+        else:
+            bloom = self._filter
+            if self._watermark is not None:
+                query = query.where(RevokedToken.revoked_at >= self._watermark - REFRESH_OVERLAP)
+
+        added = 0
+        watermark = self._watermark
+        try:
+            for jti, revoked_at in db.session.execute(query):
+                if jti not in bloom:
+                    bloom.add(jti)
+                    added += 1
+                if watermark is None or revoked_at > watermark:
+                    watermark = revoked_at
+        except Exception:
+            if rebuild:
+                with self._swap_lock:
+                    self._revoked_during_rebuild = None
+            raise
+
+        with self._swap_lock:
+            if rebuild:
+                for jti in self._revoked_during_rebuild:
+                    bloom.add(jti)
+                self._revoked_during_rebuild = None
+            self._filter = bloom
+        self._watermark = watermark
+        self._refreshed_at = time.monotonic()
+        with self._metrics_lock:
+            self.refreshes += 1
+            self.rebuilds += rebuild
+        if rebuild:
+            logger.info("Token denylist rebuilt with %d revoked token(s).", added)
+        return added
+
+    def _refresh_if_due(self) -> None:
+        if time.monotonic() - self._refreshed_at < self.refresh_interval:
+            return
+        # One thread refreshes; the others keep answering from the current filter.
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            if time.monotonic() - self._refreshed_at >= self.refresh_interval:
+                self.refresh(rebuild=len(self._filter) > self._filter.capacity)
+        finally:
+            self._refresh_lock.release()
+
+    @staticmethod
+    def purge_expired() -> int:
+        """
+        Deletes the rows of tokens that have expired. Must be called within an
+        application context.
+
+        Returns:
+            int: Number of rows deleted.
+        """
+        result = db.session.execute(delete(RevokedToken).where(RevokedToken.expires_at <= datetime.now(timezone.utc)))
+        db.session.commit()
+        return result.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        with self._metrics_lock:
+            negatives = self.lookups - (self.filter_hits - self.false_positives)
+            stats = {
+                'lookups': self.lookups,
+                'filter_hits': self.filter_hits,
+                'false_positives': self.false_positives,
+                # Among the lookups of tokens that are not revoked.
+                'observed_error_rate': self.false_positives / negatives if negatives else 0.0,
+                'refreshes': self.refreshes,
+                'rebuilds': self.rebuilds,
+            }
+        stats.update(self._filter.stats())
+        return stats
@@ -1,11 +1,26 @@
 import logging
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
-from api.config.models import User, compute_email_hash
-from ..config.database import db
+from flask import current_app
+from sqlalchemy import String, func, inspect, select, type_coerce
+from sqlalchemy.orm import Query, defer, load_only, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+
+from api.config.models import BLIND_INDEX_KEY, Enrollment, User, UserSearchToken, compute_email_hash
+from api.utils.blind_index import blind_tokens
+from api.utils.encryption import batch_decrypt
+from api.utils.entity_cache import EntityCache
+from api.utils.password_hashing import hash_passwords
+from ..config.config import Config
+from ..config.database import db, read_replica
 
 logger = logging.getLogger(__name__)
 
+# Users by id; user_cache.stats() reports its size and hit ratio.
+user_cache = EntityCache(User, maxsize=Config.ENTITY_CACHE_SIZE, ttl=Config.ENTITY_CACHE_TTL)
+
+ASSIGNABLE_ROLES = ('Student', 'Professor')
+
 
 class UserService:
     """
@@ -16,6 +31,44 @@ class UserService:
     """
 
     @staticmethod
+    def load_decrypted(query: Query) -> List[User]:
+        """
+        Runs a query returning users and decrypts their names and emails in batches.
+
+        The encrypted columns are read as raw ciphertext and decrypted together by
+        batch_decrypt() (on the DECRYPTION_WORKERS thread pool, if configured),
+        instead of one value at a time while the rows are loaded. Users already
+        loaded in the session keep their values, including unflushed changes.
+
+        Args:
+            query (Query): A query whose only entity is User.
+
+        Returns:
+            List[User]: The users, with name and email already decrypted.
+        """
+        rows = (
+            query.options(defer(User._name), defer(User._email))
+            .add_columns(type_coerce(User._name, String), type_coerce(User._email, String))
+            .all()
+        )
+        if not rows:
+            return []
+
+        users, names, emails = zip(*rows)
+        dialect = db.session.get_bind().dialect
+        workers = current_app.config['DECRYPTION_WORKERS']
+        min_parallel = current_app.config['DECRYPTION_PARALLEL_MIN_ROWS']
+        states = [inspect(user) for user in users]
+        for attribute, ciphertexts in (('_name', names), ('_email', emails)):
+            unloaded = [i for i, state in enumerate(states) if attribute in state.unloaded]
+            column_type = getattr(User, attribute).type
+            cleartexts = batch_decrypt(column_type, [ciphertexts[i] for i in unloaded], dialect, workers, min_parallel)
+            for i, cleartext in zip(unloaded, cleartexts):
+                set_committed_value(users[i], attribute, cleartext)
+        return list(users)
+
+    @staticmethod
+    @read_replica
     def get_all_users() -> List[User]:
         """
         Retrieves all users from the database.
@@ -24,29 +77,97 @@ class UserService:
             List[User]: A list of all User objects in the database.
         """
         logger.debug("Fetching all users from the database.")
-        users: List[User] = db.session.query(User).all()
+        users = UserService.load_decrypted(db.session.query(User))
         logger.info("Fetched %d users from the database.", len(users))
         return users
 
     @staticmethod
-    def get_user_by_id(user_id: str) -> Optional[User]:
+    @read_replica
+    def get_enrolled_students(course_id: str) -> List[User]:
+        """
+        Retrieves the students enrolled in a course with a single query.
+
+        Args:
+            course_id (str): The unique identifier of the course.
+
+        Returns:
+            List[User]: The enrolled students, with name and email already decrypted.
+        """
+        logger.debug("Fetching students enrolled in course ID: %s", course_id)
+        query = (
+            db.session.query(User)
+            .join(Enrollment, Enrollment.student_id == User.id)
+            .filter(Enrollment.course_id == course_id)
+        )
+        students = UserService.load_decrypted(query)
+        logger.info("Fetched %d students enrolled in course ID: %s.", len(students), course_id)
+        return students
+
+    @staticmethod
+    def get_user_by_id(user_id: str, for_update: bool = False) -> Optional[User]:
         """
-        Retrieves a user by their unique ID.
+        Retrieves a user by their unique ID, through the process-wide user cache.
 
         Args:
             user_id (str): The unique identifier of the user.
+            for_update (bool): Read the row from the database instead, for callers
+                about to modify it: the cached row may be a few seconds old.
 
         Returns:
             Optional[User]: The User object if found, otherwise None.
         """
         logger.debug("Fetching user by ID: %s", user_id)
-        user: Optional[User] = db.session.get(User, user_id)
+        user: Optional[User]
+        if for_update:
+            user = db.session.get(User, user_id, populate_existing=True)
+        else:
+            user = user_cache.get(db.session, user_id)
         if user:
             logger.debug("User found: %s (ID: %s)", user.name, user.id)
         else:
             logger.debug("No user found with ID: %s", user_id)
         return user
 
+    @staticmethod
+    def get_user_identity(user_id: str) -> Optional[User]:
+        """
+        Retrieves only the columns needed for authorization checks (id and role).
+
+        Other columns are loaded on first access, so this is the cheapest way to
+        answer "who is calling and what may they do".
+
+        Args:
+            user_id (str): The unique identifier of the user.
+
+        Returns:
+            Optional[User]: A partially loaded User object if found, otherwise None.
+        """
+        logger.debug("Fetching user identity by ID: %s", user_id)
+        return db.session.get(User, user_id, options=[load_only(User.id, User.role)])
+
+    @staticmethod
+    def get_user_with_relationships(user_id: str) -> Optional[User]:
+        """
+        Retrieves a user together with the courses they teach, their enrollments and
+        their grades, each collection fetched with one extra SELECT ... IN query.
+
+        Args:
+            user_id (str): The unique identifier of the user.
+
+        Returns:
+            Optional[User]: The User object with its relationships loaded, otherwise None.
+        """
+        logger.debug("Fetching user with relationships by ID: %s", user_id)
+        return db.session.get(
+            User,
+            user_id,
+            options=[
+                selectinload(User.courses_created),
+                selectinload(User.enrollments),
+                selectinload(User.grades),
+            ],
+        )
+
     @staticmethod
     def get_user_by_email(email: str) -> Optional[User]:
         """
@@ -70,14 +191,17 @@ class UserService:
         return user
 
     @staticmethod
+    @read_replica
     def search_users(query: str) -> List[User]:
         """
         Searches for users whose name or email contains the query string.
-        Because name/email may be encrypted, we cannot directly do partial
-        matching in the SQL query. As a workaround, we:
-          1. Fetch all users (caution: large DB impact).
-          2. Decrypt name and email in Python.
-          3. Perform a case-insensitive substring check.
+
+        Name and email are encrypted, so the database cannot match substrings
+        directly. Instead the query is split into n-grams whose blind index tokens
+        are looked up in user_search_tokens: only users having every token in their
+        name or email are loaded, and each candidate is then decrypted and checked
+        (a truncated HMAC may collide). Queries shorter than one n-gram fall back
+        to decrypting every user.
 
         Args:
             query (str): The search query to match against user name/email.
@@ -88,15 +212,26 @@ class UserService:
         logger.debug("Searching users with query: %s", query)
         query_lower = query.lower()
 
-        all_users: List[User] = db.session.query(User).all()
+        tokens = blind_tokens(query, BLIND_INDEX_KEY)
+        if tokens:
+            candidate_ids = (
+                select(UserSearchToken.user_id)
+                .where(UserSearchToken.token.in_(tokens))
+                .group_by(UserSearchToken.user_id, UserSearchToken.field)
+                .having(func.count() == len(tokens))
+            )
+            candidates: List[User] = db.session.query(User).filter(User.id.in_(candidate_ids)).all()
+        else:
+            logger.debug("Query '%s' is too short for the blind index; scanning all users.", query)
+            candidates = db.session.query(User).all()
 
         matched = []
-        for user in all_users:
+        for user in candidates:
             if (user.name and query_lower in user.name.lower()) or \
                (user.email and query_lower in user.email.lower()):
                 matched.append(user)
 
-        logger.info("Found %d users matching query '%s'.", len(matched), query)
+        logger.info("Found %d users matching query '%s' (%d candidates).", len(matched), query, len(candidates))
         return matched
 
     @staticmethod
@@ -122,6 +257,80 @@ class UserService:
         logger.info("User created with ID: %s", new_user.id)
         return new_user
 
+    @staticmethod
+    def bulk_create_users(rows: Sequence[Dict[str, Any]], workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Creates many users at once, in a single transaction.
+
+        Rows are validated like create_user's input, email uniqueness is checked
+        with one query on email_hash, the passwords of the new users are hashed on
+        the PASSWORD_HASH_WORKERS process pool and users are inserted
+        BULK_INSERT_CHUNK_SIZE at a time.
+
+        Args:
+            rows (Sequence[Dict[str, Any]]): Users to create, each with name, email,
+                password and role ('Student' or 'Professor').
+            workers (Optional[int]): Hashing processes. Defaults to PASSWORD_HASH_WORKERS.
+
+        Returns:
+            List[Dict[str, Any]]: One result per row, in order, with its status:
+            'created' (with the new id), 'exists', 'duplicate' (same email earlier
+            in rows) or 'invalid' (with a msg).
+        """
+        logger.debug("Bulk creating %d users.", len(rows))
+        results: List[Dict[str, Any]] = []
+        valid: Dict[str, int] = {}
+        for index, row in enumerate(rows):
+            if not isinstance(row, dict):
+                results.append({'status': 'invalid', 'msg': 'Row must be an object.'})
+                continue
+            fields = {key: row.get(key) for key in ('name', 'email', 'password', 'role')}
+            if not all(isinstance(value, str) and value.strip() for value in fields.values()):
+                results.append({'status': 'invalid', 'msg': 'All fields are required.'})
+                continue
+            email = fields['email'].strip().lower()
+            results.append({'email': email})
+            if fields['role'].strip() not in ASSIGNABLE_ROLES:
+                results[index].update(status='invalid', msg='Invalid role.')
+                continue
+            email_hash = compute_email_hash(email)
+            if email_hash in valid:
+                results[index]['status'] = 'duplicate'
+                continue
+            valid[email_hash] = index
+
+        existing = set(db.session.scalars(select(User.email_hash).where(User.email_hash.in_(list(valid)))))
+        for email_hash in existing:
+            results[valid.pop(email_hash)]['status'] = 'exists'
+
+        indexes = list(valid.values())
+        password_hashes = hash_passwords(
+            [rows[index]['password'] for index in indexes],
+            workers or current_app.config['PASSWORD_HASH_WORKERS'],
+            current_app.config['PASSWORD_HASH_METHOD'],
+        )
+
+        chunk_size = current_app.config['BULK_INSERT_CHUNK_SIZE']
+        try:
+            for start in range(0, len(indexes), chunk_size):
+                users = []
+                for index, password_hash in zip(indexes[start:start + chunk_size], password_hashes[start:start + chunk_size]):
+                    row = rows[index]
+                    user = User(name=row['name'].strip(), email=results[index]['email'],
+                                role=row['role'].strip(), password_hash=password_hash)
+                    users.append((index, user))
+                db.session.add_all(user for _, user in users)
+                db.session.flush()
+                for index, user in users:
+                    results[index].update(status='created', id=user.id)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        logger.info("Bulk created %d of %d users.", len(indexes), len(rows))
+        return results
+
     @staticmethod
     def update_user(
         user: User,
@@ -159,6 +368,18 @@ class UserService:
         logger.info("User ID: %s updated successfully.", user.id)
         return user
 
+    @staticmethod
+    def revoke_tokens(user: User) -> None:
+        """
+        Invalidates every access token issued to a user so far.
+
+        Args:
+            user (User): The User object whose tokens are revoked.
+        """
+        user.revoke_tokens()
+        db.session.commit()
+        logger.info("Tokens of user ID: %s revoked.", user.id)
+
     @staticmethod
     def delete_user(user: User) -> None:
         """
@@ -0,0 +1,85 @@
+import hashlib
+import hmac
+from typing import Set
+
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+NGRAM_SIZE = 3
+TOKEN_LENGTH = 32
+# HKDF context of the blind index key derived from ENCRYPTION_KEY.
+KEY_DERIVATION_INFO = b'user-search-blind-index'
+
+
+def derive_blind_index_key(encryption_key: str) -> str:
+    """
+    Derives the blind index HMAC key from the encryption key with HKDF-SHA256, so
+    the Fernet key is never used as an HMAC key itself.
+
+    Args:
+        encryption_key (str): The Fernet key encrypting user names and emails.
+
+    Returns:
+        str: The hex encoded 256-bit subkey.
+    """
+    hkdf = HKDF(algorithm=hashes.SHA256(), length=32, salt=None, info=KEY_DERIVATION_INFO)
+    return hkdf.derive(encryption_key.encode('utf-8')).hex()
+
+
+def normalize(value: str) -> str:
+    """
+    Normalizes a value the same way for indexing and searching (case-insensitive).
+    """
+    return value.lower()
+
+
+def ngrams(value: str, size: int = NGRAM_SIZE) -> Set[str]:
+    """
+    Splits a normalized value into its distinct overlapping n-grams.
+
+    Args:
+        value (str): The value to split.
+        size (int): Length of each n-gram.
+
+    Returns:
+        Set[str]: The n-grams of the value, empty if it is shorter than size.
+    """
+    value = normalize(value)
+    return {value[i:i + size] for i in range(len(value) - size + 1)}
+
+
+def blind_token(ngram: str, key: str) -> str:
+    """
+    Computes the keyed HMAC-SHA256 of an n-gram, truncated to TOKEN_LENGTH hex digits.
+
+    Without the key the stored tokens reveal nothing about the plaintext beyond
+    how many distinct n-grams it has.
+
+    Args:
+        ngram (str): The n-gram to hash.
+        key (str): The secret blind index key.
+
+    Returns:
+        str: The hex encoded token.
+    """
+    digest = hmac.new(key.encode('utf-8'), ngram.encode('utf-8'), hashlib.sha256).hexdigest()
+    return digest[:TOKEN_LENGTH]
+
+
+def blind_tokens(value: str, key: str) -> Set[str]:
+    """
+    Computes the blind index tokens of every n-gram of a value.
+
+    A stored value contains a search query as a substring only if its tokens are a
+    superset of the query's tokens, so the token table can narrow down candidates
+    without decrypting anything. Truncated HMACs may collide, so candidates still
+    have to be checked against the decrypted value.
+
+    Args:
+        value (str): The plaintext value.
+        key (str): The secret blind index key.
+
+    Returns:
+        Set[str]: The tokens, empty if the value is shorter than NGRAM_SIZE.
+    """
+    return {blind_token(ngram, key) for ngram in ngrams(value)}
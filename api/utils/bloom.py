@@ -0,0 +1,65 @@
+import hashlib
+import math
+import threading
+from typing import Any, Dict
+
+
+class BloomFilter:
+    """
+    Thread-safe Bloom filter of strings: membership tests never give false negatives
+    and give false positives at roughly error_rate once capacity items were added.
+
+    The bit array and number of hash functions are sized for capacity and
+    error_rate; the k bit positions of an item come from one BLAKE2b digest by
+    double hashing.
+
+    Args:
+        capacity (int): Number of items the filter is sized for.
+        error_rate (float): Target false positive rate at capacity, e.g. 0.001.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError("capacity must be positive and error_rate between 0 and 1.")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, item: str) -> None:
+        positions = self._positions(item)
+        with self._lock:
+            for position in positions:
+                self._bits[position >> 3] |= 1 << (position & 7)
+            self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        # Bits are only ever set, so reading them without the lock is safe.
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def estimated_error_rate(self) -> float:
+        """False positive rate expected with the number of items added so far."""
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'items': self.count,
+            'capacity': self.capacity,
+            'size_bytes': len(self._bits),
+            'num_hashes': self.num_hashes,
+            'target_error_rate': self.error_rate,
+            'estimated_error_rate': self.estimated_error_rate(),
+        }
@@ -0,0 +1,32 @@
+import hashlib
+from typing import Any, Optional
+
+from flask import Response, request
+
+
+def compute_etag(*parts: Any) -> str:
+    """
+    Derives an entity tag from the values identifying a version of a resource,
+    such as its id and updated_at, without serializing the resource.
+    """
+    return hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=12).hexdigest()
+
+
+def with_etag(response: Response, etag: str) -> Response:
+    """
+    Tags a response. The tag is weak: it identifies the data, not the bytes, which
+    may differ once compressed. Clients must revalidate before reusing the body.
+    """
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def not_modified(etag: str) -> Optional[Response]:
+    """
+    Returns an empty 304 response when the request's If-None-Match matches etag,
+    otherwise None.
+    """
+    if not request.if_none_match.contains_weak(etag):
+        return None
+    return with_etag(Response(status=304), etag)
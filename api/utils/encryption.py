@@ -0,0 +1,194 @@
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy_utils import StringEncryptedType
+
+# Approximate per-entry cost beyond the cleartext itself: key digest, tuple and dict slot.
+ENTRY_OVERHEAD_BYTES = 200
+
+
+class DecryptionCache:
+    """
+    Thread-safe, in-memory LRU cache of decrypted column values keyed by a digest of
+    their ciphertext. Entries are evicted once their estimated total size exceeds
+    max_bytes. Nothing is ever persisted, so cleartext stays in process memory only.
+
+    Args:
+        max_bytes (int): Memory budget of the cache; 0 disables caching.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(ciphertext: str) -> bytes:
+        return hashlib.blake2b(ciphertext.encode('utf-8'), digest_size=16).digest()
+
+    def get(self, ciphertext: str) -> Optional[str]:
+        key = self._key(ciphertext)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, ciphertext: str, cleartext: str) -> None:
+        if self.max_bytes <= 0:
+            return
+        key = self._key(ciphertext)
+        cost = sys.getsizeof(cleartext) + ENTRY_OVERHEAD_BYTES
+        if cost > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size_bytes -= previous[1]
+            self._entries[key] = (cleartext, cost)
+            self.size_bytes += cost
+            while self.size_bytes > self.max_bytes:
+                _, (_, evicted_cost) = self._entries.popitem(last=False)
+                self.size_bytes -= evicted_cost
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'size_bytes': self.size_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+            }
+
+
+class CachedStringEncryptedType(StringEncryptedType):
+    """
+    StringEncryptedType that remembers decrypted values in a DecryptionCache.
+
+    A Fernet token is authenticated and only ever decrypts to one value, so a
+    cached cleartext can be returned for a ciphertext that was seen before without
+    repeating the HMAC check and AES decryption. Values written through the type
+    are cached as well, so freshly saved rows are never decrypted.
+
+    Args:
+        *args: Positional arguments of StringEncryptedType.
+        cache (DecryptionCache): The cache shared by the columns using this type.
+        **kwargs: Keyword arguments of StringEncryptedType.
+    """
+
+    cache_ok = True
+
+    def __init__(self, *args: Any, cache: DecryptionCache, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.cache = cache
+
+    def process_bind_param(self, value, dialect):
+        ciphertext = super().process_bind_param(value, dialect)
+        if isinstance(value, str) and ciphertext is not None:
+            self.cache.set(ciphertext, value)
+        return ciphertext
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        cleartext = self.cache.get(value)
+        if cleartext is None:
+            cleartext = self.decrypt_uncached(value, dialect)
+        return cleartext
+
+    def decrypt_uncached(self, value: str, dialect) -> str:
+        """Decrypts a ciphertext without looking it up, then caches the result."""
+        cleartext = super().process_result_value(value, dialect)
+        self.cache.set(value, cleartext)
+        return cleartext
+
+
+_executors: Dict[int, ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_decryption_executor(workers: int) -> ThreadPoolExecutor:
+    """
+    Returns the process-wide decryption thread pool with the given number of workers,
+    creating it on first use.
+    """
+    with _executors_lock:
+        executor = _executors.get(workers)
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='decrypt')
+            _executors[workers] = executor
+        return executor
+
+
+def batch_decrypt(
+    type_: CachedStringEncryptedType,
+    ciphertexts: Sequence[Optional[str]],
+    dialect,
+    workers: int = 1,
+    min_parallel: int = 500,
+) -> List[Optional[str]]:
+    """
+    Decrypts many values of one encrypted column at once.
+
+    Cached values are served on the calling thread. With more than one worker and
+    at least min_parallel values remaining, they are split into one chunk per
+    worker and decrypted on the shared thread pool. Fernet work mostly holds the
+    GIL, so this gains little (see benchmarks/batch_decryption.py).
+
+    Args:
+        type_ (CachedStringEncryptedType): The column type the values were stored with.
+        ciphertexts (Sequence[Optional[str]]): The raw column values.
+        dialect: The dialect the values were read with.
+        workers (int): Size of the thread pool; 1 decrypts everything inline.
+        min_parallel (int): Smallest number of cache misses worth handing to the pool.
+
+    Returns:
+        List[Optional[str]]: The cleartexts, in the order of ciphertexts.
+    """
+    results: List[Optional[str]] = [None] * len(ciphertexts)
+    misses: List[int] = []
+    for index, ciphertext in enumerate(ciphertexts):
+        if ciphertext is None:
+            continue
+        cleartext = type_.cache.get(ciphertext)
+        if cleartext is None:
+            misses.append(index)
+        else:
+            results[index] = cleartext
+
+    if workers <= 1 or len(misses) < min_parallel:
+        for index in misses:
+            results[index] = type_.decrypt_uncached(ciphertexts[index], dialect)
+        return results
+
+    def decrypt_chunk(indexes: List[int]) -> List[str]:
+        return [type_.decrypt_uncached(ciphertexts[index], dialect) for index in indexes]
+
+    chunk_size = -(-len(misses) // workers)
+    chunks = [misses[start:start + chunk_size] for start in range(0, len(misses), chunk_size)]
+    executor = get_decryption_executor(workers)
+    for indexes, cleartexts in zip(chunks, executor.map(decrypt_chunk, chunks)):
+        for index, cleartext in zip(indexes, cleartexts):
+            results[index] = cleartext
+    return results
@@ -0,0 +1,180 @@
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, Hashable, Iterable, Optional, Sequence, Tuple, Type
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from .cache import TTLCache
+
+
+class _WriteInvalidatedCache(ABC):
+    """
+    TTL cache of data derived from one model's rows, whose keys are dropped when
+    such rows are inserted, updated or deleted through the ORM in this process:
+    at flush and again after commit. Every invalidation also bumps a generation
+    counter, and a miss stores what it loaded only if no invalidation happened
+    while it was loading, so a read racing with a write does not put the old data
+    back. Writes made by other processes, or by Core statements, are picked up
+    once the entry expires. Subclasses tell which keys a written row affects.
+
+    Args:
+        model (Type): The mapped class whose rows are cached.
+        maxsize (int): Maximum number of entries kept.
+        ttl (float): Lifetime of an entry, in seconds.
+    """
+
+    def __init__(self, model: Type, maxsize: int, ttl: float) -> None:
+        self.model = model
+        self._mapper = inspect(model)
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generation = 0
+        self._generation_lock = threading.Lock()
+        self._pending_key = f'{type(self).__name__}:{self._mapper.persist_selectable.name}'
+        for identifier in ('after_insert', 'after_update', 'after_delete'):
+            event.listen(model, identifier, self._forget_target)
+        event.listen(Session, 'after_commit', self._forget_pending)
+        event.listen(Session, 'after_rollback', self._discard_pending)
+
+    @abstractmethod
+    def _keys_for(self, target: Any) -> Iterable[Hashable]:
+        """Keys of the entries derived from target, a row being written."""
+
+    def invalidate(self, key: Hashable) -> None:
+        self._invalidate([key])
+
+    def clear(self) -> None:
+        with self._generation_lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self._entries.stats()
+
+    def _invalidate(self, keys: Iterable[Hashable]) -> None:
+        with self._generation_lock:
+            self._generation += 1
+            for key in keys:
+                self._entries.invalidate(key)
+
+    def _store(self, key: Hashable, value: Any, generation: int) -> None:
+        # generation is the one read before loading value: a write invalidated in
+        # between may have been missed by the load.
+        with self._generation_lock:
+            if self._generation == generation:
+                self._entries.set(key, value)
+
+    def _forget_target(self, mapper, connection, target) -> None:
+        keys = set(self._keys_for(target))
+        self._invalidate(keys)
+        session = object_session(target)
+        if session is not None:
+            session.info.setdefault(self._pending_key, set()).update(keys)
+
+    def _forget_pending(self, session: Session) -> None:
+        keys = session.info.pop(self._pending_key, None)
+        if keys:
+            self._invalidate(keys)
+
+    def _discard_pending(self, session: Session) -> None:
+        session.info.pop(self._pending_key, None)
+
+
+class EntityCache(_WriteInvalidatedCache):
+    """
+    Process-wide read-through cache of one model's rows by primary key, for lookups
+    repeated on hot paths.
+
+    Entries hold column values rather than instances, so nothing is shared between
+    sessions or threads. A hit is attached to the caller's session as a persistent
+    instance without a query: relationships lazy-load and changes are flushed as
+    with any loaded instance.
+
+    Args:
+        model (Type): The mapped class to cache.
+        maxsize (int): Maximum number of rows kept.
+        ttl (float): Lifetime of an entry, in seconds.
+    """
+
+    def __init__(self, model: Type, maxsize: int, ttl: float) -> None:
+        super().__init__(model, maxsize, ttl)
+        self._columns = [attr.key for attr in self._mapper.column_attrs]
+
+    def get(self, session: Session, key: Hashable) -> Optional[Any]:
+        """
+        Returns the instance with the given primary key, from the session, the cache
+        or the database in that order, or None if there is no such row.
+        """
+        instance = session.identity_map.get(self._mapper.identity_key_from_primary_key([key]))
+        if instance is not None:
+            return instance
+        generation = self._generation
+        values = self._entries.get(key)
+        if values is None:
+            instance = session.get(self.model, key)
+            if instance is not None:
+                self._store(key, {column: getattr(instance, column) for column in self._columns}, generation)
+            return instance
+        return self._restore(session, values)
+
+    def _restore(self, session: Session, values: Dict[str, Any]) -> Any:
+        # Built without __init__ and set as committed values, so that validators and
+        # change tracking do not take the cached row for a modification.
+        instance = self._mapper.class_manager.new_instance()
+        for column, value in values.items():
+            set_committed_value(instance, column, value)
+        make_transient_to_detached(instance)
+        session.add(instance)
+        return instance
+
+    def _keys_for(self, target: Any) -> Iterable[Hashable]:
+        return [self._mapper.primary_key_from_instance(target)[0]]
+
+
+class VersionStampCache(_WriteInvalidatedCache):
+    """
+    Version stamps of groups of rows, for ETags: the number of rows of a group and
+    their latest updated_at. Inserting or deleting a row changes the count and
+    updating one moves updated_at, so the stamp changes whenever the group does.
+
+    Rows are grouped by the values of key_columns; with no key columns, the whole
+    table is one group, stamped under the empty key.
+
+    Args:
+        model (Type): The mapped class, which must have an updated_at column.
+        key_columns (Sequence[str]): Columns identifying a group.
+        maxsize (int): Maximum number of stamps kept.
+        ttl (float): Lifetime of a stamp, in seconds.
+    """
+
+    def __init__(self, model: Type, key_columns: Sequence[str], maxsize: int, ttl: float) -> None:
+        super().__init__(model, maxsize, ttl)
+        self.key_columns = tuple(key_columns)
+
+    def get(self, session: Session, *key: Any) -> Tuple[int, Optional[datetime]]:
+        """
+        Returns the stamp of the group with the given key column values, querying
+        the row count and latest updated_at on a miss.
+        """
+        generation = self._generation
+        stamp = self._entries.get(key)
+        if stamp is None:
+            query = select(func.count(), func.max(self.model.updated_at)).where(
+                *(getattr(self.model, column) == value for column, value in zip(self.key_columns, key))
+            )
+            stamp = tuple(session.execute(query).one())
+            self._store(key, stamp, generation)
+        return stamp
+
+    def _keys_for(self, target: Any) -> Iterable[Hashable]:
+        state = inspect(target)
+        yield tuple(getattr(target, column) for column in self.key_columns)
+        # A row moved to another group also changes the group it left.
+        previous = [state.attrs[column].history.deleted for column in self.key_columns]
+        if any(previous):
+            yield tuple(
+                values[0] if values else getattr(target, column)
+                for column, values in zip(self.key_columns, previous)
+            )
@@ -0,0 +1,116 @@
+import codecs
+import csv
+import io
+import json
+import re
+from typing import IO, Any, Dict, Iterator, Tuple
+
+READ_CHUNK_SIZE = 64 * 1024
+JSON_WHITESPACE = ' \t\r\n'
+NON_WHITESPACE = re.compile(r'[^ \t\r\n]')
+
+
+class MalformedImportError(ValueError):
+    """
+    Raised when an uploaded file cannot be parsed any further, as opposed to a single
+    invalid row which is reported and skipped.
+
+    Args:
+        message (str): What is wrong with the file.
+        row (int): Number of the row the parser had reached.
+    """
+
+    def __init__(self, message: str, row: int) -> None:
+        super().__init__(message)
+        self.row = row
+
+
+def iter_csv_records(stream: IO[bytes]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Reads a UTF-8 CSV file with a header line, one record at a time.
+
+    Args:
+        stream (IO[bytes]): The binary stream to read, e.g. request.stream.
+
+    Yields:
+        Tuple[int, Dict[str, Any]]: The 1-based row number (header excluded) and the
+        row keyed by column name.
+    """
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+    number = 0
+    try:
+        for number, record in enumerate(reader, start=1):
+            yield number, record
+    except (csv.Error, UnicodeDecodeError) as e:
+        raise MalformedImportError(f"Invalid CSV: {e}", number + 1) from e
+
+
+def iter_json_array(stream: IO[bytes], chunk_size: int = READ_CHUNK_SIZE) -> Iterator[Tuple[int, Any]]:
+    """
+    Reads the items of a top-level JSON array without loading the whole document,
+    decoding one item at a time from a buffer refilled chunk_size bytes at a time.
+
+    Args:
+        stream (IO[bytes]): The binary stream to read, e.g. request.stream.
+        chunk_size (int): Number of bytes read at once.
+
+    Yields:
+        Tuple[int, Any]: The 1-based position of the item and the decoded item.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer, pos, eof = '', 0, False
+
+    def read_more() -> None:
+        nonlocal buffer, pos, eof
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        try:
+            buffer = buffer[pos:] + text_decoder.decode(chunk, final=eof)
+        except UnicodeDecodeError as e:
+            raise MalformedImportError(f"Invalid JSON: {e}", number + 1) from e
+        pos = 0
+
+    def peek() -> str:
+        # Skips whitespace and returns the next character, or '' at the end of the stream.
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in JSON_WHITESPACE:
+                pos += 1
+            if pos < len(buffer) or eof:
+                return buffer[pos:pos + 1]
+            read_more()
+
+    number = 0
+    if peek() != '[':
+        raise MalformedImportError("Invalid JSON: expected an array.", 1)
+    pos += 1
+    if peek() == ']':
+        return
+
+    while True:
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+                # A number is only complete once what follows it has been read.
+                if eof or not isinstance(item, (int, float)):
+                    break
+                following = NON_WHITESPACE.search(buffer, end)
+                if following is not None and following.group() in (',', ']'):
+                    break
+            except json.JSONDecodeError as e:
+                if eof:
+                    raise MalformedImportError(f"Invalid JSON: {e.msg}", number + 1) from e
+            read_more()
+            peek()
+        pos = end
+        number += 1
+        yield number, item
+
+        separator = peek()
+        if separator == ']':
+            return
+        if separator != ',':
+            raise MalformedImportError("Invalid JSON: expected ',' or ']' after an array item.", number + 1)
+        pos += 1
+        peek()
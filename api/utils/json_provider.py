@@ -0,0 +1,90 @@
+import dataclasses
+import decimal
+import json
+import uuid
+from datetime import date
+from typing import Any
+
+from flask import Flask, Response
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+except ImportError:  # Optional: the json module is used without it.
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Converts the values the json module cannot encode, as orjson does natively."""
+    if isinstance(obj, date):
+        return obj.isoformat()
+    if isinstance(obj, (decimal.Decimal, uuid.UUID)):
+        return str(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(JSONProvider):
+    """
+    JSON provider encoding and decoding with orjson when it is installed, and with
+    the json module otherwise.
+
+    Both produce the same documents: compact (indented in debug mode), keys in
+    insertion order, non-ASCII characters as is, and dates and datetimes as ISO 8601
+    strings rather than the RFC 822 dates of Flask's default provider, so
+    serializers can hand datetime objects over as they are. Calls passing json
+    module options, and the rare values orjson rejects (such as non-string dict
+    keys), go through the json module.
+    """
+
+    mimetype = 'application/json'
+    default = staticmethod(_default)
+    use_orjson = orjson is not None
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if self.use_orjson and not kwargs:
+            try:
+                return orjson.dumps(obj, default=_default).decode('utf-8')
+            except TypeError:
+                pass
+        kwargs.setdefault('default', _default)
+        kwargs.setdefault('ensure_ascii', False)
+        kwargs.setdefault('separators', (',', ':'))
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        if self.use_orjson and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = self._app.debug
+        body = None
+        if self.use_orjson:
+            try:
+                body = orjson.dumps(obj, default=_default,
+                                    option=orjson.OPT_APPEND_NEWLINE | (orjson.OPT_INDENT_2 if pretty else 0))
+            except TypeError:
+                pass
+        if body is None:
+            body = self.dumps(obj, indent=2) if pretty else self.dumps(obj, separators=(',', ':'))
+            body = f"{body}\n"
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def register_json_provider(app: Flask) -> None:
+    """
+    Installs FastJSONProvider for jsonify, request.get_json() and current_app.json.
+
+    The class is also set as json_provider_class, where extensions such as
+    flask_jwt_extended look up the default() conversion.
+
+    Args:
+        app (Flask): The Flask application instance.
+    """
+    app.json_provider_class = FastJSONProvider
+    app.json = FastJSONProvider(app)
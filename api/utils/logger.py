@@ -1,7 +1,176 @@
+import atexit
 import logging
 import os
+import queue
+import threading
+from typing import Any, Dict, Optional
 from flask import Flask
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+try:
+    import fcntl
+except ImportError:  # Windows: the log file is then rotated without inter-process locking.
+    fcntl = None
+
+
+class SharedRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler several processes can write to the same file with.
+
+    Each record is written, and the file rotated, under an exclusive lock on a
+    sibling ".lock" file, so only one process rotates and none writes to a file
+    while it is renamed. A process whose open file has been rotated by another one
+    reopens the log before writing.
+    """
+
+    def __init__(self, filename: str, **kwargs: Any) -> None:
+        super().__init__(filename, **kwargs)
+        self._lock_file = open(f"{self.baseFilename}.lock", "a") if fcntl is not None else None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self._lock_file is None:
+            super().emit(record)
+            return
+        try:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+            try:
+                self._reopen_if_rotated()
+                super().emit(record)
+            finally:
+                fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+        except Exception:
+            self.handleError(record)
+
+    def reopen_lock(self) -> None:
+        """
+        Opens the lock file anew. Called in forked children: flock() locks belong to
+        the open file, which a child shares with its parent until it reopens it.
+        """
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = open(f"{self.baseFilename}.lock", "a")
+
+    def _reopen_if_rotated(self) -> None:
+        if self.stream is None:
+            return
+        try:
+            on_disk = os.stat(self.baseFilename)
+        except FileNotFoundError:
+            on_disk = None
+        opened = os.fstat(self.stream.fileno())
+        if on_disk is None or (on_disk.st_dev, on_disk.st_ino) != (opened.st_dev, opened.st_ino):
+            self.stream.close()
+            self.stream = self._open()
+
+    def close(self) -> None:
+        super().close()
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    QueueHandler feeding a bounded queue, so logging never waits on I/O and cannot
+    exhaust memory when the writer thread falls behind.
+
+    Once the queue is half full, only one DEBUG record in `debug_sample_rate` is
+    kept; DEBUG records finding the queue full are dropped. Records of higher
+    levels wait up to `put_timeout` seconds for room before being dropped. Dropped
+    records are counted by level (see stats()).
+
+    Records are queued without the handler lock, so that threads waiting for room
+    wait side by side rather than one after the other.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[Any]", debug_sample_rate: int, put_timeout: float) -> None:
+        super().__init__(log_queue)
+        self.debug_sample_rate = max(debug_sample_rate, 1)
+        self.put_timeout = put_timeout
+        self._debug_seen = 0
+        self.dropped: Dict[str, int] = {}
+        self._counters_lock = threading.Lock()
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # Handler.handle() without the handler lock: queue.Queue is thread-safe and
+        # the counters have their own lock.
+        rv = self.filter(record)
+        if isinstance(rv, logging.LogRecord):
+            record = rv
+        if rv:
+            self.emit(record)
+        return bool(rv)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            if record.levelno <= logging.DEBUG:
+                if self.queue.qsize() * 2 >= self.queue.maxsize:
+                    with self._counters_lock:
+                        self._debug_seen += 1
+                        sampled_out = self._debug_seen % self.debug_sample_rate
+                    if sampled_out:
+                        self._drop(record)
+                        return
+                self.queue.put_nowait(self.prepare(record))
+            else:
+                self.queue.put(self.prepare(record), timeout=self.put_timeout)
+        except queue.Full:
+            self._drop(record)
+        except Exception:
+            self.handleError(record)
+
+    def _drop(self, record: logging.LogRecord) -> None:
+        with self._counters_lock:
+            self.dropped[record.levelname] = self.dropped.get(record.levelname, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the queue's current and maximum size and the dropped record counts."""
+        with self._counters_lock:
+            dropped = dict(self.dropped)
+        return {'queued': self.queue.qsize(), 'maxsize': self.queue.maxsize, 'dropped': dropped}
+
+
+class _Listener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # Wait for room: the sentinel must not be dropped like a record.
+        self.queue.put(self._sentinel)
+
+
+# The writer thread of this process and the handler feeding it, replaced whenever
+# logging is configured again (e.g. by every application the tests create).
+_listener: Optional[_Listener] = None
+_queue_handler: Optional[BoundedQueueHandler] = None
+
+
+def _stop_listener() -> None:
+    """Writes out the queued records and stops the writer thread."""
+    global _listener
+    if _listener is None:
+        return
+    if _queue_handler is not None and _queue_handler.dropped:
+        logging.getLogger(__name__).warning("Log records dropped by level: %s", _queue_handler.dropped)
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+def _restart_after_fork() -> None:
+    """Gives a forked worker its own queue and writer thread: threads do not survive fork()."""
+    global _listener
+    if _listener is None or _queue_handler is None:
+        return
+    _queue_handler.queue = queue.Queue(_queue_handler.queue.maxsize)
+    for handler in _listener.handlers:
+        if isinstance(handler, SharedRotatingFileHandler):
+            handler.reopen_lock()
+    _listener = _Listener(_queue_handler.queue, *_listener.handlers, respect_handler_level=True)
+    _listener.start()
+
+
+atexit.register(_stop_listener)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_after_fork)
 
 
 def configure_logging(app: Flask) -> None:
@@ -9,6 +178,11 @@ def configure_logging(app: Flask) -> None:
     This function sets up logging for the Flask application by configuring both console and file handlers.
     It ensures that log messages are formatted consistently and handles log rotation for file logs.
 
+    The handlers are not attached to the app logger: it only puts records on a
+    bounded queue (see BoundedQueueHandler), and a single writer thread formats them
+    and writes them to the console and the file, so request threads never contend
+    for a handler lock or wait on file I/O.
+
     Args:
         app (Flask): The Flask application instance for which logging is being configured.
 
@@ -20,7 +194,12 @@ def configure_logging(app: Flask) -> None:
         - The log directory is determined by the "LOG_DIR" configuration value, defaulting to a "logs" directory within the app's root path.
         - Console logs are set to INFO level by default, but this can be adjusted.
         - File logs are set to DEBUG level and are rotated when they reach 5 MB, with up to 5 backup files kept.
+          Rotation is locked across processes (see SharedRotatingFileHandler).
+        - The queue holds LOG_QUEUE_SIZE records; see BoundedQueueHandler for what happens when it fills up.
+          Its stats() are available as app.extensions['log_queue'].stats().
     """
+    global _listener, _queue_handler
+
     log_level = app.config.get("LOG_LEVEL", "DEBUG").upper()
     log_dir = app.config.get("LOG_DIR", os.path.join(app.root_path, "logs"))
 
@@ -32,26 +211,40 @@ def configure_logging(app: Flask) -> None:
     )
 
     # Remove existing handlers to avoid duplicate logs
+    _stop_listener()
     if app_logger.hasHandlers():
         app_logger.handlers.clear()
 
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(formatter)
-    app_logger.addHandler(console_handler)
+    handlers = [console_handler]
 
     # File Handler: logs to a file with rotation
+    file_error: Optional[OSError] = None
     try:
         os.makedirs(log_dir, exist_ok=True)
-        file_handler = RotatingFileHandler(
+        file_handler = SharedRotatingFileHandler(
             os.path.join(log_dir, "app.log"),
             maxBytes=5 * 1024 * 1024,
             backupCount=5,
         )
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(formatter)
-        app_logger.addHandler(file_handler)
+        handlers.append(file_handler)
     except OSError as e:
-        app_logger.error(f"Failed to create log directory or file handler: {e}")
+        file_error = e
+
+    _queue_handler = BoundedQueueHandler(
+        queue.Queue(app.config.get("LOG_QUEUE_SIZE", 10000)),
+        debug_sample_rate=app.config.get("LOG_DEBUG_SAMPLE_RATE", 10),
+        put_timeout=app.config.get("LOG_QUEUE_TIMEOUT", 0.05),
+    )
+    _listener = _Listener(_queue_handler.queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    app_logger.addHandler(_queue_handler)
+    app.extensions['log_queue'] = _queue_handler
 
+    if file_error is not None:
+        app_logger.error(f"Failed to create log directory or file handler: {file_error}")
     app_logger.info("Logging has been configured via configure_logging.")
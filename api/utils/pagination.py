@@ -0,0 +1,40 @@
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    """
+    Encodes the sort key of the last row of a page into an opaque cursor.
+
+    Args:
+        created_at (datetime): Creation timestamp of the last row returned.
+        row_id (str): Identifier of the last row returned, used as a tie-breaker.
+
+    Returns:
+        str: A URL-safe token to pass back as the `after` query parameter.
+    """
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: str) -> Tuple[datetime, str]:
+    """
+    Decodes a cursor produced by encode_cursor().
+
+    Args:
+        token (str): The opaque cursor.
+
+    Returns:
+        Tuple[datetime, str]: The (created_at, id) sort key the next page starts after.
+
+    Raises:
+        ValueError: If the token is malformed.
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return datetime.fromisoformat(created_at), str(row_id)
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {token!r}") from e
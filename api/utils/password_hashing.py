@@ -0,0 +1,280 @@
+import functools
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Sequence, Tuple, TypeVar
+
+from flask import current_app, has_app_context, jsonify
+from werkzeug.security import check_password_hash, generate_password_hash
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+EXECUTOR_EXTENSION_KEY = 'password_hashing_executor'
+# werkzeug's own default, used outside an application context.
+DEFAULT_HASH_METHOD = 'scrypt'
+
+_pools: Dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def get_hashing_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Returns the process-wide password hashing pool with the given number of workers,
+    creating it on first use.
+
+    Workers are spawned rather than forked so that they do not inherit the parent's
+    database connections, locks or threads.
+    """
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            _pools[workers] = pool
+            logger.debug("Started password hashing pool with %d worker(s).", workers)
+        return pool
+
+
+def hash_passwords(passwords: Sequence[str], workers: int = 1, method: str = DEFAULT_HASH_METHOD) -> List[str]:
+    """
+    Hashes many passwords with generate_password_hash, spread over a process pool.
+
+    Password hashing is CPU bound and holds the GIL, so threads would not help;
+    each worker process hashes one slice of the passwords.
+
+    Args:
+        passwords (Sequence[str]): The plain text passwords.
+        workers (int): Number of worker processes; 1 hashes on the calling thread.
+        method (str): werkzeug hash method, e.g. 'scrypt:32768:8:1'.
+
+    Returns:
+        List[str]: The password hashes, in the order of passwords.
+    """
+    hash_one = functools.partial(generate_password_hash, method=method)
+    if workers <= 1 or len(passwords) < 2:
+        return [hash_one(password) for password in passwords]
+    chunksize = max(1, len(passwords) // (workers * 4))
+    return list(get_hashing_pool(workers).map(hash_one, passwords, chunksize=chunksize))
+
+
+@functools.lru_cache(maxsize=None)
+def _canonical_method(method: str) -> str:
+    # werkzeug stores methods with their defaults filled in ('scrypt' -> 'scrypt:32768:8:1').
+    return generate_password_hash('', method).split('$', 1)[0]
+
+
+def needs_rehash(password_hash: str, method: str) -> bool:
+    """
+    Tells whether a stored hash was made with other parameters than method.
+
+    Args:
+        password_hash (str): A hash made by generate_password_hash.
+        method (str): The hash method currently configured.
+
+    Returns:
+        bool: True when the hash should be replaced by one made with method.
+    """
+    return password_hash.split('$', 1)[0] != _canonical_method(method)
+
+
+class HashingBusyError(RuntimeError):
+    """
+    Raised when the password hashing executor already holds as many jobs as it may
+    queue; callers should answer 503 rather than wait (see busy_response()).
+    """
+
+
+def busy_response(message_key: str = 'error') -> Tuple[Any, int, Dict[str, str]]:
+    """
+    Response for requests turned away with HashingBusyError.
+
+    Args:
+        message_key (str): Key of the error message in the body, 'error' or 'msg'
+            as the calling controller's other errors use.
+
+    Returns:
+        Tuple[Any, int, Dict[str, str]]: Error message, 503 and a Retry-After header
+        of PASSWORD_BUSY_RETRY_AFTER seconds.
+    """
+    retry_after = current_app.config['PASSWORD_BUSY_RETRY_AFTER']
+    message = 'Too many concurrent password operations, retry later.'
+    return jsonify({message_key: message}), 503, {'Retry-After': str(retry_after)}
+
+
+class BoundedHashingExecutor:
+    """
+    Dedicated thread pool for the password KDF, with a hard limit on queued work.
+
+    hashlib's scrypt and PBKDF2 release the GIL, so `workers` threads hash in
+    parallel while the web server threads only wait on the result. At most
+    `workers + max_queue` jobs are accepted at a time; submitting more raises
+    HashingBusyError immediately, so a login storm cannot tie up every server
+    thread.
+
+    Args:
+        workers (int): Number of hashing threads.
+        max_queue (int): Jobs allowed to wait for a free thread.
+    """
+
+    def __init__(self, workers: int, max_queue: int) -> None:
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self._lock = threading.Lock()
+        self.accepted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.pending = 0
+        self.running = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+
+    def submit(self, func: Callable[..., T], *args: Any) -> 'Future[T]':
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HashingBusyError("Password hashing queue is full.")
+        with self._lock:
+            self.accepted += 1
+            self.pending += 1
+        queued_at = time.perf_counter()
+
+        def job() -> T:
+            waited = time.perf_counter() - queued_at
+            with self._lock:
+                self.running += 1
+                self.queue_wait_total += waited
+                self.queue_wait_max = max(self.queue_wait_max, waited)
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self.running -= 1
+                    self.pending -= 1
+                    self.completed += 1
+                self._slots.release()
+
+        try:
+            return self._executor.submit(job)
+        except Exception:
+            with self._lock:
+                self.pending -= 1
+            self._slots.release()
+            raise
+
+    def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Runs func on the pool and waits for its result."""
+        return self.submit(func, *args).result()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'max_queue': self.max_queue,
+                'running': self.running,
+                'queued': self.pending - self.running,
+                'accepted': self.accepted,
+                'rejected': self.rejected,
+                'completed': self.completed,
+                'queue_wait_avg': self.queue_wait_total / self.completed if self.completed else 0.0,
+                'queue_wait_max': self.queue_wait_max,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+def get_hashing_executor() -> BoundedHashingExecutor:
+    """
+    Returns the current application's password hashing executor, sized by
+    PASSWORD_VERIFY_WORKERS and PASSWORD_VERIFY_QUEUE_SIZE.
+    """
+    executor = current_app.extensions.get(EXECUTOR_EXTENSION_KEY)
+    if executor is None:
+        executor = current_app.extensions.setdefault(
+            EXECUTOR_EXTENSION_KEY,
+            BoundedHashingExecutor(
+                current_app.config['PASSWORD_VERIFY_WORKERS'],
+                current_app.config['PASSWORD_VERIFY_QUEUE_SIZE'],
+            ),
+        )
+    return executor
+
+
+def hash_password(password: str) -> str:
+    """
+    Hashes a password with PASSWORD_HASH_METHOD on the hashing executor (inline with
+    werkzeug's default method outside an application context).
+    Raises HashingBusyError when the executor is full.
+    """
+    if not has_app_context():
+        return generate_password_hash(password, DEFAULT_HASH_METHOD)
+    return get_hashing_executor().run(generate_password_hash, password, current_app.config['PASSWORD_HASH_METHOD'])
+
+
+def verify_password(password_hash: str, password: str) -> bool:
+    """
+    Checks a password against its hash on the hashing executor (inline outside an
+    application context). Raises HashingBusyError when the executor is full.
+    """
+    if not has_app_context():
+        return check_password_hash(password_hash, password)
+    return get_hashing_executor().run(check_password_hash, password_hash, password)
+
+
+def time_hash(method: str, samples: int = 3) -> float:
+    """Returns the fastest of samples hashes made with method, in milliseconds."""
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        generate_password_hash('calibration-password', method)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def calibrate(algorithm: str, target_ms: float, samples: int = 3) -> Tuple[str, float]:
+    """
+    Finds the costliest hash method of an algorithm that hashes within target_ms on
+    this host.
+
+    Hash time grows linearly with the scrypt work factor N (a power of two, with
+    r=8 and p=1) and with the PBKDF2-SHA256 iteration count, so the cost is
+    extrapolated from one measurement and then checked, halving N or shrinking the
+    iteration count while it is too slow.
+
+    Args:
+        algorithm (str): 'scrypt' or 'pbkdf2'.
+        target_ms (float): Hash time to aim for, in milliseconds.
+        samples (int): Hashes timed per measurement.
+
+    Returns:
+        Tuple[str, float]: The method for PASSWORD_HASH_METHOD and its measured hash time in ms.
+    """
+    if algorithm == 'scrypt':
+        base_n = 2 ** 14
+        elapsed = time_hash(f'scrypt:{base_n}:8:1', samples)
+        n = base_n
+        while n * 2 * elapsed / base_n <= target_ms:
+            n *= 2
+        while True:
+            method = f'scrypt:{n}:8:1'
+            elapsed = time_hash(method, samples)
+            if elapsed <= target_ms or n <= 2 ** 10:
+                break
+            n //= 2
+    elif algorithm == 'pbkdf2':
+        base_iterations = 100_000
+        elapsed = time_hash(f'pbkdf2:sha256:{base_iterations}', samples)
+        iterations = max(int(base_iterations * target_ms / elapsed), 10_000)
+        while True:
+            method = f'pbkdf2:sha256:{iterations}'
+            elapsed = time_hash(method, samples)
+            if elapsed <= target_ms or iterations <= 10_000:
+                break
+            iterations = max(int(iterations * target_ms / elapsed * 0.95), 10_000)
+    else:
+        raise ValueError(f"Unsupported hash algorithm '{algorithm}'.")
+    return method, elapsed
@@ -0,0 +1,139 @@
+import heapq
+import re
+import threading
+from array import array
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+WORD_PATTERN = re.compile(r'\w+')
+# Terms shorter than a trigram are looked up by word prefix under these keys.
+PREFIX_MARKER = '^'
+
+
+def terms(text: str) -> List[str]:
+    """
+    Splits a text into lowercase words, the unit both indexing and queries work on.
+    """
+    return WORD_PATTERN.findall(text.lower())
+
+
+def _trigrams(word: str) -> List[str]:
+    return [word[i:i + 3] for i in range(len(word) - 2)]
+
+
+def _keys(word: str) -> List[str]:
+    return [PREFIX_MARKER + word[:size] for size in (1, 2) if len(word) >= size] + _trigrams(word)
+
+
+class TrigramIndex:
+    """
+    Thread-safe in-process full-text index of short texts such as course names.
+
+    Every word is indexed by its trigrams and by its one and two character prefixes.
+    A query term matches a text when it is a substring of one of its words (terms of
+    one or two characters must be a word prefix) and a text matches a query when
+    every term does. Candidates come from the rarest posting list of the query, so a
+    search only looks at texts sharing its least common trigram.
+
+    Removed or replaced texts leave stale entries in the posting lists, which are
+    skipped at query time; build a new index to compact them.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._keys: List[Optional[Hashable]] = []
+        self._texts: List[Optional[str]] = []
+        self._docs: Dict[Hashable, int] = {}
+        self._postings: Dict[str, array] = {}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def build(self, items: Iterable[Tuple[Hashable, str]]) -> 'TrigramIndex':
+        """Adds every (key, text) pair and returns the index."""
+        for key, text in items:
+            self.add(key, text)
+        return self
+
+    def add(self, key: Hashable, text: str) -> None:
+        """Indexes text under key, replacing what key was indexed with before."""
+        words = terms(text)
+        # Words padded with spaces, so that scoring can test for whole words and
+        # word prefixes with plain substring checks.
+        normalized = f" {' '.join(words)} "
+        index_keys = {index_key for word in words for index_key in _keys(word)}
+        with self._lock:
+            self._remove(key)
+            doc = len(self._keys)
+            self._keys.append(key)
+            self._texts.append(normalized)
+            self._docs[key] = doc
+            for index_key in index_keys:
+                posting = self._postings.get(index_key)
+                if posting is None:
+                    posting = self._postings[index_key] = array('I')
+                posting.append(doc)
+
+    def remove(self, key: Hashable) -> None:
+        """Removes key from the index; unknown keys are ignored."""
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key: Hashable) -> None:
+        doc = self._docs.pop(key, None)
+        if doc is not None:
+            self._keys[doc] = None
+            self._texts[doc] = None
+
+    def search(self, query: str, limit: int = 20) -> List[Tuple[Hashable, int]]:
+        """
+        Returns the keys of the best matching texts with their relevance score.
+
+        Each term scores 3 when it equals a word of the text, 2 when it is a word
+        prefix and 1 when it only occurs inside a word; texts starting with the
+        whole query get 2 more. Ties go to the shortest text.
+
+        Args:
+            query (str): The search query.
+            limit (int): Maximum number of results.
+
+        Returns:
+            List[Tuple[Hashable, int]]: (key, score) pairs, best first.
+        """
+        query_terms = terms(query)
+        if not query_terms or limit <= 0:
+            return []
+        query_prefix = f" {' '.join(query_terms)}"
+
+        with self._lock:
+            seed: Optional[array] = None
+            for term in query_terms:
+                keys = [PREFIX_MARKER + term] if len(term) < 3 else _trigrams(term)
+                for index_key in keys:
+                    posting = self._postings.get(index_key)
+                    if posting is None:
+                        return []
+                    if seed is None or len(posting) < len(seed):
+                        seed = posting
+            candidates = [(self._keys[doc], self._texts[doc]) for doc in seed]
+
+        patterns = [(f" {term} ", f" {term}", term if len(term) >= 3 else None) for term in query_terms]
+        scored = []
+        for key, text in candidates:
+            if text is None:
+                continue
+            score = 0
+            for word, prefix, substring in patterns:
+                if word in text:
+                    score += 3
+                elif prefix in text:
+                    score += 2
+                elif substring is not None and substring in text:
+                    score += 1
+                else:
+                    break
+            else:
+                if text.startswith(query_prefix):
+                    score += 2
+                scored.append((score, -len(text), key))
+
+        return [(key, score) for score, _, key in heapq.nlargest(limit, scored, key=lambda item: item[:2])]
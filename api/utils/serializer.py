@@ -1,9 +1,60 @@
-from typing import Any, Dict
-from api.config.models import Course, Grade
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from api.config.models import Course, Grade, User
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Datetimes are returned as they are: the app's JSON provider (FastJSONProvider)
+# encodes them as ISO 8601 strings.
+#
+# Debug messages pass their values as arguments, never pre-formatted, and list
+# serializers log once per list: with DEBUG disabled, serializing a row costs no
+# logging work at all.
+
+
+class FieldPlan:
+    """
+    The fields a model is serialized with, resolved once at import time.
+
+    A whole object is read with a single attrgetter call and zipped with the field
+    names, so serializing a row runs no per-field Python code. Rows of a query
+    selecting `columns` (in that order) are serialized the same way, without an
+    ORM object being built for them.
+
+    Attributes:
+        model: The mapped class.
+        fields (Tuple[str, ...]): The attribute names, which are also the output keys.
+        columns (Tuple[Any, ...]): The matching column attributes, for Core/column queries.
+    """
+
+    def __init__(self, model: Any, fields: Sequence[str], columns: bool = True) -> None:
+        self.model = model
+        self.fields = tuple(fields)
+        self.columns = tuple(getattr(model, field) for field in self.fields) if columns else ()
+        self._values = attrgetter(*self.fields)
+
+    def one(self, obj: Any) -> Dict[str, Any]:
+        """Serializes a single object."""
+        return dict(zip(self.fields, self._values(obj)))
+
+    def many(self, objs: Iterable[Any]) -> List[Dict[str, Any]]:
+        """Serializes objects."""
+        fields, values = self.fields, self._values
+        return [dict(zip(fields, values(obj))) for obj in objs]
+
+    def rows(self, rows: Iterable[Sequence[Any]]) -> List[Dict[str, Any]]:
+        """Serializes the rows of a query selecting `columns`."""
+        fields = self.fields
+        return [dict(zip(fields, row)) for row in rows]
+
+
+COURSE_FIELDS = FieldPlan(Course, ('id', 'name', 'professor_id', 'created_at', 'updated_at'))
+GRADE_FIELDS = FieldPlan(Grade, ('id', 'course_id', 'student_id', 'grade', 'name', 'created_at', 'updated_at'))
+# name and email are properties over the encrypted columns: users are always
+# serialized from objects, which UserService loads with batch decryption.
+USER_FIELDS = FieldPlan(User, ('id', 'name', 'email', 'role', 'created_at', 'updated_at'), columns=False)
+
 
 def serialize_course(course: Course) -> Dict[str, Any]:
     """
@@ -15,22 +66,41 @@ def serialize_course(course: Course) -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: A dictionary representation of the course.
     """
-    logger.debug(f"Serializing course ID: {course.id}")
-    course_data = {
-        'id': course.id,
-        'name': course.name,
-        'professor_id': course.professor_id,
-        'created_at': course.created_at.isoformat(),
-        'updated_at': course.updated_at.isoformat()
-    }
-    logger.debug(f"Course serialized: {course_data}")
-    return course_data
+    logger.debug("Serializing course ID: %s", course.id)
+    return COURSE_FIELDS.one(course)
 
 
-logger = logging.getLogger(__name__)
+def serialize_courses(courses: Iterable[Course]) -> List[Dict[str, Any]]:
+    """
+    Serializes Course objects into dictionaries for API responses.
 
+    Args:
+        courses (Iterable[Course]): The Course objects to serialize.
+
+    Returns:
+        List[Dict[str, Any]]: The dictionary representations, in order.
+    """
+    courses_data = COURSE_FIELDS.many(courses)
+    logger.debug("Serialized %d courses.", len(courses_data))
+    return courses_data
+
+
+def serialize_course_rows(rows: Iterable[Sequence[Any]]) -> List[Dict[str, Any]]:
+    """
+    Serializes the rows of a query selecting COURSE_FIELDS.columns.
 
-def serialize_user(user):
+    Args:
+        rows (Iterable[Sequence[Any]]): The rows to serialize.
+
+    Returns:
+        List[Dict[str, Any]]: The same dictionaries serialize_course() returns.
+    """
+    courses_data = COURSE_FIELDS.rows(rows)
+    logger.debug("Serialized %d course rows.", len(courses_data))
+    return courses_data
+
+
+def serialize_user(user: Optional[User]) -> Optional[Dict[str, Any]]:
     """
     Serialize a User object into a dictionary.
     Returns None if the user is None.
@@ -38,48 +108,68 @@ def serialize_user(user):
     if user is None:
         return None
 
-    serialized = {
-        "id": str(user.id),
-        "name": user.name,
-        "email": user.email,
-        "role": user.role,
-        "created_at": user.created_at.isoformat() if hasattr(user, "created_at") and user.created_at else None,
-        "updated_at": user.updated_at.isoformat() if hasattr(user, "updated_at") and user.updated_at else None,
-    }
-
-    if hasattr(user, "courses_enrolled"):
-        serialized["courses_enrolled"] = [
-            serialize_course(course) for course in user.courses_enrolled
-        ]
-    elif hasattr(user, "courses_teaching"):
-        serialized["courses_teaching"] = [
-            serialize_course(course) for course in user.courses_teaching
-        ]
-    else:
-        serialized["courses_enrolled"] = []
-
-    logger.debug(f"User serialized: {serialized}")
+    serialized = USER_FIELDS.one(user)
+    serialized["courses_enrolled"] = []
+    logger.debug("Serialized user ID: %s", user.id)
     return serialized
 
 
+def serialize_users(users: Iterable[User]) -> List[Dict[str, Any]]:
+    """
+    Serializes User objects into dictionaries for API responses.
+
+    Args:
+        users (Iterable[User]): The User objects to serialize, with name and email loaded.
+
+    Returns:
+        List[Dict[str, Any]]: The dictionary representations, in order.
+    """
+    users_data = USER_FIELDS.many(users)
+    for serialized in users_data:
+        serialized["courses_enrolled"] = []
+    logger.debug("Serialized %d users.", len(users_data))
+    return users_data
+
+
 def serialize_grade(grade: Grade) -> Dict[str, Any]:
     """
     Serializes a Grade object into a dictionary for API responses.
+
     Args:
         grade (Grade): The Grade object to serialize.
 
     Returns:
         Dict[str, Any]: A dictionary representation of the grade.
-            """
-    logger.debug(f"Serializing grade ID: {grade.id}")
-    grade_data = {
-        'id': grade.id,
-        'course_id': grade.course_id,
-        'student_id': grade.student_id,
-        'grade': grade.grade,
-        'name': grade.name,
-        'created_at': grade.created_at.isoformat(),
-        'updated_at': grade.updated_at.isoformat()
-    }
-    logger.debug(f"Grade serialized: {grade_data}")
-    return grade_data
+    """
+    logger.debug("Serializing grade ID: %s", grade.id)
+    return GRADE_FIELDS.one(grade)
+
+
+def serialize_grades(grades: Iterable[Grade]) -> List[Dict[str, Any]]:
+    """
+    Serializes Grade objects into dictionaries for API responses.
+
+    Args:
+        grades (Iterable[Grade]): The Grade objects to serialize.
+
+    Returns:
+        List[Dict[str, Any]]: The dictionary representations, in order.
+    """
+    grades_data = GRADE_FIELDS.many(grades)
+    logger.debug("Serialized %d grades.", len(grades_data))
+    return grades_data
+
+
+def serialize_grade_rows(rows: Iterable[Sequence[Any]]) -> List[Dict[str, Any]]:
+    """
+    Serializes the rows of a query selecting GRADE_FIELDS.columns.
+
+    Args:
+        rows (Iterable[Sequence[Any]]): The rows to serialize.
+
+    Returns:
+        List[Dict[str, Any]]: The same dictionaries serialize_grade() returns.
+    """
+    grades_data = GRADE_FIELDS.rows(rows)
+    logger.debug("Serialized %d grade rows.", len(grades_data))
+    return grades_data
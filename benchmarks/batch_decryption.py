@@ -0,0 +1,54 @@
+"""
+Time to load and decrypt user listings of various sizes, decrypting on the request
+thread (1 worker) or on the decryption thread pool. The decrypted value cache is
+cleared before every run so each value is really decrypted.
+
+    python -m benchmarks.batch_decryption --sizes 1000 10000 --workers 1 2 4 8
+"""
+import argparse
+
+from flask import current_app
+
+from api import db
+from api.config.models import User, decryption_cache
+from api.services.user_service import UserService
+from benchmarks.common import create_benchmark_app, timed
+
+
+def seed(users: int) -> None:
+    db.session.add_all(
+        User(name=f"User {i}", email=f"user{i}@example.com", role="Student", password_hash="x")
+        for i in range(users)
+    )
+    db.session.commit()
+
+
+def load(size: int):
+    decryption_cache.clear()
+    db.session.expunge_all()
+    return UserService.load_decrypted(db.session.query(User).limit(size))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    app = create_benchmark_app({"DECRYPTION_PARALLEL_MIN_ROWS": 1})
+    with app.app_context():
+        seed(max(args.sizes))
+
+        print(f"{'users':>8}" + "".join(f"{f'{w} worker(s)':>14}" for w in args.workers) + "   (best ms)")
+        for size in args.sizes:
+            timings = []
+            for workers in args.workers:
+                current_app.config["DECRYPTION_WORKERS"] = workers
+                best, _ = timed(lambda: load(size), repeat=args.repeat)
+                timings.append(best)
+            print(f"{size:>8}" + "".join(f"{best * 1000:>14.1f}" for best in timings))
+
+
+if __name__ == "__main__":
+    main()
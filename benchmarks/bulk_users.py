@@ -0,0 +1,44 @@
+"""
+Bulk user provisioning throughput for several password hashing pool sizes.
+
+Each run creates --users new accounts through UserService.bulk_create_users. The
+worker processes are started before timing, so the numbers reflect steady-state
+throughput rather than process start-up.
+
+    python -m benchmarks.bulk_users --users 500 --workers 1 2 4 8
+"""
+import argparse
+import os
+import time
+
+from api.services.user_service import UserService
+from api.utils.password_hashing import hash_passwords
+from benchmarks.common import create_benchmark_app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    app = create_benchmark_app()
+    with app.app_context():
+        print(f"{args.users} users per run, {os.cpu_count()} CPU(s)")
+        print(f"{'workers':>8}{'seconds':>10}{'users/s':>10}")
+        for workers in args.workers:
+            hash_passwords(["warm-up"] * workers * 2, workers)
+            rows = [
+                {"name": f"User {i}", "email": f"w{workers}-user{i}@example.com",
+                 "password": "ValidPass123!", "role": "Student"}
+                for i in range(args.users)
+            ]
+            start = time.perf_counter()
+            results = UserService.bulk_create_users(rows, workers)
+            elapsed = time.perf_counter() - start
+            assert all(result["status"] == "created" for result in results)
+            print(f"{workers:>8}{elapsed:>10.2f}{args.users / elapsed:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from flask import Flask
+
+from api import create_app
+
+
+def create_benchmark_app(config: Optional[Dict[str, Any]] = None) -> Flask:
+    """
+    Creates an application backed by an in-memory SQLite database with the schema created.
+
+    Args:
+        config (Optional[Dict[str, Any]]): Extra configuration values.
+
+    Returns:
+        Flask: The configured application.
+    """
+    from api import db
+
+    app = create_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+        "LOG_LEVEL": "WARNING",
+        **(config or {}),
+    })
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def timed(func: Callable[[], Any], repeat: int = 5) -> Tuple[float, Any]:
+    """
+    Runs func `repeat` times and returns the best wall-clock time in seconds with the
+    last result.
+    """
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
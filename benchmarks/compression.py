@@ -0,0 +1,77 @@
+"""
+CPU cost of compressing the large JSON listings against the bytes saved.
+
+Fetches the uncompressed bodies of list_users, list_grades and
+list_students_in_course, then compresses each one with every available content
+coding and level, as the compression middleware would.
+
+    python -m benchmarks.compression --users 1000 --grades 1000
+"""
+import argparse
+from typing import Tuple
+
+from api import db
+from api.config.models import Course, Enrollment, Grade, User
+from api.middlewares.compression_middleware import brotli, compress
+from api.services.auth_service import AuthService
+from benchmarks.common import create_benchmark_app, timed
+
+GZIP_LEVELS = (1, 6, 9)
+BROTLI_QUALITIES = (1, 4, 6, 11)
+
+
+def seed(users: int, grades: int) -> Tuple[str, str]:
+    admin = User(name="admin", email="admin@example.com", role="Administrator", password_hash="x")
+    professor = User(name="professor", email="professor@example.com", role="Professor", password_hash="x")
+    students = [User(name=f"Student {i}", email=f"student{i}@example.com", role="Student", password_hash="x")
+                for i in range(users)]
+    db.session.add_all([admin, professor, *students])
+    db.session.flush()
+    course = Course(name="Benchmark Course", professor_id=professor.id)
+    db.session.add(course)
+    db.session.flush()
+    db.session.add_all(Enrollment(student_id=student.id, course_id=course.id) for student in students)
+    db.session.add_all(
+        Grade(name=f"Exam {i % 5}", grade=float(i % 20), course_id=course.id, student_id=students[i % users].id)
+        for i in range(grades)
+    )
+    db.session.commit()
+    return admin.id, course.id
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--grades", type=int, default=1000)
+    args = parser.parse_args()
+
+    app = create_benchmark_app()
+    with app.app_context():
+        admin_id, course_id = seed(args.users, args.grades)
+        token = AuthService.issue_access_token(db.session.get(User, admin_id))
+        client = app.test_client()
+        headers = {"Authorization": f"Bearer {token}", "Accept-Encoding": "identity"}
+        bodies = {
+            "list_users": client.get("/api/v1/users/", headers=headers).data,
+            "list_grades": client.get("/api/v1/grades/?limit=1000", headers=headers).data,
+            "list_students": client.get(f"/api/v1/courses/{course_id}/students", headers=headers).data,
+        }
+
+        settings = [("gzip", level) for level in GZIP_LEVELS]
+        if brotli is not None:
+            settings += [("br", quality) for quality in BROTLI_QUALITIES]
+        else:
+            print("brotli is not installed: gzip only")
+
+        print(f"{'endpoint':<15}{'coding':<9}{'bytes':>10}{'ratio':>8}{'ms':>9}{'MB/s':>8}")
+        for endpoint, body in bodies.items():
+            print(f"{endpoint:<15}{'identity':<9}{len(body):>10}")
+            for encoding, level in settings:
+                config = {**app.config, "COMPRESSION_LEVEL": level, "COMPRESSION_BROTLI_QUALITY": level}
+                seconds, compressed = timed(lambda: compress(body, encoding, config))
+                print(f"{'':<15}{f'{encoding}-{level}':<9}{len(compressed):>10}"
+                      f"{len(body) / len(compressed):>8.1f}{seconds * 1000:>9.2f}{len(body) / seconds / 1e6:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Encoding and decoding time of the JSON provider with orjson and with the json
+module, on a list_grades-sized payload.
+
+Compares Flask's default provider fed pre-formatted dates (the former path, with
+isoformat() in the serializers) with FastJSONProvider fed datetime objects.
+
+    python -m benchmarks.json_provider --grades 1000
+"""
+import argparse
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from flask.json.provider import DefaultJSONProvider
+
+from api.utils.json_provider import FastJSONProvider, orjson
+from benchmarks.common import create_benchmark_app, timed
+
+
+def grades(count: int):
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return {"grades": [
+        {
+            "id": str(uuid.uuid4()),
+            "course_id": str(uuid.uuid4()),
+            "student_id": str(uuid.uuid4()),
+            "grade": float(i % 20),
+            "name": f"Exam {i % 5}",
+            "created_at": start + timedelta(minutes=i),
+            "updated_at": start + timedelta(minutes=i),
+        }
+        for i in range(count)
+    ]}
+
+
+def with_iso_dates(payload):
+    # What the serializers used to do for every grade.
+    return {"grades": [
+        {**row, "created_at": row["created_at"].isoformat(), "updated_at": row["updated_at"].isoformat()}
+        for row in payload["grades"]
+    ]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--grades", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    app = create_benchmark_app()
+    with app.app_context():
+        default = DefaultJSONProvider(app)
+        stdlib = FastJSONProvider(app)
+        stdlib.use_orjson = False
+        providers = [("flask default", default, True), ("fast (json)", stdlib, False)]
+        if orjson is not None:
+            providers.append(("fast (orjson)", FastJSONProvider(app), False))
+        else:
+            print("orjson is not installed: json module only")
+
+        print(f"{args.grades} grades, best of {args.repeat}")
+        print(f"{'provider':<16}{'response ms':>13}{'loads ms':>10}")
+        payload = grades(args.grades)
+        for label, provider, iso in providers:
+            encode_seconds, response = timed(
+                lambda: provider.response(with_iso_dates(payload) if iso else payload), args.repeat
+            )
+            body = response.get_data()
+            decode_seconds, _ = timed(lambda: provider.loads(body), args.repeat)
+            print(f"{label:<16}{encode_seconds * 1000:>13.2f}{decode_seconds * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Serialization time of grades and courses at 1k and 100k rows.
+
+Compares the former per-field serializers (with their eager f-string debug
+logging) with the compiled field plans, fed ORM objects or the rows of a column
+query. Loading is timed separately from serialization.
+
+    python -m benchmarks.serializers --rows 1000 100000
+"""
+import argparse
+import logging
+
+from api import db
+from api.config.models import Course, Grade, User
+from api.utils.serializer import COURSE_FIELDS, GRADE_FIELDS, serialize_course_rows, serialize_courses, \
+    serialize_grade_rows, serialize_grades
+from benchmarks.common import create_benchmark_app, timed
+
+logger = logging.getLogger("api.utils.serializer")
+
+
+def legacy_serialize_grade(grade):
+    # The former serializer, field by field, formatting its debug messages eagerly.
+    logger.debug(f"Serializing grade ID: {grade.id}")
+    grade_data = {
+        'id': grade.id,
+        'course_id': grade.course_id,
+        'student_id': grade.student_id,
+        'grade': grade.grade,
+        'name': grade.name,
+        'created_at': grade.created_at,
+        'updated_at': grade.updated_at
+    }
+    logger.debug(f"Grade serialized: {grade_data}")
+    return grade_data
+
+
+def legacy_serialize_course(course):
+    logger.debug(f"Serializing course ID: {course.id}")
+    course_data = {
+        'id': course.id,
+        'name': course.name,
+        'professor_id': course.professor_id,
+        'created_at': course.created_at,
+        'updated_at': course.updated_at
+    }
+    logger.debug(f"Course serialized: {course_data}")
+    return course_data
+
+
+def seed(rows: int) -> None:
+    professor = User(name="professor", email="professor@example.com", role="Professor", password_hash="x")
+    student = User(name="student", email="student@example.com", role="Student", password_hash="x")
+    db.session.add_all([professor, student])
+    db.session.flush()
+    db.session.bulk_insert_mappings(Course, [
+        {"name": f"Course {i}", "professor_id": professor.id} for i in range(rows)
+    ])
+    course_id = db.session.query(Course.id).limit(1).scalar()
+    db.session.bulk_insert_mappings(Grade, [
+        {"name": f"Exam {i % 5}", "grade": float(i % 20), "course_id": course_id, "student_id": student.id}
+        for i in range(rows)
+    ])
+    db.session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"best of {args.repeat}, DEBUG logging disabled")
+    print(f"{'model':<8}{'rows':>8}  {'path':<25}{'load ms':>10}{'serialize ms':>14}{'us/row':>9}")
+    for rows in args.rows:
+        app = create_benchmark_app()
+        with app.app_context():
+            seed(rows)
+            for label, model, plan, legacy, many, from_rows in (
+                ("grade", Grade, GRADE_FIELDS, legacy_serialize_grade, serialize_grades, serialize_grade_rows),
+                ("course", Course, COURSE_FIELDS, legacy_serialize_course, serialize_courses, serialize_course_rows),
+            ):
+                def load_objects():
+                    db.session.expunge_all()
+                    return db.session.query(model).all()
+
+                object_load, objects = timed(load_objects, args.repeat)
+                row_load, row_list = timed(lambda: db.session.query(*plan.columns).all(), args.repeat)
+                for path, load, func in (
+                    ("objects, per field", object_load, lambda: [legacy(obj) for obj in objects]),
+                    ("objects, field plan", object_load, lambda: many(objects)),
+                    ("column rows, field plan", row_load, lambda: from_rows(row_list)),
+                ):
+                    seconds, _ = timed(func, args.repeat)
+                    print(f"{label:<8}{rows:>8}  {path:<25}{load * 1000:>10.1f}{seconds * 1000:>14.1f}"
+                          f"{seconds / rows * 1e6:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+CPU cost of renewing access tokens by logging in again versus at /auth/refresh.
+
+Each of --clients users renews its access token --rounds times, either by posting
+its credentials to /auth/login (one password hash verification each time) or by
+exchanging its current refresh token at /auth/refresh (one HMAC verification and
+the token rotation queries). CPU time is the process time of all threads, so it
+includes the password hashing executor.
+
+    python -m benchmarks.token_refresh --clients 20 --rounds 10
+"""
+import argparse
+import time
+from typing import Callable, Dict, List, Tuple
+
+from flask.testing import FlaskClient
+
+from api.services.user_service import UserService
+from benchmarks.common import create_benchmark_app
+
+PASSWORD = "ValidPass123!"
+
+
+def renew_by_login(client: FlaskClient, email: str, tokens: Dict[str, str]) -> Dict[str, str]:
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": PASSWORD})
+    assert response.status_code == 200, response.json
+    return response.json
+
+
+def renew_by_refresh(client: FlaskClient, email: str, tokens: Dict[str, str]) -> Dict[str, str]:
+    headers = {"Authorization": f"Bearer {tokens['refresh_token']}"}
+    response = client.post("/api/v1/auth/refresh", headers=headers)
+    assert response.status_code == 200, response.json
+    return response.json
+
+
+def run(client: FlaskClient, emails: List[str], rounds: int,
+        renew: Callable[[FlaskClient, str, Dict[str, str]], Dict[str, str]]) -> Tuple[float, float]:
+    sessions = {email: renew_by_login(client, email, {}) for email in emails}
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    for _ in range(rounds):
+        for email in emails:
+            sessions[email] = renew(client, email, sessions[email])
+    return time.process_time() - cpu_start, time.perf_counter() - wall_start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--hash-method", default=None,
+                        help="PASSWORD_HASH_METHOD of the accounts (defaults to the configured one).")
+    args = parser.parse_args()
+
+    config = {"PASSWORD_HASH_METHOD": args.hash_method} if args.hash_method else {}
+    app = create_benchmark_app(config)
+    with app.app_context():
+        emails = [f"client{i}@example.com" for i in range(args.clients)]
+        for i, email in enumerate(emails):
+            UserService.create_user(name=f"Client {i}", email=email, password=PASSWORD, role="Student")
+
+        renewals = args.clients * args.rounds
+        print(f"{args.clients} clients x {args.rounds} renewals, {app.config['PASSWORD_HASH_METHOD']}")
+        print(f"{'renewal':<10}{'CPU s':>10}{'CPU ms/renewal':>16}{'renewals/s':>12}")
+        client = app.test_client()
+        results = {}
+        for label, renew in (("login", renew_by_login), ("refresh", renew_by_refresh)):
+            cpu, wall = run(client, emails, args.rounds, renew)
+            results[label] = cpu
+            print(f"{label:<10}{cpu:>10.2f}{cpu / renewals * 1000:>16.2f}{renewals / wall:>12.0f}")
+        print(f"CPU saved by refreshing: {1 - results['refresh'] / results['login']:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Rows fetched per request when loading the calling user.
+
+Compares the former mapping (courses_created, enrollments and grades all
+lazy='joined') with the identity-only load used for authorization checks and the
+opt-in selectinload profile.
+
+    python -m benchmarks.user_loading --grades 500 --enrollments 20
+"""
+import argparse
+from contextlib import contextmanager
+from typing import Iterator, List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import joinedload
+
+from api import db
+from api.config.models import Course, Enrollment, Grade, User
+from api.services.user_service import UserService
+from benchmarks.common import create_benchmark_app
+
+
+@contextmanager
+def captured_statements() -> Iterator[List[Tuple[str, object]]]:
+    statements: List[Tuple[str, object]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(db.engine, "after_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "after_cursor_execute", record)
+
+
+def rows_fetched(statements: List[Tuple[str, object]]) -> int:
+    # Replays the captured SELECTs to count the raw rows the database returned.
+    with db.engine.connect() as connection:
+        return sum(len(connection.exec_driver_sql(sql, params).fetchall()) for sql, params in statements)
+
+
+def seed(grades: int, enrollments: int) -> str:
+    professor = User(name="professor", email="professor@example.com", role="Professor", password_hash="x")
+    student = User(name="student", email="student@example.com", role="Student", password_hash="x")
+    db.session.add_all([professor, student])
+    db.session.flush()
+
+    courses = [Course(name=f"Course {i}", professor_id=professor.id) for i in range(enrollments)]
+    db.session.add_all(courses)
+    db.session.flush()
+    db.session.add_all(Enrollment(student_id=student.id, course_id=course.id) for course in courses)
+    db.session.add_all(
+        Grade(name=f"Exam {i}", grade=10.0, course_id=courses[i % enrollments].id, student_id=student.id)
+        for i in range(grades)
+    )
+    db.session.commit()
+    return student.id
+
+
+def former_joined_load(user_id: str):
+    return db.session.get(User, user_id, options=[
+        joinedload(User.courses_created),
+        joinedload(User.enrollments),
+        joinedload(User.grades),
+    ])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--grades", type=int, default=500)
+    parser.add_argument("--enrollments", type=int, default=20)
+    args = parser.parse_args()
+
+    app = create_benchmark_app()
+    with app.app_context():
+        student_id = seed(args.grades, args.enrollments)
+        profiles = [
+            ("joined (before)", former_joined_load),
+            ("identity (after)", UserService.get_user_identity),
+            ("selectinload (opt-in)", UserService.get_user_with_relationships),
+        ]
+
+        print(f"Student with {args.grades} grades and {args.enrollments} enrollments")
+        print(f"{'profile':<24}{'queries':>10}{'rows fetched':>15}")
+        for label, load in profiles:
+            db.session.expunge_all()
+            with captured_statements() as statements:
+                user = load(student_id)
+                user.role
+            print(f"{label:<24}{len(statements):>10}{rows_fetched(statements):>15}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Time spent loading and serializing every user, with and without the decrypted
+value cache of the encrypted name and email columns.
+
+    python -m benchmarks.user_serialization --users 2000
+"""
+import argparse
+
+from api import db
+from api.config.models import User, decryption_cache
+from api.utils.serializer import serialize_user
+from benchmarks.common import create_benchmark_app, timed
+
+
+def seed(users: int) -> None:
+    db.session.add_all(
+        User(name=f"User {i}", email=f"user{i}@example.com", role="Student", password_hash="x")
+        for i in range(users)
+    )
+    db.session.commit()
+
+
+def list_users():
+    db.session.expunge_all()
+    return [serialize_user(user) for user in db.session.query(User).all()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=2000)
+    args = parser.parse_args()
+
+    app = create_benchmark_app()
+    with app.app_context():
+        seed(args.users)
+
+        def uncached():
+            decryption_cache.clear()
+            return list_users()
+
+        cold, _ = timed(uncached)
+        decryption_cache.clear()
+        list_users()
+        warm, _ = timed(list_users)
+
+        print(f"{args.users} users, name and email encrypted")
+        print(f"{'decryption cache':<20}{'best (ms)':>12}")
+        print(f"{'cold':<20}{cold * 1000:>12.1f}")
+        print(f"{'warm':<20}{warm * 1000:>12.1f}")
+        print(f"cache: {decryption_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -297,6 +297,7 @@ const AdminView: React.FC = () => {
 
   // Grades state (for admin)
   const [adminGrades, setAdminGrades] = useState<Grade[]>([]);
+  const [adminGradesAfter, setAdminGradesAfter] = useState<string | null>(null);
   const [loadingGrades, setLoadingGrades] = useState(false);
   const [errorGrades, setErrorGrades] = useState<string | null>(null);
 
@@ -341,12 +342,14 @@ const AdminView: React.FC = () => {
     }
   }, []);
 
-  const loadAdminGrades = useCallback(async () => {
-    setLoadingGrades(true);
+  // Loads the first page of grades, or the page after the given cursor.
+  const loadAdminGrades = useCallback(async (after: string | null = null) => {
+    if (!after) setLoadingGrades(true);
     setErrorGrades(null);
     try {
-      const res = await fetchGrades();
-      setAdminGrades(Array.isArray(res.grades) ? res.grades : []);
+      const page = await fetchGrades({}, after);
+      setAdminGrades((prev) => (after ? [...prev, ...page.grades] : page.grades));
+      setAdminGradesAfter(page.pagination.next_after);
     } catch (err) {
       setErrorGrades(getErrorMessage(err));
     } finally {
@@ -695,6 +698,14 @@ const AdminView: React.FC = () => {
                   })}
                 </tbody>
               </table>
+              {adminGradesAfter && (
+                <button
+                  onClick={() => loadAdminGrades(adminGradesAfter)}
+                  className="mt-4 bg-gray-200 hover:bg-gray-300 px-4 py-2 rounded"
+                >
+                  Load more grades
+                </button>
+              )}
             </div>
           )}
         </div>
@@ -895,6 +906,9 @@ const ProfessorView: React.FC = () => {
 
   // Grade management state
   const [courseGrades, setCourseGrades] = useState<Grade[]>([]);
+  // Course whose grades are loaded, and the cursor of their next page.
+  const [gradesCourseId, setGradesCourseId] = useState<string | null>(null);
+  const [courseGradesAfter, setCourseGradesAfter] = useState<string | null>(null);
   const [isGradeModalOpen, setGradeModalOpen] = useState(false);
   const [selectedStudent, setSelectedStudent] = useState<User | null>(null);
   const [selectedGrade, setSelectedGrade] = useState<Grade | undefined>(undefined);
@@ -912,10 +926,12 @@ const ProfessorView: React.FC = () => {
     }
   };
 
-  const loadCourseGrades = async (courseId: string) => {
+  const loadCourseGrades = async (courseId: string, after: string | null = null) => {
     try {
-      const res = await fetchGrades();
-      setCourseGrades(Array.isArray(res.grades) ? res.grades.filter((g) => g.course_id === courseId) : []);
+      const page = await fetchGrades({ course_id: courseId }, after);
+      setCourseGrades((prev) => (after ? [...prev, ...page.grades] : page.grades));
+      setGradesCourseId(courseId);
+      setCourseGradesAfter(page.pagination.next_after);
     } catch (err) {
       alert(getErrorMessage(err));
     }
@@ -1032,6 +1048,14 @@ const ProfessorView: React.FC = () => {
                       })}
                     </tbody>
                   </table>
+                  {gradesCourseId === course.id && courseGradesAfter && (
+                    <button
+                      onClick={() => loadCourseGrades(course.id, courseGradesAfter)}
+                      className="mt-2 bg-gray-200 hover:bg-gray-300 px-3 py-1 rounded"
+                    >
+                      Load more grades
+                    </button>
+                  )}
                 </div>
               ) : (
                 <p>No students enrolled in this course.</p>
@@ -1062,6 +1086,7 @@ const StudentView: React.FC = () => {
   const { user } = useAuth();
   const [courses, setCourses] = useState<ExtendedCourse[]>([]);
   const [grades, setGrades] = useState<Grade[]>([]);
+  const [gradesAfter, setGradesAfter] = useState<string | null>(null);
   const [loadingCourses, setLoadingCourses] = useState(false);
   const [errorCourses, setErrorCourses] = useState<string | null>(null);
   const [loadingGrades, setLoadingGrades] = useState(false);
@@ -1080,16 +1105,13 @@ const StudentView: React.FC = () => {
     }
   };
 
-  const loadGrades = async () => {
-    setLoadingGrades(true);
+  const loadGrades = async (after: string | null = null) => {
+    if (!after) setLoadingGrades(true);
     setErrorGrades(null);
     try {
-      const res = await fetchGrades();
-      setGrades(
-        Array.isArray(res.grades)
-          ? res.grades.filter((g) => g.student_id === user.id)
-          : []
-      );
+      const page = await fetchGrades({ student_id: user.id }, after);
+      setGrades((prev) => (after ? [...prev, ...page.grades] : page.grades));
+      setGradesAfter(page.pagination.next_after);
     } catch (err) {
       setErrorGrades(getErrorMessage(err));
     } finally {
@@ -1100,7 +1122,7 @@ const StudentView: React.FC = () => {
   useEffect(() => {
     loadCourses();
     loadGrades();
-  });
+  }, []);
 
   const handleJoinCourse = async (courseId: string) => {
     try {
@@ -1171,6 +1193,14 @@ const StudentView: React.FC = () => {
             ))}
           </ul>
         )}
+        {gradesAfter && (
+          <button
+            onClick={() => loadGrades(gradesAfter)}
+            className="mt-2 bg-gray-200 hover:bg-gray-300 px-4 py-2 rounded"
+          >
+            Load more grades
+          </button>
+        )}
       </div>
     </div>
   );
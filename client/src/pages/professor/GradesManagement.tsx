@@ -4,15 +4,23 @@ import { Grade } from "../../types";
 
 const GradesManagement = () => {
   const [grades, setGrades] = useState<Grade[]>([]);
+  const [courseFilter, setCourseFilter] = useState<string>("");
+  const [nextAfter, setNextAfter] = useState<string | null>(null);
   const [newGrade, setNewGrade] = useState<number | null>(null);
   const [selectedGradeId, setSelectedGradeId] = useState<string | null>(null);
   const [newStudentId, setNewStudentId] = useState<string>("");
   const [newCourseId, setNewCourseId] = useState<string>("");
   const [newGradeName, setNewGradeName] = useState<string>("");
 
+  const loadGrades = async (after: string | null = null) => {
+    const page = await fetchGrades(courseFilter ? { course_id: courseFilter } : {}, after);
+    setGrades((prev) => (after ? [...prev, ...page.grades] : page.grades));
+    setNextAfter(page.pagination.next_after);
+  };
+
   useEffect(() => {
-    fetchGrades().then((data) => setGrades(data.grades));
-  }, []);
+    loadGrades();
+  }, [courseFilter]);
 
   const handleUpdateGrade = async () => {
     if (selectedGradeId && newGrade !== null) {
@@ -56,6 +64,7 @@ const GradesManagement = () => {
 
       {/* Liste des notes existantes */}
       <h2 className="text-xl font-bold mt-6">Existing Grades</h2>
+      <input type="text" placeholder="Filter by Course ID" value={courseFilter} onChange={(e) => setCourseFilter(e.target.value.trim())} className="border p-2 w-full mt-2" />
       <ul>
         {grades.map((grade) => (
           <li key={grade.id} className="p-2 border-b">
@@ -64,6 +73,9 @@ const GradesManagement = () => {
           </li>
         ))}
       </ul>
+      {nextAfter && (
+        <button onClick={() => loadGrades(nextAfter)} className="mt-2 bg-gray-200 p-2 rounded w-full">Load more</button>
+      )}
 
       {/* Formulaire de modification de note */}
       {selectedGradeId && (
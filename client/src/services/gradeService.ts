@@ -1,8 +1,16 @@
 import { api } from "./api";
 import { Grade } from "../types";
 
-export const fetchGrades = async (): Promise<{ grades: Grade[] }> => {
-  const response = await api.get<{ grades: Grade[] }>("/grades");
+export type GradeFilters = { course_id?: string; student_id?: string; name?: string };
+
+export type GradePage = { grades: Grade[]; pagination: { limit: number; has_more: boolean; next_after: string | null } };
+
+/**
+ * Fetches one page of the grades matching the given filters. Pass the previous
+ * page's `pagination.next_after` as `after` to get the next one.
+ */
+export const fetchGrades = async (filters: GradeFilters = {}, after: string | null = null): Promise<GradePage> => {
+  const response = await api.get<GradePage>("/grades", { params: { ...filters, after: after ?? undefined } });
   return response.data;
 };
 
@@ -97,6 +97,7 @@ def test_login_success(client):
     response = client.post("/api/v1/auth/login", json=payload)
     assert response.status_code == 200
     assert "access_token" in response.json
+    assert "refresh_token" in response.json
     assert "user" in response.json
 
 
@@ -148,3 +149,253 @@ def test_change_password_success(client):
     }
     revert_response = client.post("/api/v1/auth/change-password", json=revert_payload)
     assert revert_response.status_code == 200
+
+
+def test_login_rejected_when_hashing_queue_full(app, client):
+    import threading
+
+    from api.utils.password_hashing import EXECUTOR_EXTENSION_KEY, BoundedHashingExecutor
+
+    executor = app.extensions[EXECUTOR_EXTENSION_KEY] = BoundedHashingExecutor(workers=1, max_queue=1)
+    release = threading.Event()
+    blocked = [executor.submit(release.wait) for _ in range(2)]
+
+    payload = {"email": "student@example.com", "password": "ValidPass123!"}
+    try:
+        response = client.post("/api/v1/auth/login", json=payload)
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        assert executor.stats()["rejected"] == 1
+    finally:
+        release.set()
+        for future in blocked:
+            future.result()
+
+    response = client.post("/api/v1/auth/login", json=payload)
+    assert response.status_code == 200
+    stats = executor.stats()
+    assert (stats["queued"], stats["running"], stats["completed"]) == (0, 0, 3)
+
+
+def test_password_writes_rejected_when_hashing_queue_full(app, client, admin_token, student_id):
+    import threading
+
+    from api.utils.password_hashing import EXECUTOR_EXTENSION_KEY, BoundedHashingExecutor
+
+    executor = app.extensions[EXECUTOR_EXTENSION_KEY] = BoundedHashingExecutor(workers=1, max_queue=1)
+    release = threading.Event()
+    blocked = [executor.submit(release.wait) for _ in range(2)]
+
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    new_user = {"name": "New User", "email": "new@example.com", "password": "ValidPass123!", "role": "Student"}
+    try:
+        responses = [
+            client.post("/api/v1/auth/register", json=new_user, headers=headers),
+            client.post("/api/v1/users/", json=new_user, headers=headers),
+            client.put(f"/api/v1/users/{student_id}", json={"password": "OtherPass123!"}, headers=headers),
+        ]
+        assert [response.status_code for response in responses] == [503, 503, 503]
+        assert all(response.headers["Retry-After"] == "1" for response in responses)
+        assert [next(iter(response.json)) for response in responses] == ["error", "msg", "msg"]
+        assert executor.stats()["rejected"] == 3
+    finally:
+        release.set()
+        for future in blocked:
+            future.result()
+
+
+def test_login_upgrades_outdated_password_hash(app, client):
+    from api.config.models import User
+    from api.utils.password_hashing import needs_rehash
+
+    assert not needs_rehash(User.query.filter_by(role="Student").first().password_hash, "scrypt")
+
+    app.config["PASSWORD_HASH_METHOD"] = "pbkdf2:sha256:1000"
+    payload = {"email": "student@example.com", "password": "ValidPass123!"}
+    assert client.post("/api/v1/auth/login", json=payload).status_code == 200
+
+    with app.app_context():
+        password_hash = User.query.filter_by(role="Student").first().password_hash
+    assert password_hash.startswith("pbkdf2:sha256:1000$")
+    assert client.post("/api/v1/auth/login", json=payload).status_code == 200
+    assert client.post("/api/v1/auth/login", json={**payload, "password": "Wrong123!"}).status_code == 401
+
+
+def test_calibrate_password_hashing(app):
+    app.config["PASSWORD_HASH_METHOD"] = "pbkdf2:sha256:1000"
+    result = app.test_cli_runner().invoke(
+        args=["passwords", "calibrate", "--algorithm", "pbkdf2", "--target-ms", "20", "--samples", "1"])
+
+    assert result.exit_code == 0, result.output
+    assert "Current: PASSWORD_HASH_METHOD=pbkdf2:sha256:1000 (" in result.output
+    assert "Suggested: PASSWORD_HASH_METHOD=pbkdf2:sha256:" in result.output
+
+
+def test_login_token_carries_role_and_version(client):
+    from flask_jwt_extended import decode_token
+
+    payload = {"email": "professor@example.com", "password": "ValidPass123!"}
+    response = client.post("/api/v1/auth/login", json=payload)
+
+    claims = decode_token(response.json["access_token"])
+    assert (claims["role"], claims["ver"]) == ("Professor", 0)
+
+
+def test_password_change_revokes_tokens(client, student_token):
+    headers = {"Authorization": f"Bearer {student_token}"}
+    assert client.get("/api/v1/courses/", headers=headers).status_code == 200
+
+    payload = {"email": "student@example.com", "password": "ValidPass123!", "new_password": "NewPass123!"}
+    assert client.post("/api/v1/auth/change-password", json=payload).status_code == 200
+
+    response = client.get("/api/v1/courses/", headers=headers)
+    assert response.status_code == 401
+    assert response.json["msg"] == "Token has been revoked."
+
+    login = client.post("/api/v1/auth/login", json={"email": "student@example.com", "password": "NewPass123!"})
+    headers = {"Authorization": f"Bearer {login.json['access_token']}"}
+    assert client.get("/api/v1/courses/", headers=headers).status_code == 200
+
+
+def test_role_change_revokes_tokens(app, client, student_token, student_id):
+    from api import db
+    from api.config.models import User
+
+    headers = {"Authorization": f"Bearer {student_token}"}
+    assert client.get("/api/v1/courses/", headers=headers).status_code == 200
+
+    user = db.session.get(User, student_id)
+    user.role = "Professor"
+    db.session.commit()
+    assert user.token_version == 1
+
+    assert client.get("/api/v1/courses/", headers=headers).status_code == 401
+
+
+def test_logout_revokes_only_that_token(app, client, student_token):
+    from api.services.auth_service import AuthService
+
+    login = client.post("/api/v1/auth/login", json={"email": "student@example.com", "password": "ValidPass123!"})
+    other_headers = {"Authorization": f"Bearer {login.json['access_token']}"}
+    headers = {"Authorization": f"Bearer {student_token}"}
+
+    assert client.post("/api/v1/auth/logout", headers=headers).status_code == 200
+    response = client.get("/api/v1/courses/", headers=headers)
+    assert response.status_code == 401
+    assert response.json["msg"] == "Token has been revoked."
+    assert client.get("/api/v1/courses/", headers=other_headers).status_code == 200
+
+    stats = AuthService.get_denylist().stats()
+    assert stats["items"] == 1
+    assert stats["filter_hits"] == 1 and stats["false_positives"] == 0
+
+
+def test_denylist_loads_tokens_revoked_elsewhere(app, client, student_token, student_id):
+    from datetime import datetime, timedelta, timezone
+
+    from flask_jwt_extended import decode_token
+
+    from api import db
+    from api.config.models import RevokedToken
+    from api.services.auth_service import AuthService
+
+    headers = {"Authorization": f"Bearer {student_token}"}
+    assert client.get("/api/v1/courses/", headers=headers).status_code == 200
+    denylist = AuthService.get_denylist()
+    denylist.refresh_interval = 3600
+    assert denylist.stats()["filter_hits"] == 0
+
+    # Revoked by another instance: only seen once this process refreshes its filter.
+    expires_at = datetime.now(timezone.utc) + timedelta(minutes=5)
+    db.session.add(RevokedToken(jti=decode_token(student_token)["jti"], user_id=student_id, expires_at=expires_at))
+    db.session.commit()
+    assert client.get("/api/v1/courses/", headers=headers).status_code == 200
+
+    assert denylist.refresh() == 1
+    assert client.get("/api/v1/courses/", headers=headers).status_code == 401
+
+
+def test_denylist_rebuild_keeps_tokens_revoked_meanwhile(app, monkeypatch, student_id):
+    from datetime import datetime, timedelta, timezone
+
+    from api import db
+    from api.services.token_denylist import TokenDenylist
+
+    denylist = TokenDenylist(capacity=100, error_rate=0.01, refresh_interval=3600)
+    expires_at = datetime.now(timezone.utc) + timedelta(minutes=5)
+    execute = db.session.execute
+
+    def revoke_after_loading(*args, **kwargs):
+        # A logout handled while the rebuild reads the table.
+        rows = execute(*args, **kwargs).all()
+        monkeypatch.undo()
+        denylist.revoke("revoked-during-rebuild", student_id, expires_at)
+        return rows
+
+    monkeypatch.setattr(db.session, "execute", revoke_after_loading)
+    denylist.refresh(rebuild=True)
+
+    assert denylist.is_revoked("revoked-during-rebuild")
+    assert not denylist.is_revoked("never-revoked")
+    stats = denylist.stats()
+    assert (stats["lookups"], stats["false_positives"], stats["observed_error_rate"]) == (2, 0, 0.0)
+
+
+def test_admin_signs_out_user(client, admin_token, student_token, student_id):
+    headers = {"Authorization": f"Bearer {student_token}"}
+    assert client.post(f"/api/v1/users/{student_id}/sign-out", headers=headers).status_code == 403
+
+    response = client.post(f"/api/v1/users/{student_id}/sign-out", headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 200
+    assert client.get("/api/v1/courses/", headers=headers).status_code == 401
+
+
+def _login(client, email="student@example.com", password="ValidPass123!"):
+    return client.post("/api/v1/auth/login", json={"email": email, "password": password}).json
+
+
+def test_refresh_rotates_tokens(client):
+    tokens = _login(client)
+    response = client.post("/api/v1/auth/refresh", headers={"Authorization": f"Bearer {tokens['refresh_token']}"})
+    assert response.status_code == 200
+    assert response.json["refresh_token"] != tokens["refresh_token"]
+
+    headers = {"Authorization": f"Bearer {response.json['access_token']}"}
+    assert client.get("/api/v1/courses/", headers=headers).status_code == 200
+
+    # Access tokens cannot be exchanged, nor refresh tokens used as access tokens.
+    assert client.post("/api/v1/auth/refresh", headers=headers).status_code == 422
+    headers = {"Authorization": f"Bearer {response.json['refresh_token']}"}
+    assert client.get("/api/v1/courses/", headers=headers).status_code == 422
+
+
+def test_refresh_token_reuse_revokes_family(client):
+    tokens = _login(client)
+    other = _login(client)
+    stolen = {"Authorization": f"Bearer {tokens['refresh_token']}"}
+    rotated = client.post("/api/v1/auth/refresh", headers=stolen).json
+
+    response = client.post("/api/v1/auth/refresh", headers=stolen)
+    assert response.status_code == 401
+    assert response.json["error"] == "Invalid refresh token"
+
+    headers = {"Authorization": f"Bearer {rotated['refresh_token']}"}
+    assert client.post("/api/v1/auth/refresh", headers=headers).status_code == 401
+    # Other logins of the same user are unaffected.
+    headers = {"Authorization": f"Bearer {other['refresh_token']}"}
+    assert client.post("/api/v1/auth/refresh", headers=headers).status_code == 200
+
+
+def test_refresh_rejected_after_password_change_or_logout(client):
+    tokens = _login(client)
+    client.post("/api/v1/auth/logout", headers={"Authorization": f"Bearer {tokens['access_token']}"})
+    headers = {"Authorization": f"Bearer {tokens['refresh_token']}"}
+    assert client.post("/api/v1/auth/refresh", headers=headers).status_code == 401
+
+    tokens = _login(client)
+    payload = {"email": "student@example.com", "password": "ValidPass123!", "new_password": "NewPass123!"}
+    assert client.post("/api/v1/auth/change-password", json=payload).status_code == 200
+    headers = {"Authorization": f"Bearer {tokens['refresh_token']}"}
+    response = client.post("/api/v1/auth/refresh", headers=headers)
+    assert response.status_code == 401
+    assert response.json["msg"] == "Token has been revoked."
@@ -0,0 +1,23 @@
+from api.utils.bloom import BloomFilter
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [f"token-{i}" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+    assert len(bloom) == 1000
+
+
+def test_bloom_filter_error_rate_close_to_target():
+    bloom = BloomFilter(capacity=5000, error_rate=0.01)
+    for i in range(5000):
+        bloom.add(f"revoked-{i}")
+
+    false_positives = sum(f"valid-{i}" in bloom for i in range(20000))
+    assert false_positives / 20000 < 0.02
+    stats = bloom.stats()
+    assert stats["num_hashes"] == 7
+    assert 0.005 < stats["estimated_error_rate"] < 0.015
@@ -0,0 +1,59 @@
+import gzip
+import json
+
+import pytest
+
+
+@pytest.fixture
+def small_threshold(app):
+    app.config["COMPRESSION_MIN_SIZE"] = 200
+
+
+def test_large_json_is_gzipped(client, admin_token, small_threshold):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    plain = client.get("/api/v1/users/", headers=headers)
+    assert "Content-Encoding" not in plain.headers
+    assert "Accept-Encoding" in plain.headers["Vary"]
+
+    response = client.get("/api/v1/users/", headers={**headers, "Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert int(response.headers["Content-Length"]) == len(response.data) < len(plain.data)
+    assert json.loads(gzip.decompress(response.data)) == plain.json
+
+
+def test_small_and_refused_responses_are_not_compressed(client, admin_token, app):
+    headers = {"Authorization": f"Bearer {admin_token}", "Accept-Encoding": "gzip"}
+    assert "Content-Encoding" not in client.get("/api/v1/users/", headers=headers).headers
+
+    app.config["COMPRESSION_MIN_SIZE"] = 200
+    headers["Accept-Encoding"] = "gzip;q=0, identity"
+    assert "Content-Encoding" not in client.get("/api/v1/users/", headers=headers).headers
+
+
+def test_streamed_response_is_compressed_incrementally(client, professor_token, course_id, student_id, monkeypatch):
+    from api.middlewares import compression_middleware
+
+    headers = {"Authorization": f"Bearer {professor_token}"}
+    body = "student_id,grade\n" + "".join(f"{student_id},{i % 20}\n" for i in range(300))
+    client.post(f"/api/v1/grades/import?course_id={course_id}&grade_name=Quiz",
+                data=body, headers={**headers, "Content-Type": "text/csv"})
+
+    plain = client.get("/api/v1/grades/?format=ndjson", headers=headers)
+    monkeypatch.setattr(compression_middleware, "STREAM_FLUSH_BYTES", 1024)
+    response = client.get("/api/v1/grades/?format=ndjson", headers={**headers, "Accept-Encoding": "gzip"},
+                          buffered=False)
+    chunks = list(response.response)
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    assert len(chunks) > 2
+    assert gzip.decompress(b"".join(chunks)) == plain.data
+
+
+def test_brotli_preferred_when_installed(client, admin_token, small_threshold):
+    brotli = pytest.importorskip("brotli")
+
+    headers = {"Authorization": f"Bearer {admin_token}", "Accept-Encoding": "gzip, br"}
+    response = client.get("/api/v1/users/", headers=headers)
+    assert response.headers["Content-Encoding"] == "br"
+    assert json.loads(brotli.decompress(response.data))["users"]
@@ -1,7 +1,7 @@
 import pytest
-from flask_jwt_extended import create_access_token
 from api import create_app, db
 from api.config.models import Course, Grade, User
+from api.services.auth_service import AuthService
 
 
 @pytest.fixture()
@@ -9,8 +9,7 @@ def app():
     """
     Create and configure a new app instance for tests.
     """
-    app = create_app()
-    app.config.update({
+    app = create_app({
         "TESTING": True,
         "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
         "SQLALCHEMY_TRACK_MODIFICATIONS": False
@@ -63,17 +62,17 @@ def client(app):
 
 @pytest.fixture
 def admin_token(app):
-    return create_access_token(identity=app.admin_id)
+    return AuthService.issue_access_token(db.session.get(User, app.admin_id))
 
 
 @pytest.fixture
 def professor_token(app):
-    return create_access_token(identity=app.professor_id)
+    return AuthService.issue_access_token(db.session.get(User, app.professor_id))
 
 
 @pytest.fixture
 def student_token(app):
-    return create_access_token(identity=app.student_id)
+    return AuthService.issue_access_token(db.session.get(User, app.student_id))
 
 
 @pytest.fixture()
@@ -62,3 +62,250 @@ def test_delete_course_admin(client, admin_token, course_id):
 
     response = client.delete(f"/api/v1/courses/{course_id}", headers=headers)
     assert response.status_code == 200
+
+
+def test_list_courses_cursor_pagination(client, professor_token, student_token):
+    professor_headers = {"Authorization": f"Bearer {professor_token}"}
+    for name in ("Second Course", "Third Course", "Fourth Course"):
+        assert client.post("/api/v1/courses/", json={"name": name}, headers=professor_headers).status_code == 200
+
+    headers = {"Authorization": f"Bearer {student_token}"}
+    seen, after = [], ""
+    while after is not None:
+        response = client.get(f"/api/v1/courses/?after={after}&per_page=3", headers=headers)
+        assert response.status_code == 200
+        seen.extend(course["id"] for course in response.json["courses"])
+        after = response.json["pagination"]["next_after"]
+
+    assert len(seen) == 4
+    assert len(set(seen)) == 4
+
+
+def test_list_courses_cursor_total(client, student_token):
+    headers = {"Authorization": f"Bearer {student_token}"}
+    response = client.get("/api/v1/courses/?after=&include_total=true", headers=headers)
+
+    assert response.status_code == 200
+    assert response.json["pagination"]["total_items"] == 1
+    assert response.json["pagination"]["has_more"] is False
+
+
+def test_list_courses_invalid_cursor(client, student_token):
+    headers = {"Authorization": f"Bearer {student_token}"}
+    response = client.get("/api/v1/courses/?after=not-a-cursor", headers=headers)
+
+    assert response.status_code == 400
+
+
+def test_search_courses_ranked_with_limit(client, professor_token, student_token):
+    professor_headers = {"Authorization": f"Bearer {professor_token}"}
+    for name in ["Metadata Engineering", "Introduction to Databases", "Data Structures"]:
+        assert client.post("/api/v1/courses/", json={"name": name}, headers=professor_headers).status_code == 200
+
+    headers = {"Authorization": f"Bearer {student_token}"}
+    response = client.get("/api/v1/courses/search?name=data", headers=headers)
+    names = [course["name"] for course in response.json["courses"]]
+    assert names == ["Data Structures", "Introduction to Databases", "Metadata Engineering"]
+
+    response = client.get("/api/v1/courses/search?name=intro da&limit=1", headers=headers)
+    assert [course["name"] for course in response.json["courses"]] == ["Introduction to Databases"]
+
+    response = client.get("/api/v1/courses/search?name=chemistry", headers=headers)
+    assert response.json["courses"] == []
+
+    response = client.get("/api/v1/courses/search?name=&limit=2", headers=headers)
+    assert [course["name"] for course in response.json["courses"]] == ["Data Structures", "Introduction to Databases"]
+    assert client.get("/api/v1/courses/search?name=--", headers=headers).json["courses"] == []
+
+
+def test_expired_search_index_is_rebuilt_in_background(app, professor_id):
+    from api import db
+    from api.config.models import Course
+    from api.services.course_service import SEARCH_INDEX_EXTENSION_KEY, CourseService
+
+    assert [course.name for course in CourseService.search_courses_by_name("test")] == ["Test Course"]
+    # Written by another process: only a rebuild brings it into this one's index.
+    db.session.add(Course(name="Test Driven Design", professor_id=professor_id))
+    db.session.commit()
+    state = app.extensions[SEARCH_INDEX_EXTENSION_KEY]
+    state["built_at"] = 0.0
+
+    # The expired index keeps answering while the new one is built.
+    assert [course.name for course in CourseService.search_courses_by_name("test")] == ["Test Course"]
+    state["thread"].join(timeout=10)
+    CourseService.create_course("Test Automation", professor_id)
+
+    names = {course.name for course in CourseService.search_courses_by_name("test")}
+    assert names == {"Test Course", "Test Driven Design", "Test Automation"}
+
+
+def test_search_index_follows_course_changes(client, professor_token, admin_token, student_token, course_id):
+    headers = {"Authorization": f"Bearer {student_token}"}
+    assert len(client.get("/api/v1/courses/search?name=test", headers=headers).json["courses"]) == 1
+
+    client.put(f"/api/v1/courses/{course_id}", json={"name": "Organic Chemistry"},
+               headers={"Authorization": f"Bearer {professor_token}"})
+    assert client.get("/api/v1/courses/search?name=test", headers=headers).json["courses"] == []
+    assert len(client.get("/api/v1/courses/search?name=chem", headers=headers).json["courses"]) == 1
+
+    client.delete(f"/api/v1/courses/{course_id}", headers={"Authorization": f"Bearer {admin_token}"})
+    assert client.get("/api/v1/courses/search?name=chem", headers=headers).json["courses"] == []
+
+
+def test_bulk_enroll(client, app, professor_token, student_token, course_id, student_id, professor_id):
+    from api import db
+    from api.config.models import Enrollment, User
+
+    with app.app_context():
+        students = [User(name=f"s{i}", email=f"s{i}@example.com", role="Student", password_hash="x") for i in range(5)]
+        db.session.add_all(students)
+        db.session.commit()
+        new_ids = [student.id for student in students]
+
+    headers = {"Authorization": f"Bearer {professor_token}"}
+    url = f"/api/v1/courses/{course_id}/enrollments:bulk"
+    client.post("/api/v1/courses/join", json={"course_id": course_id},
+                headers={"Authorization": f"Bearer {student_token}"})
+
+    payload = {"student_ids": [student_id, *new_ids, new_ids[0], "missing", professor_id]}
+    app.config["BULK_INSERT_CHUNK_SIZE"] = 2  # several INSERT statements per request
+    response = client.post(url, json=payload, headers=headers)
+
+    assert response.status_code == 200
+    results = {item["student_id"]: item["status"] for item in response.json["results"]}
+    assert results == {
+        student_id: "already_enrolled",
+        **{new_id: "enrolled" for new_id in new_ids},
+        "missing": "not_found",
+        professor_id: "not_a_student",
+    }
+    assert response.json["summary"] == {"already_enrolled": 1, "enrolled": 5, "not_found": 1, "not_a_student": 1}
+
+    with app.app_context():
+        assert Enrollment.query.filter_by(course_id=course_id).count() == 6
+
+    response = client.post(url, json={"student_ids": new_ids}, headers=headers)
+    assert response.json["summary"] == {"already_enrolled": 5}
+
+
+def test_bulk_enroll_validation(client, student_token, professor_token, course_id):
+    url = f"/api/v1/courses/{course_id}/enrollments:bulk"
+    headers = {"Authorization": f"Bearer {professor_token}"}
+    assert client.post(url, json={"student_ids": []}, headers=headers).status_code == 400
+    assert client.post(url, json={"student_ids": [1, 2]}, headers=headers).status_code == 400
+    assert client.post("/api/v1/courses/missing/enrollments:bulk", json={"student_ids": ["a"]},
+                       headers=headers).status_code == 404
+    assert client.post(url, json={"student_ids": ["a"]},
+                       headers={"Authorization": f"Bearer {student_token}"}).status_code == 403
+
+
+def test_course_cache_serves_lookups_and_follows_writes(client, app, professor_token, admin_token, student_token, course_id):
+    from sqlalchemy import event
+
+    from api import db
+    from api.services.course_service import CourseService, course_cache
+
+    db.session.remove()
+    assert CourseService.get_course_by_id(course_id).name == "Test Course"
+    db.session.remove()
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    hits = course_cache.stats()["hits"]
+    course = CourseService.get_course_by_id(course_id)
+    event.remove(db.engine, "before_cursor_execute", record)
+    assert course.name == "Test Course" and statements == []
+    assert course_cache.stats()["hits"] == hits + 1
+    # The cached row is a regular instance of the session: lazy loads and updates work.
+    assert course.professor_id == app.professor_id and len(course.grades) == 1
+    db.session.remove()
+
+    headers = {"Authorization": f"Bearer {student_token}"}
+    client.put(f"/api/v1/courses/{course_id}", json={"name": "Organic Chemistry"},
+               headers={"Authorization": f"Bearer {professor_token}"})
+    assert client.get(f"/api/v1/courses/{course_id}", headers=headers).json["course"]["name"] == "Organic Chemistry"
+
+    client.delete(f"/api/v1/courses/{course_id}", headers={"Authorization": f"Bearer {admin_token}"})
+    assert client.get(f"/api/v1/courses/{course_id}", headers=headers).status_code == 404
+
+
+def test_course_updates_ignore_stale_cached_rows(client, professor_token, course_id):
+    from sqlalchemy import update
+
+    from api import db
+    from api.config.models import Course
+    from api.services.course_service import CourseService
+
+    db.session.remove()
+    CourseService.get_course_by_id(course_id)
+    db.session.remove()
+    # Renamed by another instance: this one's cache still holds the old name.
+    db.session.execute(update(Course).where(Course.id == course_id).values(name="Renamed Elsewhere"))
+    db.session.commit()
+    db.session.remove()
+    assert CourseService.get_course_by_id(course_id).name == "Test Course"
+    assert CourseService.get_course_by_id(course_id, for_update=True).name == "Renamed Elsewhere"
+    db.session.remove()
+
+
+def test_cache_miss_racing_a_write_is_not_stored(app, monkeypatch, course_id):
+    from sqlalchemy.orm import Session
+
+    from api import db
+    from api.config.models import Course
+    from api.services.course_service import CourseService, course_cache
+
+    db.session.remove()
+    course_cache.invalidate(course_id)
+    get = db.session.get
+
+    def write_meanwhile(*args, **kwargs):
+        # The miss has read the old row when another request commits a rename.
+        course = get(*args, **kwargs)
+        monkeypatch.undo()
+        with Session(db.engine) as session:
+            session.get(Course, course_id).name = "Organic Chemistry"
+            session.commit()
+        return course
+
+    monkeypatch.setattr(db.session, "get", write_meanwhile)
+    assert CourseService.get_course_by_id(course_id).name == "Test Course"
+    db.session.remove()
+    assert CourseService.get_course_by_id(course_id).name == "Organic Chemistry"
+
+
+def test_course_etags(client, professor_token, student_token, course_id):
+    headers = {"Authorization": f"Bearer {student_token}"}
+    response = client.get(f"/api/v1/courses/{course_id}", headers=headers)
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"') and response.headers["Cache-Control"] == "private, no-cache"
+
+    response = client.get(f"/api/v1/courses/{course_id}", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304 and response.data == b""
+    list_etag = client.get("/api/v1/courses/", headers=headers).headers["ETag"]
+    assert client.get("/api/v1/courses/", headers={**headers, "If-None-Match": list_etag}).status_code == 304
+    assert client.get("/api/v1/courses/?after=", headers={**headers, "If-None-Match": list_etag}).status_code == 304
+
+    professor = {"Authorization": f"Bearer {professor_token}"}
+    client.put(f"/api/v1/courses/{course_id}", json={"name": "Renamed"}, headers=professor)
+    assert client.get(f"/api/v1/courses/{course_id}", headers={**headers, "If-None-Match": etag}).status_code == 200
+    response = client.get("/api/v1/courses/", headers={**headers, "If-None-Match": list_etag})
+    assert response.status_code == 200
+    list_etag = response.headers["ETag"]
+
+    client.post("/api/v1/courses/", json={"name": "Another Course"}, headers=professor)
+    assert client.get("/api/v1/courses/", headers={**headers, "If-None-Match": list_etag}).status_code == 200
+
+
+def test_delete_course_invalidates_grade_stamps(app, course_id, student_id):
+    from api.services.course_service import CourseService
+    from api.services.grade_service import GradeService
+
+    grade_service = GradeService()
+    assert grade_service.get_student_grades_version(course_id, student_id)[0] == 1
+    CourseService.delete_course(CourseService.get_course_by_id(course_id, for_update=True))
+    assert grade_service.get_student_grades_version(course_id, student_id)[0] == 0
@@ -0,0 +1,83 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from api import db
+from api.config.database import InstrumentedQueuePool, build_engine_options, get_pool_stats, instrument_engine
+
+
+def test_engine_options_sized_from_config(app):
+    config = dict(app.config, SQLALCHEMY_DATABASE_URI="mysql://user:pw@localhost:3306/db")
+    options = build_engine_options(config)
+
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert options["pool_size"] == app.config["DB_POOL_SIZE"]
+    assert options["max_overflow"] == app.config["DB_MAX_OVERFLOW"]
+    assert options["pool_recycle"] == app.config["DB_POOL_RECYCLE"]
+    assert options["pool_pre_ping"] == app.config["DB_POOL_PRE_PING"]
+    assert options["pool_timeout"] == app.config["DB_POOL_TIMEOUT"]
+
+
+def test_engine_options_skip_sqlite(app):
+    assert "pool_size" not in build_engine_options(app.config)
+
+
+def test_pool_stats_count_checkouts(app):
+    before = get_pool_stats()["primary"]
+    with db.engine.connect():
+        pass
+    after = get_pool_stats()["primary"]
+
+    assert after["checkouts"] == before["checkouts"] + 1
+    assert after["checkins"] == before["checkins"] + 1
+
+
+def test_pool_wait_time_and_timeouts(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    metrics = instrument_engine("test", engine)
+
+    with engine.connect():
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+
+    snapshot = metrics.snapshot()
+    assert snapshot["checkouts"] == 1
+    assert snapshot["timeouts"] == 1
+    assert snapshot["wait_time_max"] >= 0.05
+    engine.dispose()
+
+
+def test_pool_wait_time_excludes_opening_connections(tmp_path):
+    import sqlite3
+    import time
+
+    def slow_connect():
+        time.sleep(0.05)
+        return sqlite3.connect(str(tmp_path / "pool.db"))
+
+    engine = create_engine("sqlite://", creator=slow_connect, poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0)
+    metrics = instrument_engine("test", engine)
+    with engine.connect():
+        pass
+
+    snapshot = metrics.snapshot()
+    assert (snapshot["connects"], snapshot["wait_count"], snapshot["wait_time_max"]) == (1, 0, 0.0)
+    engine.dispose()
+
+
+def test_insert_ignore_only_skips_duplicates_on_mysql(app):
+    from sqlalchemy.dialects import mysql
+
+    from api.config.database import insert_ignore
+    from api.config.models import Enrollment
+
+    statement = insert_ignore(Enrollment.__table__, "mysql").values(id="e", student_id="s", course_id="c")
+    sql = str(statement.compile(dialect=mysql.dialect()))
+    assert "IGNORE" not in sql
+    assert sql.endswith("ON DUPLICATE KEY UPDATE id = enrollments.id")
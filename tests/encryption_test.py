@@ -0,0 +1,83 @@
+from api import db
+from api.config.models import User, decryption_cache
+from api.utils.encryption import ENTRY_OVERHEAD_BYTES, DecryptionCache
+
+
+def test_decryption_cache_evicts_least_recently_used():
+    cache = DecryptionCache(max_bytes=3 * (ENTRY_OVERHEAD_BYTES + 60))
+    for ciphertext in ("a", "b", "c"):
+        cache.set(ciphertext, ciphertext.upper())
+    cache.get("a")
+    cache.set("d", "D")
+
+    assert cache.get("b") is None
+    assert [cache.get(c) for c in ("a", "c", "d")] == ["A", "C", "D"]
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["size_bytes"] <= stats["max_bytes"]
+
+
+def test_decryption_cache_disabled_with_zero_budget():
+    cache = DecryptionCache(max_bytes=0)
+    cache.set("a", "A")
+    assert cache.get("a") is None
+
+
+def test_encrypted_columns_are_decrypted_once(app, student_id):
+    with app.app_context():
+        decryption_cache.clear()
+        db.session.expunge_all()
+        assert db.session.get(User, student_id).email == "student@example.com"
+        misses = decryption_cache.stats()["misses"]
+
+        db.session.expunge_all()
+        assert db.session.get(User, student_id).email == "student@example.com"
+        stats = decryption_cache.stats()
+        assert stats["misses"] == misses
+        assert stats["hits"] >= 2
+
+
+def test_batch_decrypt_on_thread_pool(app):
+    from api.utils.encryption import batch_decrypt
+
+    with app.app_context():
+        column_type = User._email.type
+        dialect = db.engine.dialect
+        values = [f"user{i}@example.com" for i in range(20)]
+        ciphertexts = [column_type.process_bind_param(value, dialect) for value in values] + [None]
+        decryption_cache.clear()
+
+        assert batch_decrypt(column_type, ciphertexts, dialect, workers=3, min_parallel=1) == values + [None]
+        assert decryption_cache.stats()["entries"] == 20
+
+
+def test_user_listings_are_batch_decrypted(app, client, admin_token, course_id, student_id):
+    from api.config.models import Enrollment
+
+    app.config.update(DECRYPTION_WORKERS=2, DECRYPTION_PARALLEL_MIN_ROWS=1)
+    with app.app_context():
+        db.session.add(Enrollment(student_id=student_id, course_id=course_id))
+        db.session.commit()
+    decryption_cache.clear()
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    users = client.get("/api/v1/users/", headers=headers).get_json()["users"]
+    assert {user["email"] for user in users} == {"student@example.com", "professor@example.com", "admin@example.com"}
+
+    students = client.get(f"/api/v1/courses/{course_id}/students", headers=headers).get_json()["students"]
+    assert [(student["id"], student["name"]) for student in students] == [(student_id, "student")]
+
+
+def test_batch_decryption_keeps_unflushed_changes(app):
+    from api.services.user_service import UserService
+
+    with app.app_context():
+        student = db.session.get(User, app.student_id)
+        with db.session.no_autoflush:
+            student.name = "Renamed Student"
+            users = {user.id: user for user in UserService.load_decrypted(db.session.query(User))}
+
+        assert users[app.student_id] is student
+        assert student.name == "Renamed Student"
+        assert users[app.admin_id].name == "admin"
+        db.session.rollback()
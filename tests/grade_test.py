@@ -115,3 +115,106 @@ def test_delete_grade_admin(client, admin_token, grade_id):
     response = client.delete(f"/api/v1/grades/{grade_id}", headers=headers)
 
     assert response.status_code == 200
+
+
+def test_list_grades_filters_and_pagination(client, professor_token, course_id, student_id):
+    headers = {"Authorization": f"Bearer {professor_token}"}
+    for name in ("TP1", "TP2"):
+        payload = {"course_id": course_id, "student_id": student_id, "grade": 12, "grade_name": name}
+        assert client.post("/api/v1/grades/", json=payload, headers=headers).status_code == 200
+
+    response = client.get(f"/api/v1/grades/?course_id={course_id}&name=TP1", headers=headers)
+    assert response.status_code == 200
+    assert [grade["name"] for grade in response.json["grades"]] == ["TP1"]
+
+    seen, after = [], ""
+    while after is not None:
+        response = client.get(f"/api/v1/grades/?limit=2&after={after}", headers=headers)
+        assert response.status_code == 200
+        seen.extend(grade["id"] for grade in response.json["grades"])
+        after = response.json["pagination"]["next_after"]
+    assert len(set(seen)) == 3
+
+
+def test_list_grades_ndjson_stream(client, professor_token, grade_id):
+    import json
+
+    headers = {"Authorization": f"Bearer {professor_token}", "Accept": "application/x-ndjson"}
+    response = client.get("/api/v1/grades/", headers=headers)
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    lines = response.get_data(as_text=True).splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [grade_id]
+
+
+def test_import_grades_csv(client, app, professor_token, course_id, student_id):
+    headers = {"Authorization": f"Bearer {professor_token}", "Content-Type": "text/csv"}
+    body = (
+        "student_id,grade\n"
+        f"{student_id},15.5\n"
+        "unknown-student,12\n"
+        f"{student_id},not-a-number\n"
+        f"{student_id},\n"
+        f"{student_id},8\n"
+    )
+    app.config["BULK_INSERT_CHUNK_SIZE"] = 2
+    response = client.post(f"/api/v1/grades/import?course_id={course_id}&grade_name=Final",
+                           data=body, headers=headers)
+
+    assert response.status_code == 200
+    assert response.json["imported"] == 2
+    assert response.json["failed"] == 3
+    assert [error["row"] for error in response.json["errors"]] == [2, 3, 4]
+    assert response.json["errors"][0]["msg"] == "Student not found."
+
+    from api.config.models import Grade
+
+    with app.app_context():
+        grades = Grade.query.filter_by(course_id=course_id, name="Final").all()
+        assert sorted(grade.grade for grade in grades) == [8.0, 15.5]
+
+
+def test_import_grades_json(client, app, admin_token, course_id, student_id):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    rows = [
+        {"course_id": course_id, "student_id": student_id, "grade": 11, "grade_name": "Quiz"},
+        {"course_id": "unknown-course", "student_id": student_id, "grade": 9, "grade_name": "Quiz"},
+        "not an object",
+    ]
+    response = client.post("/api/v1/grades/import", json=rows, headers=headers)
+    assert response.status_code == 200
+    assert (response.json["imported"], response.json["failed"]) == (1, 2)
+
+    response = client.post("/api/v1/grades/import", data=b'[{"course_id": "x"', headers={
+        **headers, "Content-Type": "application/json"})
+    assert response.status_code == 400
+
+    response = client.post("/api/v1/grades/import", data="x", headers={**headers, "Content-Type": "text/plain"})
+    assert response.status_code == 415
+
+
+def test_import_grades_student_forbidden(client, student_token):
+    headers = {"Authorization": f"Bearer {student_token}", "Content-Type": "text/csv"}
+    assert client.post("/api/v1/grades/import", data="a\n", headers=headers).status_code == 403
+
+
+def test_student_grades_etag(client, professor_token, grade_id, course_id, student_id):
+    headers = {"Authorization": f"Bearer {professor_token}"}
+    url = f"/api/v1/grades/courses/{course_id}/students/{student_id}/grades"
+    etag = client.get(url, headers=headers).headers["ETag"]
+
+    response = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.data == b""
+
+    client.put(f"/api/v1/grades/{grade_id}", json={"grade": 75}, headers=headers)
+    response = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    client.post(f"/api/v1/grades/import?course_id={course_id}&grade_name=Final",
+                data=f"student_id,grade\n{student_id},12\n", headers={**headers, "Content-Type": "text/csv"})
+    response = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(response.json["grades"]) == 2
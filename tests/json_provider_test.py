@@ -0,0 +1,45 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+
+@pytest.fixture(params=[True, False], ids=["orjson", "json"])
+def provider(app, request):
+    from api.utils import json_provider
+
+    if request.param and json_provider.orjson is None:
+        pytest.skip("orjson is not installed")
+    app.json.use_orjson = request.param
+    return app.json
+
+
+def test_encodings_match_stdlib_conventions(provider):
+    value = {
+        "naive": datetime(2026, 1, 2, 3, 4, 5, 600000),
+        "aware": datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+        "decimal": Decimal("1.50"),
+        "text": "Élève",
+        "grade": 12.5,
+    }
+    expected = ('{"naive":"2026-01-02T03:04:05.600000","aware":"2026-01-02T03:04:05+00:00",'
+                '"decimal":"1.50","text":"Élève","grade":12.5}')
+    assert provider.dumps(value) == expected
+    assert provider.response(value).get_data(as_text=True) == expected + "\n"
+    assert provider.dumps({1: "a"}) == '{"1":"a"}'
+    assert provider.loads(expected.encode())["text"] == "Élève"
+
+
+def test_api_dates_are_iso_formatted(client, student_token, course_id, provider):
+    from api import db
+    from api.config.models import Course
+
+    response = client.get(f"/api/v1/courses/{course_id}", headers={"Authorization": f"Bearer {student_token}"})
+    course = db.session.get(Course, course_id)
+    assert response.json["course"]["created_at"] == course.created_at.isoformat()
+
+
+def test_invalid_json_raises_value_error(provider):
+    # request.get_json() turns ValueError into a 400 response.
+    with pytest.raises(ValueError):
+        provider.loads("{not json")
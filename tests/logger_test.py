@@ -0,0 +1,69 @@
+import logging
+import queue
+
+
+def _record(level, msg="message"):
+    return logging.LogRecord("api.test", level, __file__, 1, msg, None, None)
+
+
+def test_queue_overflow_samples_debug_and_drops_when_full():
+    from api.utils.logger import BoundedQueueHandler
+
+    handler = BoundedQueueHandler(queue.Queue(4), debug_sample_rate=2, put_timeout=0)
+    handler.handle(_record(logging.INFO))
+    handler.handle(_record(logging.INFO))
+    # Half full: every other DEBUG record is kept.
+    for _ in range(2):
+        handler.handle(_record(logging.DEBUG))
+    assert handler.stats() == {"queued": 3, "maxsize": 4, "dropped": {"DEBUG": 1}}
+
+    handler.handle(_record(logging.WARNING))
+    handler.handle(_record(logging.ERROR))
+    assert handler.stats() == {"queued": 4, "maxsize": 4, "dropped": {"DEBUG": 1, "ERROR": 1}}
+
+
+def test_full_queue_waits_are_not_serialized():
+    import threading
+    import time
+
+    from api.utils.logger import BoundedQueueHandler
+
+    handler = BoundedQueueHandler(queue.Queue(1), debug_sample_rate=1, put_timeout=0.2)
+    handler.handle(_record(logging.INFO))
+    threads = [threading.Thread(target=handler.handle, args=(_record(logging.WARNING),)) for _ in range(8)]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Waiting for room one after the other would take 8 * 0.2 seconds.
+    assert time.monotonic() - start < 1.0
+    assert handler.stats()["dropped"] == {"WARNING": 8}
+
+
+def test_records_are_written_by_the_listener(tmp_path):
+    from api import create_app
+
+    app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:", "LOG_DIR": str(tmp_path)})
+    logging.getLogger("api.test").info("written by the writer thread")
+    app.extensions["log_queue"].queue.join()
+    assert "written by the writer thread" in (tmp_path / "app.log").read_text()
+
+
+def test_rotation_shared_between_handlers(tmp_path):
+    # Two handlers on one file stand for two processes: each rotates it in turn.
+    from api.utils.logger import SharedRotatingFileHandler
+
+    path = str(tmp_path / "app.log")
+    handlers = [SharedRotatingFileHandler(path, maxBytes=200, backupCount=100) for _ in range(2)]
+    try:
+        for i in range(60):
+            handlers[i % 2].handle(_record(logging.INFO, f"line {i:02d}"))
+    finally:
+        for handler in handlers:
+            handler.close()
+
+    lines = sorted(line for file in tmp_path.glob("app.log*") if not file.name.endswith(".lock")
+                   for line in file.read_text().splitlines())
+    assert lines == [f"line {i:02d}" for i in range(60)]
+    assert len(list(tmp_path.glob("app.log.*"))) > 2
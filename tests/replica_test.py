@@ -0,0 +1,61 @@
+import pytest
+from sqlalchemy import insert
+
+from api import create_app, db
+from api.config.database import get_replica_engines
+from api.config.models import Course, User
+from api.services.course_service import CourseService
+
+
+@pytest.fixture()
+def replica_app(tmp_path):
+    """
+    App backed by two SQLite files standing in for a primary and a read replica.
+    """
+    app = create_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'primary.db'}",
+        "SQLALCHEMY_REPLICA_URIS": [f"sqlite:///{tmp_path / 'replica.db'}"],
+    })
+
+    with app.app_context():
+        db.create_all()
+        replica = get_replica_engines()["replica_0"]
+        db.metadata.create_all(replica)
+
+        professor = User(name="professor", email="professor@example.com", role="Professor")
+        professor.set_password("ValidPass123!")
+        db.session.add(professor)
+        db.session.commit()
+        app.professor_id = professor.id
+
+        with replica.begin() as connection:
+            connection.execute(insert(Course.__table__).values(
+                id="replica-course", name="Replica Course", professor_id=professor.id
+            ))
+        db.session.remove()
+
+    yield app
+
+    with app.app_context():
+        db.engine.dispose()
+        for engine in get_replica_engines().values():
+            engine.dispose()
+
+
+def test_read_only_methods_use_replica(replica_app):
+    with replica_app.app_context():
+        courses = CourseService.search_courses_by_name("Replica")
+        assert [course.id for course in courses] == ["replica-course"]
+
+        # Primary lookups are not routed.
+        db.session.expunge_all()
+        assert CourseService.get_course_by_id("replica-course") is None
+
+
+def test_reads_after_write_use_primary(replica_app):
+    with replica_app.app_context():
+        course = CourseService.create_course("Primary Course", replica_app.professor_id)
+
+        courses = CourseService.search_courses_by_name("Course")
+        assert [c.id for c in courses] == [course.id]
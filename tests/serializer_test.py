@@ -0,0 +1,54 @@
+import logging
+from types import SimpleNamespace
+
+
+def test_rows_serialize_like_objects(app):
+    from api import db
+    from api.config.models import Course, Grade
+    from api.utils.serializer import (
+        COURSE_FIELDS, GRADE_FIELDS, serialize_course, serialize_course_rows, serialize_grade, serialize_grade_rows
+    )
+
+    grade = db.session.get(Grade, app.grade_id)
+    assert serialize_grade_rows(db.session.query(*GRADE_FIELDS.columns).all()) == [serialize_grade(grade)]
+    assert serialize_grade(grade) == {
+        "id": grade.id, "course_id": grade.course_id, "student_id": grade.student_id, "grade": grade.grade,
+        "name": "DM", "created_at": grade.created_at, "updated_at": grade.updated_at,
+    }
+
+    course = db.session.get(Course, app.course_id)
+    assert serialize_course_rows(db.session.query(*COURSE_FIELDS.columns).all()) == [serialize_course(course)]
+
+
+def test_serialize_users(app):
+    from api import db
+    from api.config.models import User
+    from api.utils.serializer import serialize_user, serialize_users
+
+    user = db.session.get(User, app.student_id)
+    expected = {
+        "id": user.id, "name": "student", "email": "student@example.com", "role": "Student",
+        "created_at": user.created_at, "updated_at": user.updated_at, "courses_enrolled": [],
+    }
+    assert serialize_user(user) == expected
+    assert serialize_users([user, user]) == [expected, expected]
+    assert serialize_user(None) is None
+
+
+def test_no_log_formatting_without_debug(app):
+    from api.utils import serializer
+
+    class Unformattable:
+        def __str__(self):
+            raise AssertionError("formatted while DEBUG is disabled")
+        __repr__ = __str__
+
+    value = Unformattable()
+    course = SimpleNamespace(id=value, name=value, professor_id=value, created_at=value, updated_at=value)
+    level = serializer.logger.level
+    serializer.logger.setLevel(logging.INFO)
+    try:
+        assert serializer.serialize_course(course)["id"] is value
+        assert serializer.serialize_courses([course])[0]["name"] is value
+    finally:
+        serializer.logger.setLevel(level)
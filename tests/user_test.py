@@ -130,3 +130,188 @@ def test_delete_user_admin(client, admin_token):
 
     get_response = client.get(f"/api/v1/users/{temp_user_id}", headers=headers)
     assert get_response.status_code == 404
+
+
+def test_user_identity_loads_only_id_and_role(app, student_id):
+    from sqlalchemy import inspect
+    from api.services.user_service import UserService
+
+    with app.app_context():
+        user = UserService.get_user_identity(student_id)
+        state = inspect(user)
+        assert user.role == "Student"
+        assert {"grades", "enrollments", "courses_created", "_name"} <= state.unloaded
+
+
+def test_search_users_uses_blind_index(client, admin_token, app, student_id):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = client.get("/api/v1/users/search?query=TUDEN", headers=headers)
+    assert [user["id"] for user in response.get_json()["users"]] == [student_id]
+
+    response = client.get("/api/v1/users/search?query=@example.com", headers=headers)
+    assert len(response.get_json()["users"]) == 3
+
+    # Tokens follow updates: the old name no longer matches, the new one does.
+    client.put(f"/api/v1/users/{student_id}", json={"name": "Marie Curie"}, headers=headers)
+    response = client.get("/api/v1/users/search?query=student", headers=headers)
+    assert [user["id"] for user in response.get_json()["users"]] == [student_id]  # still matches the email
+    response = client.get("/api/v1/users/search?query=curie", headers=headers)
+    assert [user["id"] for user in response.get_json()["users"]] == [student_id]
+
+    with app.app_context():
+        from api.config.models import UserSearchToken
+        fields = {token.field for token in UserSearchToken.query.filter_by(user_id=student_id)}
+        assert fields == {"name", "email"}
+
+
+def test_bulk_create_users(client, app, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    rows = [
+        {"name": "Ada", "email": "Ada@example.com", "password": "ValidPass123!", "role": "Student"},
+        {"name": "Alan", "email": "alan@example.com", "password": "ValidPass123!", "role": "Professor"},
+        {"name": "Ada again", "email": "ada@example.com", "password": "ValidPass123!", "role": "Student"},
+        {"name": "Known", "email": "student@example.com", "password": "ValidPass123!", "role": "Student"},
+        {"name": "Root", "email": "root@example.com", "password": "ValidPass123!", "role": "Administrator"},
+        {"name": "", "email": "empty@example.com", "password": "x", "role": "Student"},
+    ]
+    app.config["PASSWORD_HASH_WORKERS"] = 2  # exercise the process pool
+    response = client.post("/api/v1/users/bulk", json={"users": rows}, headers=headers)
+
+    assert response.status_code == 200
+    assert [result["status"] for result in response.json["results"]] == [
+        "created", "created", "duplicate", "exists", "invalid", "invalid"]
+    assert response.json["summary"] == {"created": 2, "duplicate": 1, "exists": 1, "invalid": 2}
+
+    login = client.post("/api/v1/auth/login", json={"email": "ada@example.com", "password": "ValidPass123!"})
+    assert login.status_code == 200
+    search = client.get("/api/v1/users/search?query=alan", headers=headers)
+    assert [user["id"] for user in search.get_json()["users"]] == [response.json["results"][1]["id"]]
+
+
+def test_bulk_create_users_non_admin(client, professor_token):
+    headers = {"Authorization": f"Bearer {professor_token}"}
+    response = client.post("/api/v1/users/bulk", json={"users": [{}]}, headers=headers)
+    assert response.status_code == 403
+
+
+def test_users_import_command(app, tmp_path):
+    from api.config.models import User
+
+    path = tmp_path / "cohort.csv"
+    path.write_text(
+        "name,email,password,role\n"
+        "Grace,grace@example.com,ValidPass123!,Student\n"
+        "Grace,grace@example.com,ValidPass123!,Student\n"
+        "Linus,linus@example.com,ValidPass123!,Student\n"
+    )
+    result = app.test_cli_runner().invoke(args=["users", "import", str(path), "--workers", "1", "--batch-size", "2"])
+
+    assert result.exit_code == 0, result.output
+    assert "Row 2: duplicate grace@example.com" in result.output
+    assert "{'created': 2, 'duplicate': 1}" in result.output
+    with app.app_context():
+        assert User.query.count() == 5
+
+
+def test_caller_resolved_from_token_claims(client, professor_token, course_id, student_id, monkeypatch):
+    from api.services.user_service import UserService
+
+    calls = []
+    get_user_identity = UserService.get_user_identity
+    monkeypatch.setattr(UserService, "get_user_identity",
+                        staticmethod(lambda user_id: calls.append(user_id) or get_user_identity(user_id)))
+
+    headers = {"Authorization": f"Bearer {professor_token}"}
+    response = client.get(f"/api/v1/grades/courses/{course_id}/students/{student_id}/grades", headers=headers)
+
+    assert response.status_code == 200
+    # The caller comes from the token claims; only the student being checked is loaded.
+    assert calls == [student_id]
+
+
+def test_token_of_deleted_user_rejected(client, app, admin_token):
+    from flask_jwt_extended import create_access_token
+
+    from api.services.user_service import UserService
+
+    user = UserService.create_user("Leaver", "leaver@example.com", "ValidPass123!", "Student")
+    token = create_access_token(identity=user.id)
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    assert client.delete(f"/api/v1/users/{user.id}", headers=headers).status_code == 200
+
+    response = client.get("/api/v1/courses/", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 401
+    assert response.json["msg"] == "User not found."
+
+
+def test_require_role_message(client, professor_token, course_id):
+    headers = {"Authorization": f"Bearer {professor_token}"}
+    response = client.post("/api/v1/courses/join", json={"course_id": course_id}, headers=headers)
+
+    assert response.status_code == 403
+    assert response.json["msg"] == "Only students can join courses."
+
+
+def test_user_cache_follows_updates(client, professor_token, professor_id):
+    from api import db
+    from api.services.user_service import user_cache
+
+    # Requests share the test's application context, hence its session: clear it so
+    # that lookups go through the cache.
+    headers = {"Authorization": f"Bearer {professor_token}"}
+    db.session.remove()
+    assert client.get(f"/api/v1/users/{professor_id}", headers=headers).status_code == 200
+    db.session.remove()
+    hits = user_cache.stats()["hits"]
+
+    payload = {"name": "Renamed Professor", "email": "renamed@example.com"}
+    assert client.put(f"/api/v1/users/{professor_id}", json=payload, headers=headers).status_code == 200
+    # The update reads the row from the database.
+    assert user_cache.stats()["hits"] == hits
+    db.session.remove()
+
+    data = client.get(f"/api/v1/users/{professor_id}", headers=headers).get_json()
+    assert (data["user"]["name"], data["user"]["email"]) == ("Renamed Professor", "renamed@example.com")
+    login = client.post("/api/v1/auth/login", json={"email": "renamed@example.com", "password": "ValidPass123!"})
+    assert login.status_code == 200
+
+
+def test_get_user_etag(client, admin_token, student_id):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    etag = client.get(f"/api/v1/users/{student_id}", headers=headers).headers["ETag"]
+    assert client.get(f"/api/v1/users/{student_id}", headers={**headers, "If-None-Match": etag}).status_code == 304
+
+    client.put(f"/api/v1/users/{student_id}", json={"name": "Renamed Student"}, headers=headers)
+    response = client.get(f"/api/v1/users/{student_id}", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json["user"]["name"] == "Renamed Student"
+
+
+def test_token_revocations_from_stale_sessions_add_up(app, student_id):
+    from sqlalchemy import update
+    from sqlalchemy.orm import Session
+
+    from api import db
+    from api.config.models import User
+    from api.services.user_service import UserService
+
+    # Two sessions that both loaded version 0, standing for two instances.
+    with Session(db.engine) as first, Session(db.engine) as second:
+        first_user, second_user = first.get(User, student_id), second.get(User, student_id)
+        assert first_user.token_version == second_user.token_version == 0
+        first_user.revoke_tokens()
+        first.commit()
+        second_user.revoke_tokens()
+        second.commit()
+        assert second_user.token_version == 2
+
+    # A cached copy is just as stale once another instance has signed the user out.
+    db.session.remove()
+    UserService.get_user_by_id(student_id)
+    db.session.remove()
+    db.session.execute(update(User).where(User.id == student_id).values(token_version=User.token_version + 1))
+    db.session.commit()
+    db.session.remove()
+    UserService.revoke_tokens(UserService.get_user_by_id(student_id))
+    db.session.remove()
+    assert db.session.get(User, student_id).token_version == 4